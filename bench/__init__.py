@@ -0,0 +1,4 @@
+"""
+Benchmarks for Shepherd components.
+Run each module directly, e.g. python -m bench.backends
+"""
@@ -0,0 +1,55 @@
+"""
+Compares the cost of Metric.measure() between the psutil and /proc backends.
+Usage: python -m bench.backends [iterations]
+"""
+import sys
+import timeit
+
+from node.telemetry.metrics.cpu import CPU, ProcCPU
+from node.telemetry.metrics.ram import RAM, ProcRAM
+from node.telemetry.metrics.disk import Disk, ProcDisk
+from node.telemetry.metrics.session import Session, ProcSession
+
+
+PAIRS = [
+        (CPU, ProcCPU),
+        (RAM, ProcRAM),
+        (Disk, ProcDisk),
+        (Session, ProcSession),
+]
+
+
+def bench(metric, iterations: int) -> float:
+    """
+    Times metric.measure().
+    :param metric: Metric implementation
+    :param iterations: number of measurements
+    :return: float microseconds per measurement
+    """
+    metric.measure()  # Warm up caches and delta baselines
+    return timeit.timeit(metric.measure, number=iterations) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"{'metric':<10}{'psutil (us)':>14}{'procfs (us)':>14}{'speedup':>10}")
+    total_psutil = 0
+    total_procfs = 0
+    for psutil_type, procfs_type in PAIRS:
+        psutil_metric = psutil_type()
+        procfs_metric = procfs_type()
+        psutil_us = bench(psutil_metric, iterations)
+        procfs_us = bench(procfs_metric, iterations)
+        total_psutil += psutil_us
+        total_procfs += procfs_us
+        print(f"{psutil_metric.metric_name():<10}{psutil_us:>14.1f}{procfs_us:>14.1f}{psutil_us / procfs_us:>9.2f}x")
+        psutil_keys = set(psutil_metric.measure().keys())
+        procfs_keys = set(procfs_metric.measure().keys())
+        if psutil_keys != procfs_keys:
+            print(f"  Warning: fields differ, psutil only {psutil_keys - procfs_keys}, "
+                  f"procfs only {procfs_keys - psutil_keys}")
+    print(f"{'total':<10}{total_psutil:>14.1f}{total_procfs:>14.1f}{total_psutil / total_procfs:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
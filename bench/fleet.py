@@ -0,0 +1,417 @@
+"""
+Simulates a fleet of Nodes against a running server, to find the rate at which it saturates.
+Each simulated Node negotiates with the Broker as a real one does (so each run registers new Nodes), then publishes
+Reports packed from bench.pack's sample update on its own socket, compressed with the codec the Broker chose. Nodes are
+spread over worker processes, each running its share as asyncio tasks.
+Every INTERVAL seconds the achieved send rate is printed, with the Reports the Collector pushed back (which a real Node
+would spool) and the Collector's own Stats: Reports received and missed, their lag, and how busy it was.
+Usage: python -m bench.fleet [-h] [--host HOST] [--nodes N] [--processes P] [--rate HZ] [--duration S] [--users U]
+       [--partitions P] [--gpus G] [--burst PERIOD,LENGTH,FACTOR] [--sync] [--interval S]
+"""
+import argparse
+import asyncio
+import math
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import time
+
+import zmq
+import zmq.asyncio
+
+import proto.report_pb2 as proto_report
+import proto.frame as frame
+import proto.codec as codec
+from proto.negotiation_pb2 import Negotiation
+from proto.control_pb2 import Stats
+from node.net.mapping import Packer
+from bench.pack import sample_update
+
+BROKER_PORT = 3030
+TIMEOUT = 30  # Seconds to wait for the Broker and Collector
+
+
+class SimulatedNode:
+    """
+    One Node: its handshake, socket and the Report it sends, varied a little each time.
+    """
+
+    def __init__(self, name: str, users: int, partitions: int, gpus: int):
+        """
+        :param name: node name given to the Broker
+        :param users: sessions in each Report
+        :param partitions: partitions in each Report
+        :param gpus: GPUs in each Report
+        """
+        self.name = name
+        self.update = sample_update(users, partitions, gpus)
+        self.report = proto_report.Report()
+        self.socket = None
+        self.codec = None
+        self.control_port = 0
+        self.pool_id = 0
+        self.node_id = 0
+        self._sequence = 0
+        self._inventory = True  # Sends the Inventory until a Report has been sent
+
+    async def negotiate(self, context, host: str) -> None:
+        """
+        Asks the Broker for an ID, a Collector and a codec.
+        :param context: zmq.asyncio.Context
+        :param host: server host
+        :return: None
+        :raises: IOError if the Broker doesn't approve, TimeoutError if it doesn't answer
+        """
+        negotiation = Negotiation()
+        negotiation.node_name = self.name
+        negotiation.node_proposes_id = False
+        negotiation.codecs.extend(codec.available())
+        broker = context.socket(zmq.REQ)
+        broker.setsockopt(zmq.LINGER, 0)
+        broker.connect(f"tcp://{host}:{BROKER_PORT}")
+        try:
+            await broker.send(negotiation.SerializeToString())
+            response = Negotiation()
+            response.ParseFromString(await asyncio.wait_for(broker.recv(), TIMEOUT))
+        finally:
+            broker.close()
+        if not response.server_approve:
+            raise IOError(f"Broker didn't approve {self.name}.")
+        self.pool_id = response.pool_id
+        self.node_id = response.node_id
+        self.control_port = response.control_port
+        if response.codec:
+            self.codec = codec.Codec(response.codec, response.dictionary)
+
+        self.report.pool_id = self.update['pool_id'] = self.pool_id
+        self.report.node_id = self.update['node_id'] = self.node_id
+        packer = Packer()
+        packer.pack(self.report, self.update)
+        Packer.pack_inventory(self.report.inventory, packer.inventory(self.update))
+        self.socket = context.socket(zmq.XPUB)  # As the NetworkSubscriber's
+        self.socket.setsockopt(zmq.SNDHWM, 2)
+        self.socket.setsockopt(zmq.XPUB_NODROP, 1)
+        self.socket.setsockopt(zmq.IMMEDIATE, 1)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(f"tcp://{host}:{response.collector_port}")
+        await asyncio.wait_for(self.socket.recv(), TIMEOUT)  # The Collector's subscription
+
+    async def send(self) -> bool:
+        """
+        Sends the next Report, with fresh times, sequence and CPU and RAM use.
+        :return: bool whether it was sent, False if the Collector pushed back
+        """
+        report = self.report
+        time_ms = time.time_ns() // 1000000
+        report.time_stamp = time_ms // 1000
+        report.time_ms = time_ms
+        self._sequence += 1
+        report.sequence = self._sequence
+        report.cpu.percent = random.uniform(0, 100)
+        for core in range(len(report.cpu.core_percents)):
+            report.cpu.core_percents[core] = random.uniform(0, 100)
+        report.ram.virt_used = random.randrange(report.ram.virt_total)
+        report.ram.virt_available = report.ram.virt_total - report.ram.virt_used
+        if not self._inventory:
+            report.ClearField('inventory')
+        message = report.SerializeToString()
+        if self.codec is None:
+            parts = [frame.REPORT, message]
+        else:
+            parts = [frame.REPORT, self.codec.frame, self.codec.compress(message)]
+        try:
+            await self.socket.send_multipart(parts, zmq.NOBLOCK)
+        except zmq.Again:
+            return False
+        self._inventory = False
+        return True
+
+    def close(self) -> None:
+        if self.socket is not None:
+            self.socket.close()
+
+
+class Schedule:
+    """
+    When each Node sends: rate times a second, factor times faster for length seconds every period when bursting.
+    """
+
+    def __init__(self, rate: float, burst: tuple = None, sync: bool = False):
+        """
+        :param rate: Reports per second per Node
+        :param burst: (period, length, factor), None for a steady rate
+        :param sync: every Node sends at the same instants, rather than spread over the interval
+        """
+        self.rate = rate
+        self.burst = burst
+        self.sync = sync
+        self.start = time.time()
+
+    def rate_at(self, now: float) -> float:
+        """
+        :param now: time.time()
+        :return: float Reports per second per Node at that time
+        """
+        if self.burst is not None:
+            period, length, factor = self.burst
+            if (now - self.start) % period < length:
+                return self.rate * factor
+        return self.rate
+
+    def first(self, now: float) -> float:
+        """
+        :param now: time.time()
+        :return: float time.time() a Node sends its first Report
+        """
+        interval = 1 / self.rate_at(now)
+        if self.sync:
+            return math.ceil(now / interval) * interval
+        return now + random.uniform(0, interval)
+
+    def next(self, last: float, now: float) -> float:
+        """
+        :param last: time.time() the last Report was due
+        :param now: time.time()
+        :return: float time.time() the next Report is due, never in the past so a late Node doesn't catch up in a rush
+        """
+        due = last + 1 / self.rate_at(last)
+        if self.sync:
+            interval = 1 / self.rate_at(now)
+            due = math.ceil(due / interval - 1e-9) * interval
+        return max(due, now)
+
+
+async def _run_node(node: SimulatedNode, context, host: str, schedule: Schedule, counters: dict,
+                    duration: float) -> None:
+    """
+    Negotiates, then sends on schedule for duration.
+    :param node: SimulatedNode
+    :param context: zmq.asyncio.Context
+    :param host: server host
+    :param schedule: Schedule
+    :param counters: dict of the worker's counters, added to
+    :param duration: seconds to send for
+    :return: None
+    """
+    started = time.monotonic()
+    try:
+        await node.negotiate(context, host)
+    except (IOError, asyncio.TimeoutError, zmq.ZMQError) as e:
+        print(f"{node.name} handshake failed: {e!r}")
+        counters['failed'] += 1
+        return
+    counters['handshakes'] += 1
+    counters['handshake_seconds'] += time.monotonic() - started
+    counters['control_port'] = node.control_port
+    now = time.time()
+    stop = now + duration
+    due = schedule.first(now)
+    while due < stop:
+        await asyncio.sleep(max(0.0, due - time.time()))  # Yields even when behind, sends may complete at once
+        if time.time() - due > 1 / schedule.rate_at(due):
+            counters['late'] += 1  # A whole interval behind, the worker is the bottleneck
+        if await node.send():
+            counters['sent'] += 1
+        else:
+            counters['unsent'] += 1
+        due = schedule.next(due, time.time())
+
+
+async def _fleet(names: list, args, updates) -> None:
+    """
+    Runs a worker's Nodes.
+    :param names: node names
+    :param args: parsed arguments
+    :param updates: multiprocessing.Queue
+    :return: None
+    """
+    context = zmq.asyncio.Context()
+    schedule = Schedule(args.rate, args.burst, args.sync)
+    counters = {'handshakes': 0, 'failed': 0, 'handshake_seconds': 0.0, 'sent': 0, 'unsent': 0, 'late': 0,
+                'control_port': 0}
+    nodes = [SimulatedNode(name, args.users, args.partitions, args.gpus) for name in names]
+    reporter = asyncio.ensure_future(_report(counters, updates))
+    await asyncio.gather(*(_run_node(node, context, args.host, schedule, counters, args.duration) for node in nodes))
+    reporter.cancel()
+    updates.put(dict(counters, pid=os.getpid()))
+    for node in nodes:
+        node.close()
+    context.term()
+
+
+async def _report(counters: dict, updates) -> None:
+    """
+    Puts a worker's counters on the updates queue every second.
+    :param counters: dict of the worker's counters
+    :param updates: multiprocessing.Queue
+    :return: None
+    """
+    while True:
+        await asyncio.sleep(1)
+        updates.put(dict(counters, pid=os.getpid()))
+
+
+def _worker(names: list, args, updates) -> None:
+    """
+    Worker process, each of its Nodes has a socket (two during the handshake).
+    :param names: node names
+    :param args: parsed arguments
+    :param updates: multiprocessing.Queue
+    :return: None
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    asyncio.run(_fleet(names, args, updates))
+
+
+class CollectorStats:
+    """
+    Totals of the Stats the Collector publishes on its control port.
+    """
+
+    def __init__(self):
+        self.socket = None
+        self.reports = 0
+        self.missed = 0
+        self.rejected = 0
+        self.lag_max_ms = 0.0
+        self.busiest = 0.0  # Highest busy_percent
+        self.stats = 0  # Stats received
+        self.lag_ms = 0.0  # Total lag of the Reports received
+        self.last = None  # Last Stats
+
+    def connect(self, host: str, port: int) -> None:
+        """
+        :param host: server host
+        :param port: control port from a Negotiation, 0 if not known yet
+        :return: None
+        """
+        if port:
+            self.socket = zmq.Context.instance().socket(zmq.SUB)
+            self.socket.setsockopt(zmq.SUBSCRIBE, b'stats:')
+            self.socket.connect(f"tcp://{host}:{port}")
+
+    def read(self, timeout: float = 0) -> None:
+        """
+        Adds any Stats received.
+        :param timeout: seconds to wait for the next Stats
+        :return: None
+        """
+        while self.socket is not None and self.socket.poll(max(0.0, timeout) * 1000):
+            timeout = 0
+            _, message = self.socket.recv_multipart()
+            stats = Stats()
+            stats.ParseFromString(message)
+            self.reports += stats.reports
+            self.missed += stats.missed
+            self.rejected += stats.rejected
+            self.lag_max_ms = max(self.lag_max_ms, stats.lag_max_ms)
+            self.busiest = max(self.busiest, stats.busy_percent)
+            self.stats += 1
+            self.lag_ms += stats.lag_mean_ms * stats.reports
+            self.last = stats
+
+    def drain(self, timeout: float) -> None:
+        """
+        Adds Stats until the Collector has handled every Report sent, shown by a period in which it received none.
+        :param timeout: most seconds to wait
+        :return: None
+        """
+        deadline = time.monotonic() + timeout
+        while self.socket is not None and time.monotonic() < deadline:
+            count = self.stats
+            self.read(deadline - time.monotonic())
+            if self.stats == count or self.last.reports == 0:
+                return
+
+    def __str__(self) -> str:
+        if self.last is None:
+            return "collector -"
+        last = self.last
+        return f"collector {last.reports / last.seconds if last.seconds else 0:.0f}/s  missed {self.missed}  " \
+               f"lag {last.lag_mean_ms:.0f}ms (max {last.lag_max_ms:.0f})  busy {last.busy_percent:.0f}%"
+
+
+def _burst(value: str) -> tuple:
+    period, length, factor = (float(part) for part in value.split(','))
+    return period, length, factor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulates a fleet of Nodes reporting to a server.")
+    parser.add_argument('--host', default='localhost', help="server host")
+    parser.add_argument('--nodes', default=100, type=int, help="simulated Nodes")
+    parser.add_argument('--processes', default=multiprocessing.cpu_count(), type=int, help="worker processes")
+    parser.add_argument('--rate', default=1.0, type=float, help="Reports per second per Node")
+    parser.add_argument('--duration', default=60.0, type=float, help="seconds each Node sends for, after its handshake")
+    parser.add_argument('--users', default=5, type=int, help="sessions per Report")
+    parser.add_argument('--partitions', default=4, type=int, help="partitions per Report")
+    parser.add_argument('--gpus', default=0, type=int, help="GPUs per Report")
+    parser.add_argument('--burst', type=_burst, metavar='PERIOD,LENGTH,FACTOR',
+                        help="send FACTOR times faster for LENGTH seconds every PERIOD seconds")
+    parser.add_argument('--sync', action='store_true', help="every Node sends at the same instants")
+    parser.add_argument('--interval', default=5.0, type=float, help="seconds between printed results")
+    args = parser.parse_args()
+
+    updates = multiprocessing.Queue()
+    processes = max(1, min(args.processes, args.nodes))
+    workers = [multiprocessing.Process(target=_worker, args=([f"fleet-{i}" for i in range(p, args.nodes, processes)],
+                                                              args, updates), daemon=True)
+               for p in range(processes)]
+    for worker in workers:
+        worker.start()
+    print(f"{args.nodes} Nodes over {processes} processes, {args.rate}/s each "
+          f"({args.nodes * args.rate:.0f} Reports/s{', bursting' if args.burst else ''}).")
+
+    latest = {}  # Worker pid -> its last counters
+    collector = CollectorStats()
+    started = time.monotonic()
+    printed = started
+    last_sent = 0
+    while any(worker.is_alive() for worker in workers) or not updates.empty():
+        try:
+            counters = updates.get(timeout=0.1)
+            latest[counters.pop('pid')] = counters
+        except queue.Empty:
+            pass
+        if collector.socket is None:
+            collector.connect(args.host, next((c['control_port'] for c in latest.values() if c['control_port']), 0))
+        collector.read()
+        now = time.monotonic()
+        if now - printed >= args.interval:
+            total = _total(latest)
+            print(f"{now - started:6.0f}s  nodes {total['handshakes']}/{args.nodes}  "
+                  f"sent {(total['sent'] - last_sent) / (now - printed):.0f}/s  unsent {total['unsent']}  "
+                  f"late {total['late']}  |  {collector}", flush=True)
+            printed = now
+            last_sent = total['sent']
+    collector.drain(TIMEOUT)
+
+    total = _total(latest)
+    print(f"Handshakes: {total['handshakes']} ({total['failed']} failed), "
+          f"{total['handshake_seconds'] / total['handshakes'] if total['handshakes'] else 0:.3f}s mean.")
+    print(f"Sent {total['sent']} Reports, {total['unsent']} pushed back by the Collector, {total['late']} late.")
+    if collector.stats:
+        print(f"Collector received {collector.reports}, missed {collector.missed}, rejected {collector.rejected}, "
+              f"mean lag {collector.lag_ms / collector.reports if collector.reports else 0:.0f}ms, max {collector.lag_max_ms:.0f}ms, "
+              f"busiest {collector.busiest:.0f}%.")
+    else:
+        print("No Stats from the Collector, is its STATS_INTERVAL 0?")
+
+
+def _total(latest: dict) -> dict:
+    """
+    :param latest: worker -> its last counters
+    :return: dict of counters summed over the workers
+    """
+    total = {'handshakes': 0, 'failed': 0, 'handshake_seconds': 0.0, 'sent': 0, 'unsent': 0, 'late': 0}
+    for counters in latest.values():
+        for name in total:
+            total[name] += counters[name]
+    return total
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Compares the time to pack one beat's update into a Report, by hand (as pack.py used to) and with the mapping Packer.
+Usage: python -m bench.pack [iterations] [users] [partitions] [gpus]
+"""
+import sys
+import timeit
+
+import proto.report_pb2 as proto_report
+from node.net.mapping import Packer
+
+
+def sample_update(users: int, partitions: int, gpus: int) -> dict:
+    """
+    Builds an update shaped like one from Heart.
+    :param users: number of sessions
+    :param partitions: number of partitions
+    :param gpus: number of GPUs
+    :return: dict update
+    """
+    return {
+            'pool_id': 1,
+            'node_id': 2,
+            'time': 1650000000,
+            'cpu': {'logical_cores': 16, 'current_frequency': 2400.0, 'max_frequency': 3600.0, 'percent': 12.5,
+                    'per_core_percent': [12.5] * 16, 'load_1': 0.2, 'load_5': 0.15, 'load_15': 0.1},
+            'ram': {'virt_total': 2 ** 35, 'virt_available': 2 ** 34, 'virt_used': 2 ** 34, 'virt_free': 2 ** 33,
+                    'swap_total': 2 ** 32, 'swap_used': 2 ** 20, 'swap_free': 2 ** 32 - 2 ** 20, 'swap_percent': 0.1},
+            'disk': {
+                    'partitions': {f'/dev/sd{i}': {'device': f'/dev/sd{i}', 'mount_point': f'/mnt/{i}',
+                                                   'fstype': 'ext4', 'total': 2 ** 40, 'used': 2 ** 39,
+                                                   'free': 2 ** 39, 'percent': 50.0}
+                                   for i in range(partitions)},
+                    'io': {'read_count': 1000, 'write_count': 2000, 'read_bytes': 2 ** 30, 'write_bytes': 2 ** 31,
+                           'read_time': 100, 'write_time': 200},
+                    'devices': {},
+            },
+            'battery': {'percent': 80, 'secs_left': 3600, 'power_plugged': False},
+            'session': {'boot_time': 1640000000, 'uptime': 10000000,
+                        'users': {f'user{i}': {'terminal': f'pts/{i}', 'host': None if i % 2 else f'10.0.0.{i}',
+                                               'started': 1649000000 + i, 'pid': 1000 + i}
+                                  for i in range(users)}},
+            'gpu': {f'GPU-{i}': {'uuid': f'GPU-{i}', 'load': 0.5, 'mem_percent': 0.25, 'mem_total': 16384,
+                                 'mem_used': 4096, 'driver': '510.47', 'product': 'A100', 'serial': str(i),
+                                 'display_mode': 'Disabled'}
+                    for i in range(gpus)},
+    }
+
+
+def pack_by_hand(update: dict, partition_indices: dict, gpu_indices: dict):
+    """
+    The hand-written packing which pack.py used before the mapping, allocating a Report per beat.
+    :param update: dict update
+    :param partition_indices: dict of device -> index
+    :param gpu_indices: dict of UUID -> index
+    :return: Report
+    """
+    report = proto_report.Report()
+    report.pool_id = update['pool_id']
+    report.node_id = update['node_id']
+    report.time_stamp = update['time']
+
+    report.cpu.logical_cores = update['cpu']['logical_cores']
+    report.cpu.current_freq = update['cpu']['current_frequency']
+    report.cpu.max_freq = update['cpu']['max_frequency']
+    report.cpu.percent = update['cpu']['percent']
+    report.cpu.load_1 = update['cpu']['load_1']
+    report.cpu.load_5 = update['cpu']['load_5']
+    report.cpu.load_15 = update['cpu']['load_15']
+    report.cpu.core_percents.extend(update['cpu']['per_core_percent'])
+
+    report.ram.virt_total = update['ram']['virt_total']
+    report.ram.virt_available = update['ram']['virt_available']
+    report.ram.virt_used = update['ram']['virt_used']
+    report.ram.virt_free = update['ram']['virt_free']
+    report.ram.swap_total = update['ram']['swap_total']
+    report.ram.swap_percent = update['ram']['swap_percent']
+    report.ram.swap_used = update['ram']['swap_used']
+    report.ram.swap_free = update['ram']['swap_free']
+
+    if 'disk' in update.keys():
+        indices = []
+        useds = []
+        frees = []
+        percents = []
+
+        for part in update['disk']['partitions'].values():
+            indices.append(partition_indices.setdefault(part['device'], len(partition_indices)))
+            useds.append(part['used'])
+            frees.append(part['free'])
+            percents.append(part['percent'])
+
+        report.disk.indices.extend(indices)
+        report.disk.useds.extend(useds)
+        report.disk.frees.extend(frees)
+        report.disk.percents.extend(percents)
+
+        report.disk.read_cnt = update['disk']['io']['read_count']
+        report.disk.write_cnt = update['disk']['io']['write_count']
+        report.disk.read_bytes = update['disk']['io']['read_bytes']
+        report.disk.write_bytes = update['disk']['io']['write_bytes']
+        report.disk.read_time = update['disk']['io']['read_time']
+        report.disk.write_time = update['disk']['io']['write_time']
+
+    if 'battery' in update.keys():
+        if update['battery']['power_plugged'] is not None:
+            report.battery.percent = update['battery']['percent']
+            report.battery.secs_left = update['battery']['secs_left']
+            report.battery.power_plugged = update['battery']['power_plugged']
+
+    if 'session' in update.keys():
+        report.session.boot_time = update['session']['boot_time']
+        report.session.uptime = update['session']['uptime']
+        users = []
+        terminals = []
+        hosts = []
+        started_times = []
+        pids = []
+        for user, attribs in update['session']['users'].items():
+            users.append(user)
+            terminals.append(attribs['terminal'] if attribs['terminal'] is not None else '')
+            hosts.append(attribs['host'] if attribs['host'] is not None else '')
+            started_times.append(attribs['started'])
+            pids.append(attribs['pid'] if attribs['pid'] is not None else 0)
+
+        report.session.users.extend(users)
+        report.session.terminals.extend(terminals)
+        report.session.hosts.extend(hosts)
+        report.session.started_times.extend(started_times)
+        report.session.pids.extend(pids)
+
+    if 'gpu' in update.keys():
+        indices = []
+        loads = []
+        mem_percents = []
+        mem_useds = []
+        for gpu in update['gpu'].values():
+            indices.append(gpu_indices.setdefault(gpu['uuid'], len(gpu_indices)))
+            loads.append(gpu['load'])
+            mem_percents.append(gpu['mem_percent'])
+            mem_useds.append(gpu['mem_used'])
+
+        report.gpu.indices.extend(indices)
+        report.gpu.loads.extend(loads)
+        report.gpu.mem_percents.extend(mem_percents)
+        report.gpu.mem_useds.extend(mem_useds)
+    return report
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    partitions = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    gpus = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+    update = sample_update(users, partitions, gpus)
+
+    partition_indices = {}
+    gpu_indices = {}
+    by_hand = pack_by_hand(update, partition_indices, gpu_indices)
+
+    packer = Packer()
+    report = proto_report.Report()
+
+    def pack_mapped():
+        report.Clear()
+        report.pool_id = update['pool_id']
+        report.node_id = update['node_id']
+        report.time_stamp = update['time']
+        packer.pack(report, update)
+
+    pack_mapped()
+    if report != by_hand:
+        print("Warning: the mapping packs a different Report than packing by hand.")
+
+    hand_us = timeit.timeit(lambda: pack_by_hand(update, partition_indices, gpu_indices),
+                            number=iterations) / iterations * 1e6
+    mapped_us = timeit.timeit(pack_mapped, number=iterations) / iterations * 1e6
+    print(f"{users} users, {partitions} partitions, {gpus} GPUs, {len(by_hand.SerializeToString())} byte Report")
+    print(f"{'by hand':<10}{hand_us:>10.1f} us/beat")
+    print(f"{'mapping':<10}{mapped_us:>10.1f} us/beat  {hand_us / mapped_us:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
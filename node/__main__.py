@@ -1,15 +1,15 @@
 """
 Runs the Node module on the target machine.
 """
-from node.telemetry.metrics.gpu import GPU
 from node.telemetry.subscriber import ConsoleSubscriber
 from node.net.pack import NetworkSubscriber
+from node.net.record import RecordingSubscriber
 from node.telemetry.heart import Heart
-from node.telemetry.metrics.cpu import CPU
-from node.telemetry.metrics.ram import RAM
-from node.telemetry.metrics.disk import Disk
-from node.telemetry.metrics.session import Session
-from node.telemetry.metrics.battery import Battery
+from node.telemetry.adaptive import AdaptiveRate
+from node.telemetry.aggregate import AggregatingSubscriber
+from node.telemetry import registry
+import node.constants as const
+import signal
 
 
 def main():
@@ -18,24 +18,34 @@ def main():
     :return:
     """
 
-    heart = Heart(0, 0, 1)
+    adaptive = AdaptiveRate(const.ADAPTIVE_MIN_RATE, const.ADAPTIVE_MAX_RATE, const.ADAPTIVE_CALM_DELTA,
+                            const.ADAPTIVE_ACTIVE_DELTA, const.ADAPTIVE_WINDOW, const.ADAPTIVE_HOLD,
+                            const.ADAPTIVE_CPU_PERCENT, const.ADAPTIVE_RAM_PERCENT) if const.ADAPTIVE_ENABLED else None
+    rate = const.AGGREGATE_RATE if const.AGGREGATE_WINDOW > 0 else 1
+    heart = Heart(0, 0, rate, const.HEART_WORKERS, const.HEART_METRIC_TIMEOUT,
+                  const.DISPATCH_QUEUE_SIZE, const.DISPATCH_POLICY, const.HEART_HISTOGRAM_WINDOW, adaptive)
     debug = ConsoleSubscriber()
     net = NetworkSubscriber(heart)
     heart.register_subscriber(debug)
-    heart.register_subscriber(net)
-
-    cpu = CPU()
-    gpu = GPU()
-    ram = RAM()
-    disk = Disk()
-    session = Session()
-    battery = Battery()
-    heart.register_metric(cpu)
-    heart.register_metric(gpu)
-    heart.register_metric(ram)
-    heart.register_metric(disk)
-    heart.register_metric(session)
-    heart.register_metric(battery)
+    if const.AGGREGATE_WINDOW > 0:
+        heart.register_subscriber(AggregatingSubscriber(net, const.AGGREGATE_WINDOW))
+    else:
+        heart.register_subscriber(net)
+    if const.RECORD_DIRECTORY:
+        recorder = RecordingSubscriber(const.RECORD_DIRECTORY, const.RECORD_SEGMENT_SIZE, const.RECORD_SEGMENTS)
+        heart.register_subscriber(AggregatingSubscriber(recorder, const.AGGREGATE_WINDOW)
+                                  if const.AGGREGATE_WINDOW > 0 else recorder)
+
+    for metric in registry.load(const.METRICS_ENABLED, const):
+        heart.register_metric(metric, const.METRIC_INTERVALS.get(metric.metric_name()),
+                              const.METRIC_TIMEOUTS.get(metric.metric_name()))
+
+    def stop(signum, frame):
+        print(f"Stopping on signal {signum}.")
+        heart.kill(block=False)  # Subscribers pass on anything held back, e.g. a partial aggregate, as they close
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
 
 
 if __name__ == '__main__':
@@ -17,9 +17,12 @@ except Exception as e:
 
 def check_config(cat: str, const: str, default, typ):
     if config.has_section(cat) and config.has_option(cat, const):
-        return typ(config[cat][const])
+        value = config[cat][const]
     else:
-        return typ(default)
+        value = default
+    if typ is bool:
+        return str(value).strip().lower() in ('true', 'yes', 'on', '1')  # bool('False') is True
+    return typ(value)
 
 
 """
@@ -28,6 +31,130 @@ Constants Below Here
 
 SERVER_IP = check_config("SERVER", "SERVER_IP", "localhost", str)
 NODE_NAME = check_config("NODE", "NAME", f"{platform.node()}", str)
+METRIC_BACKEND = check_config("NODE", "BACKEND", "psutil", str)  # psutil, or procfs to read /proc directly (Linux)
 MEMORY_FILE = pathlib.Path('node_memory.pkl')
 BROKER_PORT = 3030
+INVENTORY_INTERVAL = check_config("NETWORK", "INVENTORY_INTERVAL", 300, float)  # Seconds between Inventory resends
+DELTA = check_config("NETWORK", "DELTA", False, bool)  # Send only changed fields between keyframes
+KEYFRAME_INTERVAL = check_config("NETWORK", "KEYFRAME_INTERVAL", 60, int)  # Reports between keyframes in DELTA mode
+COMPRESSION = check_config("NETWORK", "COMPRESSION", True, bool)  # Offer installed codecs (zstd, lz4) to the Broker
 
+"""
+Report batching. Reports are sent together once BATCH_SIZE are waiting or the oldest is BATCH_SECONDS old.
+A report with a value at or above an URGENT threshold (percent) is sent immediately, with anything waiting.
+"""
+BATCH_SIZE = check_config("BATCH", "SIZE", 1, int)  # 1 sends every report on its own
+BATCH_SECONDS = check_config("BATCH", "SECONDS", 10, float)
+URGENT_CPU_PERCENT = check_config("BATCH", "URGENT_CPU_PERCENT", 90, float)
+URGENT_RAM_PERCENT = check_config("BATCH", "URGENT_RAM_PERCENT", 90, float)
+URGENT_DISK_PERCENT = check_config("BATCH", "URGENT_DISK_PERCENT", 90, float)
+
+"""
+Store and forward. While the Collector is unreachable or backed up, full Reports are kept in a SPOOL_SIZE byte ring
+file (0 to drop them instead). Once it's back, up to SPOOL_DRAIN_RATE spooled Reports are sent alongside each new one.
+"""
+SPOOL_FILE = pathlib.Path(check_config("SPOOL", "FILE", "node_spool.bin", str))
+SPOOL_SIZE = check_config("SPOOL", "SIZE", 16 * 1024 * 1024, int)
+SPOOL_DRAIN_RATE = check_config("SPOOL", "DRAIN_RATE", 10, int)
+
+"""
+Metrics measured, comma separated in registration order (see node.telemetry.registry). Only the modules of enabled
+Metrics are imported, and Metrics which don't apply to the machine (battery, gpu, pressure) are skipped.
+Metrics installed by other packages are enabled by their 'shepherd.metrics' entry point name.
+"""
+METRICS_ENABLED = [name.strip() for name in check_config(
+        "METRICS", "ENABLED", "cpu,gpu,ram,disk,session,battery,network,process,pressure", str).split(',') if name.strip()]
+
+"""
+Heart collection. WORKERS > 0 measures Metrics concurrently, each allowed METRIC_TIMEOUT seconds (0 is one beat).
+"""
+HEART_WORKERS = check_config("HEART", "WORKERS", 0, int)
+HEART_METRIC_TIMEOUT = check_config("HEART", "METRIC_TIMEOUT", 0, float)
+HEART_HISTOGRAM_WINDOW = check_config("HEART", "HISTOGRAM_WINDOW", 60, int)  # Beats of latency and jitter kept
+
+"""
+Subscriber dispatch. Each Subscriber has a queue of up to QUEUE_SIZE updates, delivered on its own thread.
+POLICY is what happens when a queue is full: drop-oldest, drop-newest, or block (holding up measurement).
+"""
+DISPATCH_QUEUE_SIZE = check_config("DISPATCH", "QUEUE_SIZE", 16, int)
+DISPATCH_POLICY = check_config("DISPATCH", "POLICY", "drop-oldest", str)
+
+"""
+Adaptive heart rate. When ENABLED, the rate halves (down to MIN_RATE Hz) each WINDOW beats that CPU and RAM usage move
+less than CALM_DELTA percentage points, and bursts to MAX_RATE Hz for at least HOLD seconds when either moves ACTIVE_DELTA
+points within a window or reaches its PERCENT threshold. Changes in between keep the current rate.
+"""
+ADAPTIVE_ENABLED = check_config("ADAPTIVE", "ENABLED", False, bool)
+ADAPTIVE_MIN_RATE = check_config("ADAPTIVE", "MIN_RATE", 0.1, float)
+ADAPTIVE_MAX_RATE = check_config("ADAPTIVE", "MAX_RATE", 2, float)
+ADAPTIVE_WINDOW = check_config("ADAPTIVE", "WINDOW", 10, int)
+ADAPTIVE_CALM_DELTA = check_config("ADAPTIVE", "CALM_DELTA", 1.0, float)
+ADAPTIVE_ACTIVE_DELTA = check_config("ADAPTIVE", "ACTIVE_DELTA", 5.0, float)
+ADAPTIVE_HOLD = check_config("ADAPTIVE", "HOLD", 30, float)
+ADAPTIVE_CPU_PERCENT = check_config("ADAPTIVE", "CPU_PERCENT", 90, float)
+ADAPTIVE_RAM_PERCENT = check_config("ADAPTIVE", "RAM_PERCENT", 90, float)
+
+"""
+Top processes. Each measurement reports the TOP processes by CPU and by RSS, sampling at most BUDGET processes
+(round-robin, besides the last top ones) to bound its cost on busy hosts.
+"""
+PROCESS_TOP = check_config("PROCESS", "TOP", 5, int)
+PROCESS_BUDGET = check_config("PROCESS", "BUDGET", 500, int)
+
+"""
+Network interfaces. Interfaces matching any EXCLUDE pattern (comma separated, fnmatch style) aren't reported,
+by default (None) loopback and the virtual interfaces of containers, bridges and overlays, see network.DEFAULT_EXCLUDE.
+"""
+INTERFACE_EXCLUDE = [pattern.strip() for pattern in config["INTERFACES"]["EXCLUDE"].split(',')] \
+    if config.has_option("INTERFACES", "EXCLUDE") else None
+
+"""
+GPUs. With STREAMING, one COMMAND (nvidia-smi) child keeps sampling every LOOP_MS milliseconds and measurements read its
+latest sample, rather than GPUtil starting nvidia-smi for every measurement. COMMAND may be any script printing the same
+CSV lines, e.g. tests/fake_nvidia_smi.py to test on machines without GPUs.
+"""
+GPU_STREAMING = check_config("GPU", "STREAMING", True, bool)
+GPU_COMMAND = check_config("GPU", "COMMAND", "nvidia-smi", str)
+GPU_LOOP_MS = check_config("GPU", "LOOP_MS", 1000, int)
+
+"""
+Recording. With a DIRECTORY, every Report is also written to .spdrec segments there, replayable into a Collector with
+python -m node.net.replay. A new segment is started every SEGMENT_SIZE bytes, keeping the last SEGMENTS (0 for all).
+"""
+RECORD_DIRECTORY = check_config("RECORD", "DIRECTORY", "", str)  # Empty to not record
+RECORD_SEGMENT_SIZE = check_config("RECORD", "SEGMENT_SIZE", 64 * 1024 * 1024, int)
+RECORD_SEGMENTS = check_config("RECORD", "SEGMENTS", 8, int)
+
+"""
+Pressure stall information and cgroups (Linux). Besides the system wide pressure, the CPU usage, throttling and memory of
+each cgroup in PATHS (comma separated paths under ROOT, / for the root cgroup) are reported, along with their nested
+cgroups down to DEPTH levels, at most LIMIT cgroups in all. Cgroups are re-discovered every RESCAN seconds.
+"""
+CGROUPS = [path.strip() for path in check_config("CGROUPS", "PATHS", "", str).split(',') if path.strip()]
+CGROUP_DEPTH = check_config("CGROUPS", "DEPTH", 0, int)
+CGROUP_LIMIT = check_config("CGROUPS", "LIMIT", 16, int)
+CGROUP_RESCAN = check_config("CGROUPS", "RESCAN", 60, float)
+CGROUP_ROOT = check_config("CGROUPS", "ROOT", "/sys/fs/cgroup", str)
+
+"""
+Pre-aggregation. With a WINDOW (seconds) over 0, the Heart samples at RATE Hz and the network sends one Report per
+window, holding its last values alongside the count, min, max and mean over the window of each gauge field listed in
+aggregate.GAUGES (e.g. CPU percent and load, RAM used, disk and network rates), counting only beats which measured it.
+Counters, identities and Metrics without gauges (process, session) are only sent as their last values.
+"""
+AGGREGATE_WINDOW = check_config("AGGREGATE", "WINDOW", 0, float)
+AGGREGATE_RATE = check_config("AGGREGATE", "RATE", 10, float)
+
+"""
+Per-Metric measurement intervals (seconds), keyed by Metric name.
+Metrics not listed use their own metric_interval().
+"""
+METRIC_INTERVALS = {name: float(interval) for name, interval in config["INTERVALS"].items()} \
+    if config.has_section("INTERVALS") else {}
+
+"""
+Per-Metric concurrent measurement timeouts (seconds), keyed by Metric name.
+Metrics not listed use HEART_METRIC_TIMEOUT.
+"""
+METRIC_TIMEOUTS = {name: float(timeout) for name, timeout in config["TIMEOUTS"].items()} \
+    if config.has_section("TIMEOUTS") else {}
@@ -0,0 +1,410 @@
+"""
+Declarative mapping from Heart update dicts to Report fields.
+Each Metric's Section lists which dict keys go to which fields of its Report message. Sections are compiled once by a
+Packer into precomputed getters, and a Report is filled with one assignment per scalar and one bulk extend per repeated
+field.
+A new Metric is packed by registering its Section (and adding its message to report.proto), without editing pack.py.
+"""
+from operator import itemgetter
+
+import proto.report_pb2 as proto_report
+
+
+class Key:
+    """
+    Row column holding the key each row is stored under, e.g. the user name of a session. Used as the class itself.
+    """
+    pass
+
+
+class Value:
+    """
+    Row column holding a value which may be None, replaced with a default since protobuf fields can't be None.
+    """
+
+    def __init__(self, key: str, default):
+        """
+        :param key: row key
+        :param default: value used for None
+        """
+        self.key = key
+        self.default = default
+
+
+class Index:
+    """
+    Row column holding the Inventory index of a device rather than the device itself.
+    Indices are allocated in order of first appearance and never reused, so a returning device keeps its index.
+    """
+
+    def __init__(self, name: str, key: str):
+        """
+        :param name: name of the index, shared with the Inventory (see Packer.indices)
+        :param key: row key identifying the device
+        """
+        self.name = name
+        self.key = key
+
+
+class Rows:
+    """
+    Repeated fields filled from a dict of rows, one list entry per row.
+    """
+
+    def __init__(self, source, columns: dict):
+        """
+        :param source: key (or tuple of nested keys) of the dict of rows, () if the Metric's dict is the rows
+        :param columns: dict of repeated field name -> row key, Key, Value or Index
+        """
+        self.source = source
+        self.columns = columns
+
+
+class Section:
+    """
+    How a Metric's dict is packed into its Report message.
+    """
+
+    def __init__(self, metric: str, field: str = None, scalars: dict = None, repeated: dict = None,
+                 rows: list = None, when=None):
+        """
+        :param metric: Metric name, the key of its dict in the update
+        :param field: Report field of the message, defaults to the Metric name
+        :param scalars: dict of field name -> key (or tuple of nested keys)
+        :param repeated: dict of repeated field name -> key (or tuple of nested keys) of a list
+        :param rows: list of Rows
+        :param when: callable taking the Metric's dict, the Section is only packed when it returns True
+        """
+        self.metric = metric
+        self.field = field or metric
+        self.scalars = scalars or {}
+        self.repeated = repeated or {}
+        self.rows = rows or []
+        self.when = when
+
+
+SECTIONS = {}  # Metric name -> Section
+
+
+def register(section: Section) -> None:
+    """
+    Adds (or replaces) the Section for a Metric. Packers compiled afterwards include it.
+    :param section: Section
+    :return: None
+    """
+    SECTIONS[section.metric] = section
+
+
+class Packer:
+    """
+    Packs update dicts into Reports, following compiled Sections.
+    Each Section is compiled once into a tuple of precomputed getters, so a beat costs about the same as packing by
+    hand: no per-field parsing of the mapping, and one bulk extend per repeated field.
+    """
+
+    def __init__(self, sections=None):
+        """
+        Compiles the Sections.
+        :param sections: iterable of Section, defaults to every registered Section
+        :raises: ValueError if a Section names a field which isn't in the Report
+        """
+        self.indices = {}  # Index name -> {device: index}
+        self._sections = tuple(self._compile(section)
+                               for section in (sections if sections is not None else SECTIONS.values()))
+
+    def pack(self, report, update: dict) -> None:
+        """
+        Fills a (cleared) Report's sections from an update. Metrics missing from the update are left empty.
+        :param report: Report
+        :param update: dict Update from Heart
+        :return: None
+        """
+        for metric, field, when, scalars, repeated, rows in self._sections:
+            data = update.get(metric)
+            if data is None or when is not None and not when(data):
+                continue
+            message = getattr(report, field)
+            for get, names, values in scalars:
+                for name, value in zip(names, values(get(data))):
+                    setattr(message, name, value)
+            for name, get in repeated:
+                getattr(message, name).extend(get(data))
+            for get, keys, names, values, columns in rows:
+                table = get(data)
+                if not table:
+                    continue
+                for name in keys:
+                    getattr(message, name).extend(table)
+                if names:
+                    for name, column in zip(names, zip(*map(values, table.values()))):
+                        getattr(message, name).extend(column)
+                for name, column in columns:
+                    getattr(message, name).extend(column(table.values()))
+
+    def inventory(self, update: dict) -> tuple:
+        """
+        Reads the static Disk and GPU fields of an update, which are sent in an Inventory rather than every Report.
+        Devices are numbered by the 'partitions' and 'gpus' indices, so pack() the update first.
+        :param update: dict Update from Heart
+        :return: (tuple of partition tuples, tuple of GPU tuples), comparable to tell whether it changed
+        """
+        partition_indices = self.indices.setdefault('partitions', {})
+        gpu_indices = self.indices.setdefault('gpus', {})
+        partitions = tuple((partition_indices[part['device']], part['device'], part['mount_point'], part['fstype'],
+                            part['total'])
+                           for part in update['disk']['partitions'].values()) if 'disk' in update.keys() else ()
+        gpus = tuple((gpu_indices[gpu['uuid']], gpu['uuid'], gpu['mem_total'], gpu['driver'], gpu['product'],
+                      gpu['serial'], gpu['display_mode'])
+                     for gpu in update['gpu'].values()) if 'gpu' in update.keys() else ()
+        return partitions, gpus
+
+    @staticmethod
+    def pack_inventory(message, inventory: tuple) -> None:
+        """
+        Fills an Inventory message.
+        :param message: Report.Inventory, e.g. report.inventory
+        :param inventory: tuple from inventory()
+        :return: None
+        """
+        partitions, gpus = inventory
+        for index, device, mount_point, fstype, total in partitions:
+            message.partition_indices.append(index)
+            message.partition_ids.append(device)
+            message.mount_points.append(mount_point)
+            message.fstypes.append(fstype)
+            message.totals.append(total)
+        for index, uuid, mem_total, driver, product, serial, display_mode in gpus:
+            message.gpu_indices.append(index)
+            message.gpu_uuids.append(uuid)
+            message.gpu_mem_totals.append(mem_total)
+            message.gpu_drivers.append(driver)
+            message.gpu_products.append(product)
+            message.gpu_serials.append(serial)
+            message.gpu_display_modes.append(display_mode)
+        message.SetInParent()  # Present even when there's nothing to list
+
+    def _compile(self, section: Section) -> tuple:
+        """
+        Precomputes the getters packing a Section.
+        Scalars are grouped by the dict holding them, and plain row columns by their Rows, so each group is read with a
+        single itemgetter.
+        :param section: Section
+        :return: (metric, field, when, scalars, repeated, rows) as iterated by pack()
+        :raises: ValueError if the Section names a field which isn't in the Report
+        """
+        descriptor = proto_report.Report.DESCRIPTOR.fields_by_name.get(section.field)
+        if descriptor is None or descriptor.message_type is None:
+            raise ValueError(f"Report has no message field {section.field} for Metric {section.metric}.")
+        fields = descriptor.message_type.fields_by_name
+        for name in list(section.scalars) + list(section.repeated) + [name for rows in section.rows
+                                                                       for name in rows.columns]:
+            if name not in fields:
+                raise ValueError(f"Report.{section.field} has no field {name} for Metric {section.metric}.")
+
+        groups = {}  # Path of the dict holding the scalars -> {field name: key}
+        for name, key in section.scalars.items():
+            path = key if isinstance(key, tuple) else (key,)
+            groups.setdefault(path[:-1], {})[name] = path[-1]
+        scalars = tuple((Packer._getter(path), tuple(keys), Packer._values(tuple(keys.values())))
+                        for path, keys in groups.items())
+        repeated = tuple((name, Packer._getter(key)) for name, key in section.repeated.items())
+        rows = []
+        for spec in section.rows:
+            keys = tuple(name for name, column in spec.columns.items() if column is Key)
+            plain = {name: column for name, column in spec.columns.items() if isinstance(column, str)}
+            if len(plain) == 1:
+                plain = {}  # Not worth grouping, read as a column of its own
+            columns = tuple((name, self._column(column)) for name, column in spec.columns.items()
+                            if column is not Key and name not in plain)
+            rows.append((Packer._getter(spec.source), keys, tuple(plain),
+                         Packer._values(tuple(plain.values())) if plain else None, columns))
+        return section.metric, section.field, section.when, scalars, repeated, tuple(rows)
+
+    def _column(self, column):
+        """
+        Precomputes the getter of a row column which isn't read with others of its Rows.
+        :param column: row key, Value or Index
+        :return: callable taking the rows, returning the field's values
+        """
+        if isinstance(column, str):
+            get = itemgetter(column)
+            return lambda rows: list(map(get, rows))
+        get = itemgetter(column.key)
+        if isinstance(column, Value):
+            default = column.default
+            return lambda rows: [value if value is not None else default for value in map(get, rows)]
+        indices = self.indices.setdefault(column.name, {})
+        return lambda rows: [indices[key] if key in indices else indices.setdefault(key, len(indices))
+                             for key in map(get, rows)]
+
+    @staticmethod
+    def _getter(key):
+        """
+        Precomputes the lookup of a key, or of a tuple of nested keys.
+        :param key: str key or tuple of str keys, the empty tuple is the dict itself
+        :return: callable taking a dict
+        """
+        if not isinstance(key, tuple):
+            return itemgetter(key)
+        if not key:
+            return lambda data: data
+        if len(key) == 1:
+            return itemgetter(key[0])
+
+        def get(data):
+            for part in key:
+                data = data[part]
+            return data
+        return get
+
+    @staticmethod
+    def _values(keys: tuple):
+        """
+        Precomputes the lookup of several keys of one dict.
+        :param keys: tuple of str keys
+        :return: callable taking a dict, returning a tuple of its values
+        """
+        if len(keys) == 1:
+            key, = keys
+            return lambda data: (data[key],)
+        return itemgetter(*keys)
+
+
+register(Section('cpu', scalars={
+        'logical_cores': 'logical_cores',
+        'current_freq': 'current_frequency',
+        'max_freq': 'max_frequency',
+        'percent': 'percent',
+        'load_1': 'load_1',
+        'load_5': 'load_5',
+        'load_15': 'load_15',
+}, repeated={
+        'core_percents': 'per_core_percent',
+}))
+
+register(Section('ram', scalars={
+        'virt_total': 'virt_total',
+        'virt_available': 'virt_available',
+        'virt_used': 'virt_used',
+        'virt_free': 'virt_free',
+        'swap_total': 'swap_total',
+        'swap_percent': 'swap_percent',
+        'swap_used': 'swap_used',
+        'swap_free': 'swap_free',
+}))
+
+register(Section('disk', scalars={
+        'read_cnt': ('io', 'read_count'),
+        'write_cnt': ('io', 'write_count'),
+        'read_bytes': ('io', 'read_bytes'),
+        'write_bytes': ('io', 'write_bytes'),
+        'read_time': ('io', 'read_time'),
+        'write_time': ('io', 'write_time'),
+}, rows=[Rows('partitions', {
+        'indices': Index('partitions', 'device'),
+        'useds': 'used',
+        'frees': 'free',
+        'percents': 'percent',
+}), Rows('devices', {
+        'devices': Key,
+        'read_iops': 'read_iops',
+        'write_iops': 'write_iops',
+        'read_rates': 'read_bytes',
+        'write_rates': 'write_bytes',
+        'awaits': 'await',
+        'utilizations': 'utilization',
+})]))
+
+register(Section('battery', scalars={
+        'percent': 'percent',
+        'secs_left': 'secs_left',
+        'power_plugged': 'power_plugged',
+}, when=lambda data: data['power_plugged'] is not None))
+
+register(Section('session', scalars={
+        'boot_time': 'boot_time',
+        'uptime': 'uptime',
+}, rows=[Rows('users', {
+        'users': Key,
+        'terminals': Value('terminal', ''),
+        'hosts': Value('host', ''),
+        'started_times': 'started',
+        'pids': Value('pid', 0),
+})]))
+
+register(Section('gpu', rows=[Rows((), {
+        'indices': Index('gpus', 'uuid'),
+        'loads': 'load',
+        'mem_percents': 'mem_percent',
+        'mem_useds': 'mem_used',
+})]))
+
+register(Section('process', scalars={
+        'tracked': 'tracked',
+}, rows=[Rows('processes', {
+        'pids': 'pid',
+        'names': 'name',
+        'cpu_percents': 'cpu_percent',
+        'rsss': 'rss',
+})]))
+
+register(Section('network', rows=[Rows('interfaces', {
+        'names': Key,
+        'rx_bytes': 'rx_bytes',
+        'rx_packets': 'rx_packets',
+        'rx_errors': 'rx_errors',
+        'rx_drops': 'rx_drops',
+        'tx_bytes': 'tx_bytes',
+        'tx_packets': 'tx_packets',
+        'tx_errors': 'tx_errors',
+        'tx_drops': 'tx_drops',
+        'speeds': 'speed',
+})]))
+
+register(Section('pressure', scalars={
+        'cpu_some_avg10': ('cpu', 'some_avg10'),
+        'cpu_some_avg60': ('cpu', 'some_avg60'),
+        'cpu_full_avg10': ('cpu', 'full_avg10'),
+        'cpu_full_avg60': ('cpu', 'full_avg60'),
+        'memory_some_avg10': ('memory', 'some_avg10'),
+        'memory_some_avg60': ('memory', 'some_avg60'),
+        'memory_full_avg10': ('memory', 'full_avg10'),
+        'memory_full_avg60': ('memory', 'full_avg60'),
+        'io_some_avg10': ('io', 'some_avg10'),
+        'io_some_avg60': ('io', 'some_avg60'),
+        'io_full_avg10': ('io', 'full_avg10'),
+        'io_full_avg60': ('io', 'full_avg60'),
+}, rows=[Rows('cgroups', {
+        'cgroups': Key,
+        'cpu_percents': 'cpu_percent',
+        'throttled_percents': 'throttled_percent',
+        'memory_currents': 'memory_current',
+        'memory_maxs': 'memory_max',
+})]))
+
+register(Section('agent', scalars={
+        'cpu_time': 'cpu_time',
+        'cpu_percent': 'cpu_percent',
+        'rss': 'rss',
+        'irregular': 'irregular',
+        'skipped': 'skipped',
+}, rows=[Rows('metrics', {
+        'metrics': Key,
+        'metric_latencies': 'latency',
+}), Rows('subscribers', {
+        'subscribers': Key,
+        'subscriber_queued': 'queued',
+        'subscriber_dropped': 'dropped',
+        'subscriber_unsent': 'unsent',
+})]))
+
+register(Section('aggregate', scalars={
+        'count': 'count',
+        'start_ms': 'start_ms',
+}, rows=[Rows('fields', {
+        'fields': Key,
+        'counts': 'count',
+        'mins': 'min',
+        'maxs': 'max',
+        'means': 'mean',
+})]))
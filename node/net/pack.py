@@ -3,9 +3,17 @@ Facilitates packing the Metric data into Protobuf messages, sent via 0MQ
 """
 from node.telemetry.subscriber import Subscriber
 import proto.report_pb2 as proto_report
+import proto.frame as frame
 from proto.negotiation_pb2 import Negotiation
+from proto.control_pb2 import Control
+import proto.codec as codec
+from node.net.spool import Spool
+from node.net.thresholds import Thresholds
+import node.net.mapping as mapping
 import node.constants as const
 import zmq
+from zmq.utils.monitor import recv_monitor_message
+import time
 import node.memory
 
 
@@ -15,6 +23,10 @@ class NetworkSubscriber(Subscriber):
     The message is then sent to a target via 0MQ Pub-Sub Pairs.
     """
 
+    # Report sections (CPU, RAM, ...) which delta encoding compares field by field
+    _SECTIONS = [field for field in proto_report.Report.DESCRIPTOR.fields
+                 if field.type == field.TYPE_MESSAGE and field.name != 'inventory']
+
     def __init__(self, heart):
         super().__init__()
         self.context = zmq.Context()
@@ -33,6 +45,8 @@ class NetworkSubscriber(Subscriber):
             negotiation.node_proposes_id = True
             negotiation.node_id = node_id
             negotiation.pool_id = pool_id
+        if const.COMPRESSION:
+            negotiation.codecs.extend(codec.available())
 
         broker = self.context.socket(zmq.REQ)
         broker.connect(f"tcp://{const.SERVER_IP}:{const.BROKER_PORT}")
@@ -55,16 +69,124 @@ class NetworkSubscriber(Subscriber):
         broker.close()
 
         print(f"Collector Publishing -> {const.SERVER_IP}:{self.port}")
-        self.socket = self.context.socket(zmq.PUB)
+        # With XPUB NODROP a send fails instead of being dropped when the Collector is backed up,
+        # and IMMEDIATE doesn't queue reports for a Collector which isn't connected
+        self.socket = self.context.socket(zmq.XPUB)
         self.socket.setsockopt(zmq.SNDHWM, 2)
+        self.socket.setsockopt(zmq.XPUB_NODROP, 1)
+        self.socket.setsockopt(zmq.IMMEDIATE, 1)
+        self.monitor = self.socket.get_monitor_socket(zmq.EVENT_HANDSHAKE_SUCCEEDED | zmq.EVENT_DISCONNECTED)
         self.socket.connect(f"tcp://{const.SERVER_IP}:{self.port}")
+        self._connected = False
+        self._handshake = False  # Connected since the last update, sending starts from the next
+
+        # Reports which couldn't be sent are kept on disk until the Collector is back
+        self._spool = None
+        if const.SPOOL_SIZE > 0:
+            self._spool = Spool(const.SPOOL_FILE, const.SPOOL_SIZE)
+            if len(self._spool):
+                print(f"{len(self._spool)} spooled reports waiting in {const.SPOOL_FILE}")
+
+        # Frames are compressed when the Broker chose a codec
+        self._codec = None
+        if broker_negotiation.codec:
+            print(f"Compressing with {broker_negotiation.codec} "
+                  f"({len(broker_negotiation.dictionary)} byte dictionary)")
+            self._codec = codec.Codec(broker_negotiation.codec, broker_negotiation.dictionary)
+
+        # Reports are packed following the registered mapping Sections, alternating between two Reports
+        # so the last one sent is kept for delta encoding
+        self._packer = mapping.Packer()
+        self._reports = [proto_report.Report(), proto_report.Report()]
+
+        # Static Disk and GPU fields are sent in an Inventory when they change, reports refer to them by the index the
+        # Packer gives each device
+        self._inventory = None  # Last Inventory sent
+        self._inventory_time = 0  # time.monotonic() the last Inventory was sent
+        self._inventory_message = proto_report.Report.Inventory()  # Last Inventory packed, attached to spooled Reports
+
+        # In DELTA mode, reports between keyframes only carry the fields that changed
+        self._sequence = 0
+        self._last_report = None  # Last full Report, the next delta is computed against it
+        self._since_keyframe = 0
+        self._keyframe_requested = False
+
+        # Reports waiting to be sent together, when batching
+        self._batch = proto_report.ReportBatch()
+        self._batch_time = 0  # time.monotonic() the oldest waiting Report was added
+        self._batch_full = []  # Full Reports in the batch, spooled if it can't be sent
+        self._breached = set()  # URGENT thresholds crossed by the last update
+        self.unsent = 0  # Reports which couldn't be sent when packed, spooled if there's a spool
+
+        # Anomaly thresholds from the Broker are evaluated here, and a crossing is alerted immediately
+        self._thresholds = None
+        if broker_negotiation.HasField('thresholds'):
+            self._thresholds = Thresholds(broker_negotiation.thresholds)
+        self._alerted = set()  # Thresholds breached and alerted, alerted again only after clearing
+
+        # The Collector may ask for a keyframe (e.g. after a gap) on the control port
+        self.control = None
+        if broker_negotiation.control_port:
+            print(f"Collector Control <- {const.SERVER_IP}:{broker_negotiation.control_port}")
+            self.control = self.context.socket(zmq.SUB)
+            self.control.setsockopt(zmq.SUBSCRIBE, f"{self.pool_id}:{self.node_id}:".encode())
+            self.control.connect(f"tcp://{const.SERVER_IP}:{broker_negotiation.control_port}")
 
     def subscriber_name(self) -> str:
         """
         Provides the subscriber name.
         :return: str name
         """
-        return f"zmq:{str(self.socket)}"
+        return f"zmq:tcp://{const.SERVER_IP}:{self.port}"  # Stable across restarts, it names a series in the database
+
+    def stats(self) -> dict:
+        """
+        Send counters, reported in the Heart's agent telemetry.
+        :return: dict of unsent (Reports not sent when packed), spooled (waiting in the spool) and spool_dropped
+        """
+        return {
+                'unsent': self.unsent,
+                'spooled': len(self._spool) if self._spool is not None else 0,
+                'spool_dropped': self._spool.dropped if self._spool is not None else 0,
+        }
+
+    def close(self) -> None:
+        """
+        Sends the Reports waiting in a batch, spooling them if they can't be sent, then closes the sockets and the spool.
+        Sent messages get a second to leave before the sockets are closed.
+        :return: None
+        """
+        if self._batch.reports:
+            if not self._publish(frame.BATCH, self._batch.SerializeToString()):
+                self._store(self._batch_full)
+            self._batch.Clear()
+            self._batch_full = []
+        self.socket.disable_monitor()
+        self.monitor.close(0)
+        if self.control is not None:
+            self.control.close(0)
+        self.socket.close(1000)
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        self.context.term()
+
+    def _pack_inventory(self, report, update: dict) -> None:
+        """
+        Adds the Inventory to the report if it changed since it was last sent.
+        It is also resent every INVENTORY_INTERVAL, in case the Collector missed it.
+        :param report: Report being packed
+        :param update: dict Update from Heart
+        :return: None
+        """
+        inventory = self._packer.inventory(update)
+        now = time.monotonic()
+        if inventory == self._inventory and now - self._inventory_time < const.INVENTORY_INTERVAL:
+            return
+        self._inventory = inventory
+        self._inventory_time = now
+        mapping.Packer.pack_inventory(report.inventory, inventory)
+        self._inventory_message.CopyFrom(report.inventory)
 
     def update(self, update: dict) -> None:
         """
@@ -73,117 +195,220 @@ class NetworkSubscriber(Subscriber):
         :param update: dict Update from Heart
         :return: None
         """
-        report = proto_report.Report()
+        self._poll_connection()
+        self._poll_control()
+
+        report = self._reports[0] if self._reports[0] is not self._last_report else self._reports[1]
+        report.Clear()
         report.pool_id = update['pool_id']
         report.node_id = update['node_id']
         report.time_stamp = update['time']
+        report.time_ms = update['time_ms']
+        self._packer.pack(report, update)
 
-        report.cpu.logical_cores = update['cpu']['logical_cores']
-        report.cpu.current_freq = update['cpu']['current_frequency']
-        report.cpu.max_freq = update['cpu']['max_frequency']
-        report.cpu.percent = update['cpu']['percent']
-        report.cpu.load_1 = update['cpu']['load_1']
-        report.cpu.load_5 = update['cpu']['load_5']
-        report.cpu.load_15 = update['cpu']['load_15']
-
-        report.ram.virt_total = update['ram']['virt_total']
-        report.ram.virt_available = update['ram']['virt_available']
-        report.ram.virt_used = update['ram']['virt_used']
-        report.ram.virt_free = update['ram']['virt_free']
-        report.ram.swap_total = update['ram']['swap_total']
-        report.ram.swap_percent = update['ram']['swap_percent']
-        report.ram.swap_used = update['ram']['swap_used']
-        report.ram.swap_free = update['ram']['swap_free']
+        self._pack_inventory(report, update)
 
-        if 'disk' in update.keys():
-            devices = []
-            mount_points = []
-            fstypes = []
-            totals = []
-            useds = []
-            frees = []
-            percents = []
+        self._alert(update)
+        breaches = NetworkSubscriber._breaches(update)
+        self._send(report, urgent=bool(breaches - self._breached))
+        self._breached = breaches
+        self._drain()
+
+    def _poll_connection(self) -> None:
+        """
+        Tracks whether the Collector is connected, from the socket monitor.
+        Sending starts an update after connecting, giving the Collector's subscription time to arrive, and the first
+        Report sent carries the Inventory.
+        :return: None
+        """
+        if self._handshake:
+            self._handshake = False
+            self._connected = True
+        while self.monitor.poll(0):
+            event = recv_monitor_message(self.monitor)['event']
+            if event == zmq.EVENT_HANDSHAKE_SUCCEEDED:
+                self._handshake = True
+                self._inventory = None  # A restarted Collector has none, resend it with the first Report
+            elif event == zmq.EVENT_DISCONNECTED:
+                self._handshake = False
+                self._connected = False
+        while self.socket.poll(0):
+            self.socket.recv()  # Subscriptions, which aren't needed
+
+    def _poll_control(self) -> None:
+        """
+        Handles any pending Control requests from the Collector, without blocking.
+        :return: None
+        """
+        if self.control is None:
+            return
+        while self.control.poll(0):
+            _, message = self.control.recv_multipart()
+            control = Control()
+            control.ParseFromString(message)
+            if control.send_keyframe:
+                self._keyframe_requested = True
+                self._inventory = None  # The Inventory may have been missed too
 
+    def _alert(self, update: dict) -> None:
+        """
+        Sends an Alert for the thresholds the update newly breaches, ahead of its Report.
+        Breaches which couldn't be sent are tried again with the next update, while they last.
+        :param update: dict Update from Heart
+        :return: None
+        """
+        if self._thresholds is None:
+            return
+        breaches = self._thresholds.breaches(update)
+        new = {name: breach for name, breach in breaches.items() if name not in self._alerted}
+        self._alerted &= breaches.keys()
+        if not new:
+            return
+        if self._publish(frame.ALERT, Thresholds.alert(update, new).SerializeToString()):
+            self._alerted |= new.keys()
+
+    def _send(self, report, urgent: bool = False) -> None:
+        """
+        Numbers and sends a packed Report.
+        In DELTA mode only the changes since the last Report are sent, with a full keyframe every KEYFRAME_INTERVAL.
+        :param report: full Report
+        :param urgent: send now, even when batching
+        :return: None
+        """
+        self._sequence += 1
+        report.sequence = self._sequence
+        if const.DELTA and self._last_report is not None and not self._keyframe_requested \
+                and self._since_keyframe < const.KEYFRAME_INTERVAL:
+            message = NetworkSubscriber._diff(self._last_report, report)
+            self._since_keyframe += 1
+        else:
+            message = report
+            self._since_keyframe = 0
+            self._keyframe_requested = False
+        self._last_report = report
+
+        if const.BATCH_SIZE <= 1:
+            if not self._publish(frame.REPORT, message.SerializeToString()):
+                self._store([report])
+            return
+        if not self._batch.reports:
+            self._batch_time = time.monotonic()
+        self._batch.reports.append(message)
+        full = proto_report.Report()
+        full.CopyFrom(report)  # report is reused for packing
+        self._batch_full.append(full)
+        if urgent or len(self._batch.reports) >= const.BATCH_SIZE \
+                or time.monotonic() - self._batch_time >= const.BATCH_SECONDS:
+            if not self._publish(frame.BATCH, self._batch.SerializeToString()):
+                self._store(self._batch_full)
+            self._batch.Clear()
+            self._batch_full = []
+
+    def _publish(self, kind: bytes, message: bytes) -> bool:
+        """
+        Sends a serialized message to the Collector, compressed if a codec was negotiated.
+        :param kind: frame kind
+        :param message: serialized message
+        :return: bool whether it was sent, False if the Collector is unreachable or backed up
+        """
+        if not self._connected:
+            return False
+        if self._codec is None:
+            parts = [kind, message]
+        else:
+            parts = [kind, self._codec.frame, self._codec.compress(message)]
+        try:
+            self.socket.send_multipart(parts, zmq.NOBLOCK)
+        except zmq.Again:
+            return False
+        return True
+
+    def _store(self, reports: list) -> None:
+        """
+        Spools full Reports which couldn't be sent. Later Reports can't be deltas against them, so a keyframe follows.
+        Each carries the Inventory, since the Collector's may have changed by the time it's sent.
+        :param reports: list of full Reports
+        :return: None
+        """
+        self.unsent += len(reports)
+        self._keyframe_requested = True
+        self._inventory = None
+        if self._spool is None:
+            return
+        for report in reports:
+            spooled = proto_report.Report()
+            spooled.CopyFrom(report)
+            spooled.inventory.CopyFrom(self._inventory_message)
+            try:
+                self._spool.push(spooled.SerializeToString())
+            except ValueError as e:
+                print(f"Unable to spool report: {e}")
+
+    def _drain(self) -> None:
+        """
+        Sends up to SPOOL_DRAIN_RATE spooled Reports, oldest first, once the Collector is reachable.
+        :return: None
+        """
+        if self._spool is None or not len(self._spool) or not self._connected:
+            return
+        records = self._spool.peek(const.SPOOL_DRAIN_RATE)
+        batch = proto_report.ReportBatch()
+        for record in records:
+            batch.reports.add().ParseFromString(record)
+        if self._publish(frame.SPOOLED, batch.SerializeToString()):
+            self._spool.pop(len(records))
+            if not len(self._spool):
+                print(f"Spool drained ({self._spool.dropped} reports dropped while it was full).")
+
+    @staticmethod
+    def _breaches(update: dict) -> set:
+        """
+        Finds the URGENT thresholds an update is at or above.
+        A report which newly breaches one shouldn't wait in a batch.
+        :param update: dict Update from Heart
+        :return: set of str threshold names
+        """
+        breaches = set()
+        cpu = update.get('cpu')
+        if cpu and cpu['percent'] >= const.URGENT_CPU_PERCENT:
+            breaches.add('cpu')
+        ram = update.get('ram')
+        if ram and ram['virt_total'] and ram['virt_used'] / ram['virt_total'] * 100 >= const.URGENT_RAM_PERCENT:
+            breaches.add('ram')
+        if 'disk' in update.keys():
             for part in update['disk']['partitions'].values():
-                devices.append(part['device'])
-                mount_points.append(part['mount_point'])
-                fstypes.append(part['fstype'])
-                totals.append(part['total'])
-                useds.append(part['used'])
-                frees.append(part['free'])
-                percents.append(part['percent'])
-
-            report.disk.partition_ids.extend(devices)
-            report.disk.mount_points.extend(mount_points)
-            report.disk.fstypes.extend(fstypes)
-            report.disk.totals.extend(totals)
-            report.disk.useds.extend(useds)
-            report.disk.frees.extend(frees)
-            report.disk.percents.extend(percents)
-
-            report.disk.read_cnt = update['disk']['io']['read_count']
-            report.disk.write_cnt = update['disk']['io']['write_count']
-            report.disk.read_bytes = update['disk']['io']['read_bytes']
-            report.disk.write_bytes = update['disk']['io']['write_bytes']
-            report.disk.read_time = update['disk']['io']['read_time']
-            report.disk.write_time = update['disk']['io']['write_time']
-
-        if 'battery' in update.keys():
-            if update['battery']['power_plugged'] is not None:
-                report.battery.percent = update['battery']['percent']
-                report.battery.secs_left = update['battery']['secs_left']
-                report.battery.power_plugged = update['battery']['power_plugged']
-
-        if 'session' in update.keys():
-            report.session.boot_time = update['session']['boot_time']
-            report.session.uptime = update['session']['uptime']
-            users = []
-            terminals = []
-            hosts = []
-            started_times = []
-            pids = []
-            for user, attribs in update['session']['users'].items():
-                users.append(user)
-                terminals.append(attribs['terminal'] if attribs['terminal'] is not None else '')
-                hosts.append(attribs['host'] if attribs['host'] is not None else '')
-                started_times.append(attribs['started'])
-                pids.append(attribs['pid'] if attribs['pid'] is not None else 0)
-
-            report.session.users.extend(users)
-            report.session.terminals.extend(terminals)
-            report.session.hosts.extend(hosts)
-            report.session.started_times.extend(started_times)
-            report.session.pids.extend(pids)
-
-        if 'gpu' in update.keys():
-            uuids = []
-            loads = []
-            mem_percents = []
-            mem_totals = []
-            mem_useds = []
-            drivers = []
-            products = []
-            serials = []
-            display_modes = []
-            for gpu in update['gpu'].values():
-                uuids.append(gpu['uuid'])
-                loads.append(gpu['load'])
-                mem_percents.append(gpu['mem_percent'])
-                mem_totals.append(gpu['mem_total'])
-                mem_useds.append(gpu['mem_used'])
-                drivers.append(gpu['driver'])
-                products.append(gpu['product'])
-                serials.append(gpu['serial'])
-                display_modes.append(gpu['display_mode'])
-
-            report.gpu.uuids.extend(uuids)
-            report.gpu.loads.extend(loads)
-            report.gpu.mem_percents.extend(mem_percents)
-            report.gpu.mem_totals.extend(mem_totals)
-            report.gpu.mem_useds.extend(mem_useds)
-            report.gpu.drivers.extend(drivers)
-            report.gpu.products.extend(products)
-            report.gpu.serials.extend(serials)
-            report.gpu.display_modes.extend(display_modes)
-
-        self.socket.send(report.SerializeToString())
+                if part['percent'] >= const.URGENT_DISK_PERCENT:
+                    breaches.add(f"disk:{part['device']}")
+        return breaches
+
+    @staticmethod
+    def _diff(previous, current):
+        """
+        Builds a delta Report of the section fields which differ between two full Reports.
+        Top level fields and the Inventory are always copied.
+        :param previous: full Report the Collector already has
+        :param current: full Report to send
+        :return: delta Report
+        """
+        delta = proto_report.Report()
+        for field in current.DESCRIPTOR.fields:
+            if field.type != field.TYPE_MESSAGE and field.label != field.LABEL_REPEATED:
+                setattr(delta, field.name, getattr(current, field.name))
+        delta.delta = True
+        if current.HasField('inventory'):
+            delta.inventory.CopyFrom(current.inventory)
+
+        for section in NetworkSubscriber._SECTIONS:
+            current_section = getattr(current, section.name)
+            previous_section = getattr(previous, section.name)
+            delta_section = getattr(delta, section.name)
+            for field in section.message_type.fields:
+                value = getattr(current_section, field.name)
+                if value == getattr(previous_section, field.name):
+                    continue
+                if field.label == field.LABEL_REPEATED:
+                    getattr(delta_section, field.name).extend(value)
+                else:
+                    setattr(delta_section, field.name, value)
+                delta.changed.append(section.number << 8 | field.number)
+        return delta
@@ -0,0 +1,181 @@
+"""
+Records every Report a Node packs to disk, for post-mortems and repeatable Collector workloads (see node.net.replay).
+A recording is a directory of .spdrec segments. Each segment starts with a header, followed by length-prefixed
+serialized Reports. Every Report is full (never a delta). The first Report of each segment carries the Inventory, as
+do Reports where it changed, so each segment can be replayed on its own. The oldest segments are deleted to bound the
+recording's size.
+"""
+from node.telemetry.subscriber import Subscriber
+import proto.report_pb2 as proto_report
+import node.net.mapping as mapping
+import os
+import re
+import struct
+
+MAGIC = b'SPDR'
+HEADER = struct.Struct('<4sH')  # magic, version
+VERSION = 1
+LENGTH = struct.Struct('<I')
+SUFFIX = '.spdrec'
+_SEGMENT = re.compile(r'^(.*)-(\d{6})' + re.escape(SUFFIX) + '$')
+
+
+def segments(directory, prefix: str = None) -> list:
+    """
+    Lists a recording's segments.
+    :param directory: recording directory
+    :param prefix: segment name prefix, None for any
+    :return: list of paths, oldest first
+    """
+    found = []
+    for name in os.listdir(directory):
+        match = _SEGMENT.match(name)
+        if match and (prefix is None or match.group(1) == prefix):
+            found.append((int(match.group(2)), os.path.join(directory, name)))
+    return [path for _, path in sorted(found)]
+
+
+def read(path):
+    """
+    Reads the records of a segment. A record cut short (e.g. the Node was killed mid write) ends the segment.
+    :param path: segment path
+    :return: generator of bytes serialized Reports
+    :raises: ValueError if the file isn't a segment
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} isn't a version {VERSION} {SUFFIX} segment.")
+        while True:
+            prefix = f.read(LENGTH.size)
+            if len(prefix) < LENGTH.size:
+                return
+            length, = LENGTH.unpack(prefix)
+            record = f.read(length)
+            if len(record) < length:
+                return
+            yield record
+
+
+class Writer:
+    """
+    Appends records to rotating segments.
+    """
+
+    def __init__(self, directory, prefix: str = 'shepherd', segment_size: int = 64 * 1024 * 1024, keep: int = 8):
+        """
+        Starts a new segment after any already in the directory.
+        :param directory: recording directory, created if needed
+        :param prefix: segment name prefix
+        :param segment_size: bytes after which the next record starts a new segment
+        :param keep: most segments kept, the oldest are deleted, 0 keeps all
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_size = segment_size
+        self.keep = keep
+        existing = segments(directory, prefix)
+        self._index = int(_SEGMENT.match(os.path.basename(existing[-1])).group(2)) + 1 if existing else 0
+        self._file = None
+        self._size = 0
+        self.written = 0  # Records written
+
+    @property
+    def rotating(self) -> bool:
+        """
+        :return: bool whether the next record starts a new segment
+        """
+        return self._file is None or self._size >= self.segment_size
+
+    def write(self, record: bytes) -> None:
+        """
+        Appends a record, starting a new segment first if the current one is full.
+        Each record is flushed, so a recording survives the Node being killed.
+        :param record: bytes
+        :return: None
+        """
+        if self.rotating:
+            self._rotate()
+        self._file.write(LENGTH.pack(len(record)))
+        self._file.write(record)
+        self._file.flush()
+        self._size += LENGTH.size + len(record)
+        self.written += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        """
+        Starts the next segment, and deletes the oldest beyond keep.
+        :return: None
+        """
+        self.close()
+        path = os.path.join(self.directory, f"{self.prefix}-{self._index:06d}{SUFFIX}")
+        self._index += 1
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._size = HEADER.size
+        if self.keep > 0:
+            for old in segments(self.directory, self.prefix)[:-self.keep]:
+                os.remove(old)
+
+
+class RecordingSubscriber(Subscriber):
+    """
+    Packs each update into a full Report, as the NetworkSubscriber would, and appends it to a recording.
+    """
+
+    def __init__(self, directory, segment_size: int = 64 * 1024 * 1024, keep: int = 8):
+        """
+        :param directory: recording directory
+        :param segment_size: bytes per segment
+        :param keep: most segments kept, 0 keeps all
+        """
+        super().__init__()
+        self.writer = Writer(directory, segment_size=segment_size, keep=keep)
+        self._packer = mapping.Packer()
+        self._report = proto_report.Report()
+        self._inventory = None  # Last Inventory recorded in the current segment
+        self._sequence = 0
+
+    def subscriber_name(self) -> str:
+        """
+        Provides the subscriber name.
+        :return: str name
+        """
+        return f"record:{self.writer.directory}"
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def update(self, update: dict) -> None:
+        """
+        Records an update.
+        :param update: dict Update from Heart
+        :return: None
+        """
+        report = self._report
+        report.Clear()
+        report.pool_id = update['pool_id']
+        report.node_id = update['node_id']
+        report.time_stamp = update['time']
+        report.time_ms = update['time_ms']
+        self._sequence += 1
+        report.sequence = self._sequence
+        self._packer.pack(report, update)
+        inventory = self._packer.inventory(update)
+        if inventory != self._inventory or self.writer.rotating:
+            mapping.Packer.pack_inventory(report.inventory, inventory)
+            self._inventory = inventory
+        try:
+            self.writer.write(report.SerializeToString())
+        except OSError as e:
+            print(f"Unable to record report: {e}")
+            self._inventory = None  # The Inventory may not have been written
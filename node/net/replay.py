@@ -0,0 +1,117 @@
+"""
+Replays a recording (see node.net.record) into a Collector, as though its Node were reporting again.
+Reports are sent at the pace they were recorded, SPEED times faster, or with a SPEED of 0 as fast as the Collector takes
+them. Nothing is dropped: sending waits while the Collector is backed up.
+Usage: python -m node.net.replay [-h] [--host HOST] [--port PORT] [--speed SPEED] [--node POOL:NODE] [--retime] PATH...
+PATH is a recording directory or .spdrec segments.
+"""
+import argparse
+import os
+import time
+
+import zmq
+
+import proto.report_pb2 as proto_report
+import proto.frame as frame
+import node.constants as const
+import node.net.record as record
+
+COLLECTOR_PORT = 3031
+
+
+def reports(paths):
+    """
+    Reads the Reports of recordings and segments, in order.
+    :param paths: recording directories (every segment, oldest first) or segment paths
+    :return: generator of Reports
+    """
+    for path in paths:
+        for segment in record.segments(path) if os.path.isdir(path) else [path]:
+            for message in record.read(segment):
+                report = proto_report.Report()
+                report.ParseFromString(message)
+                yield report
+
+
+def _time_ms(report) -> int:
+    """
+    :param report: Report
+    :return: int milliseconds since the epoch the Report was measured
+    """
+    return report.time_ms or report.time_stamp * 1000
+
+
+def replay(paths, socket, speed: float = 1.0, ids: tuple = None, retime: bool = False) -> tuple:
+    """
+    Sends recorded Reports.
+    :param paths: recording directories or segment paths
+    :param socket: connected zmq socket the Collector subscribes to
+    :param speed: times faster than recorded, 0 for as fast as possible
+    :param ids: (pool_id, node_id) to report as, None for the recorded ids
+    :param retime: shift timestamps so the first Report is measured now
+    :return: (Reports sent, seconds taken)
+    """
+    sent = 0
+    started = time.monotonic()
+    first = None  # time_ms of the first Report
+    offset = 0  # Milliseconds added to each Report's time
+    for report in reports(paths):
+        recorded = _time_ms(report)
+        if first is None:
+            first = recorded
+            offset = time.time_ns() // 1000000 - recorded if retime else 0
+        if speed > 0:
+            delay = (recorded - first) / 1000 / speed - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+        if ids is not None:
+            report.pool_id, report.node_id = ids
+        if offset:
+            report.time_ms = recorded + offset
+            report.time_stamp = report.time_ms // 1000
+            if report.HasField('aggregate'):
+                report.aggregate.start_ms += offset
+        socket.send_multipart([frame.REPORT, report.SerializeToString()])
+        sent += 1
+    return sent, time.monotonic() - started
+
+
+def connect(host: str, port: int, timeout: float = 10):
+    """
+    Connects to a Collector and waits for its subscription, so the first Reports aren't lost.
+    :param host: Collector host
+    :param port: Collector port
+    :param timeout: seconds to wait for the Collector
+    :return: zmq XPUB socket
+    :raises: TimeoutError if the Collector doesn't subscribe in time
+    """
+    socket = zmq.Context.instance().socket(zmq.XPUB)
+    socket.setsockopt(zmq.XPUB_NODROP, 1)  # Block rather than drop when the Collector falls behind
+    socket.setsockopt(zmq.LINGER, -1)  # Deliver everything before exiting
+    socket.connect(f"tcp://{host}:{port}")
+    if not socket.poll(timeout * 1000):
+        socket.close(0)
+        raise TimeoutError(f"No Collector subscribed at {host}:{port} within {timeout}s.")
+    socket.recv()
+    return socket
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays recorded Reports into a Collector.")
+    parser.add_argument('paths', nargs='+', metavar='PATH', help="recording directory or .spdrec segment")
+    parser.add_argument('--host', default=const.SERVER_IP, help="Collector host")
+    parser.add_argument('--port', default=COLLECTOR_PORT, type=int, help="Collector port")
+    parser.add_argument('--speed', default=1.0, type=float, help="times faster than recorded, 0 for as fast as possible")
+    parser.add_argument('--node', metavar='POOL:NODE', help="report as this pool and node instead of the recorded ones")
+    parser.add_argument('--retime', action='store_true', help="shift timestamps so the recording starts now")
+    args = parser.parse_args()
+    ids = tuple(int(part) for part in args.node.split(':')) if args.node else None
+
+    socket = connect(args.host, args.port)
+    sent, seconds = replay(args.paths, socket, args.speed, ids, args.retime)
+    print(f"Replayed {sent} reports in {seconds:.1f}s ({sent / seconds if seconds else 0:.0f}/s).")
+    socket.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+A bounded, memory-mapped ring file of messages, kept while the Collector can't be reached.
+Messages are appended at the tail and read from the head. When the file is full the oldest are dropped.
+The header is written after the record it covers, so the spool survives the Node being killed and restarted.
+"""
+import mmap
+import os
+import struct
+
+
+class Spool:
+    """
+    Ring of length-prefixed records in a memory-mapped file.
+    """
+
+    MAGIC = b'SPDS'
+    HEADER = struct.Struct('<4sQQQQ')  # magic, capacity, head, tail, count
+    LENGTH = struct.Struct('<I')
+    WRAP = 0xFFFFFFFF  # Length marking the rest of the ring as unused, the next record is at the start
+
+    def __init__(self, path, capacity: int):
+        """
+        Opens the spool file, keeping its records if it was created with the same capacity.
+        :param path: file path
+        :param capacity: bytes for records, excluding the header
+        """
+        self.path = path
+        self.capacity = capacity
+        size = Spool.HEADER.size + capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            existing = os.fstat(fd).st_size == size
+            if not existing:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self.head = 0  # Offset of the oldest record
+        self.tail = 0  # Offset the next record is written at
+        self.count = 0
+        if existing:
+            magic, stored_capacity, head, tail, count = Spool.HEADER.unpack_from(self._map, 0)
+            if magic == Spool.MAGIC and stored_capacity == capacity:
+                self.head, self.tail, self.count = head, tail, count
+        self.dropped = 0  # Records dropped to make room since opening
+        self._write_header()
+
+    def __len__(self):
+        return self.count
+
+    def push(self, record: bytes) -> None:
+        """
+        Appends a record, dropping the oldest records if there isn't room.
+        :param record: bytes
+        :return: None
+        :raises: ValueError if the record is larger than the spool
+        """
+        size = Spool.LENGTH.size + len(record)
+        if size > self.capacity:
+            raise ValueError(f"Record of {len(record)} bytes doesn't fit in a {self.capacity} byte spool.")
+        while True:
+            if self.count == 0:
+                self.head = self.tail = 0
+            if self.tail > self.head or self.count == 0:  # Free space is after the tail, then before the head
+                if self.capacity - self.tail >= size:
+                    break
+                if self.head >= size:
+                    if self.capacity - self.tail >= Spool.LENGTH.size:
+                        Spool.LENGTH.pack_into(self._map, Spool.HEADER.size + self.tail, Spool.WRAP)
+                    self.tail = 0
+                    continue
+            elif self.head - self.tail >= size:  # Free space is between the tail and the head
+                break
+            self._drop()
+
+        offset = Spool.HEADER.size + self.tail
+        Spool.LENGTH.pack_into(self._map, offset, len(record))
+        self._map[offset + Spool.LENGTH.size:offset + size] = record
+        self.tail += size
+        self.count += 1
+        self._write_header()
+
+    def peek(self, count: int = 1) -> list:
+        """
+        Reads the oldest records without removing them.
+        :param count: most records to read
+        :return: list of bytes, oldest first
+        """
+        records = []
+        head = self.head
+        for _ in range(min(count, self.count)):
+            head = self._unwrap(head)
+            offset = Spool.HEADER.size + head + Spool.LENGTH.size
+            length, = Spool.LENGTH.unpack_from(self._map, offset - Spool.LENGTH.size)
+            records.append(bytes(self._map[offset:offset + length]))
+            head += Spool.LENGTH.size + length
+        return records
+
+    def pop(self, count: int = 1) -> None:
+        """
+        Removes the oldest records, once they have been sent.
+        :param count: records to remove
+        :return: None
+        """
+        for _ in range(min(count, self.count)):
+            self._remove()
+        self._write_header()
+
+    def flush(self) -> None:
+        """
+        Writes the records to disk.
+        :return: None
+        """
+        self._map.flush()
+
+    def close(self) -> None:
+        self._map.flush()
+        self._map.close()
+
+    def _drop(self) -> None:
+        self._remove()
+        self.dropped += 1
+
+    def _remove(self) -> None:
+        self.head = self._unwrap(self.head)
+        length, = Spool.LENGTH.unpack_from(self._map, Spool.HEADER.size + self.head)
+        self.head += Spool.LENGTH.size + length
+        self.count -= 1
+        if self.count == 0:
+            self.head = self.tail = 0
+
+    def _unwrap(self, offset: int) -> int:
+        """
+        Moves a read offset to the start of the ring if the rest of the ring is unused.
+        :param offset: offset of a record
+        :return: int offset of the record
+        """
+        if self.capacity - offset < Spool.LENGTH.size or \
+                Spool.LENGTH.unpack_from(self._map, Spool.HEADER.size + offset)[0] == Spool.WRAP:
+            return 0
+        return offset
+
+    def _write_header(self) -> None:
+        Spool.HEADER.pack_into(self._map, 0, Spool.MAGIC, self.capacity, self.head, self.tail, self.count)
@@ -0,0 +1,120 @@
+"""
+Evaluates the server's anomaly thresholds on the Node, so a crossing is alerted the beat it's measured.
+The Broker sends the thresholds in its Negotiation response. Breaches are described exactly as
+server.detect.anomaly_service records them, so the detector recognizes an alerted anomaly as already outstanding.
+"""
+from proto.alert_pb2 import Alert
+
+
+class Thresholds:
+    """
+    Finds the anomaly thresholds an update breaches.
+    """
+
+    def __init__(self, limits):
+        """
+        :param limits: Negotiation.Thresholds from the Broker
+        """
+        self.limits = limits
+
+    def breaches(self, update: dict) -> dict:
+        """
+        Evaluates every threshold against an update.
+        :param update: dict Update from Heart
+        :return: dict of name -> (type, message, severity, value, threshold), names are unique per threshold and device
+        """
+        limits = self.limits
+        found = {}
+        cpu = update.get('cpu')
+        if cpu:
+            if cpu['load_5'] >= limits.cpu_load_5:
+                found['cpu5'] = ('cpu', '5 minute CPU load over threshold.', 'medium', cpu['load_5'],
+                                 limits.cpu_load_5)
+            if cpu['load_15'] >= limits.cpu_load_15:
+                found['cpu15'] = ('cpu', '15 minute CPU load over threshold.', 'medium', cpu['load_15'],
+                                  limits.cpu_load_15)
+        ram = update.get('ram')
+        if ram:
+            if ram['virt_total'] and ram['virt_used'] / ram['virt_total'] * 100 >= limits.ram_virt_percent:
+                found['ram_virt'] = ('ram', 'Virtual RAM usage over threshold.', 'medium',
+                                     ram['virt_used'] / ram['virt_total'] * 100, limits.ram_virt_percent)
+            if ram['swap_percent'] >= limits.ram_swap_percent:
+                found['ram_swap'] = ('ram', 'Swap RAM usage over threshold.', 'medium', ram['swap_percent'],
+                                     limits.ram_swap_percent)
+        battery = update.get('battery')
+        if battery and battery['percent'] is not None and 0 < battery['percent'] <= limits.battery_avail:
+            found['battery_avail'] = ('battery', 'Available Battery below threshold.', 'high', battery['percent'],
+                                      limits.battery_avail)
+        session = update.get('session')
+        if session and session['uptime'] >= limits.session_uptime:
+            found['uptime'] = ('session', 'Node uptime exceeds threshold. Consider reboot.', 'low', session['uptime'],
+                               limits.session_uptime)
+        disk = update.get('disk')
+        if disk:
+            for part in disk['partitions'].values():
+                if part['percent'] >= limits.disk_percent_used:
+                    found[f"disk_percent_{part['device']}"] = (
+                            'disk', f"Disk {part['device']} usage exceeds threshold.", 'high', part['percent'],
+                            limits.disk_percent_used)
+            for device in disk.get('devices', {}).values():
+                # Zero (unset by older Brokers) disables these
+                if limits.disk_io_utilization and device['utilization'] >= limits.disk_io_utilization:
+                    value, threshold = device['utilization'], limits.disk_io_utilization
+                elif limits.disk_io_await and device['await'] >= limits.disk_io_await:
+                    value, threshold = device['await'], limits.disk_io_await
+                else:
+                    continue
+                found[f"disk_io_{device['device']}"] = ('disk', f"Disk {device['device']} I/O saturated.", 'medium',
+                                                        value, threshold)
+        pressure = update.get('pressure')
+        if pressure:
+            # Zero (unset by older Brokers) disables these
+            for resource, kind, limit, name, message in (
+                    ('cpu', 'some_avg60', limits.pressure_cpu, 'cpu', 'CPU pressure over threshold.'),
+                    ('memory', 'full_avg60', limits.pressure_memory, 'ram', 'Memory pressure over threshold.'),
+                    ('io', 'full_avg60', limits.pressure_io, 'disk', 'I/O pressure over threshold.')):
+                if limit and pressure[resource][kind] >= limit:
+                    found[f'pressure_{resource}'] = (name, message, 'medium', pressure[resource][kind], limit)
+            for cgroup in pressure['cgroups'].values():
+                if limits.cgroup_throttled and cgroup['throttled_percent'] >= limits.cgroup_throttled:
+                    found[f"cgroup_throttled_{cgroup['path']}"] = (
+                            'cpu', f"cgroup {cgroup['path']} CPU throttled over threshold.", 'medium',
+                            cgroup['throttled_percent'], limits.cgroup_throttled)
+                if limits.cgroup_memory_percent and cgroup['memory_max'] and \
+                        cgroup['memory_current'] / cgroup['memory_max'] * 100 >= limits.cgroup_memory_percent:
+                    found[f"cgroup_memory_{cgroup['path']}"] = (
+                            'ram', f"cgroup {cgroup['path']} memory usage near its limit.", 'high',
+                            cgroup['memory_current'] / cgroup['memory_max'] * 100, limits.cgroup_memory_percent)
+        gpus = update.get('gpu')
+        if gpus:
+            for gpu in gpus.values():
+                if gpu['mem_percent'] * 100 >= limits.gpu_memory_percent:
+                    found[f"gpu_mem_{gpu['uuid']}"] = (
+                            'gpu', f"GPU {gpu['uuid']} memory usage exceeds threshold.", 'medium',
+                            gpu['mem_percent'] * 100, limits.gpu_memory_percent)
+                if gpu['load'] * 100 >= limits.gpu_load:
+                    found[f"gpu_load_{gpu['uuid']}"] = (
+                            'gpu', f"GPU {gpu['uuid']} load exceeds threshold.", 'medium', gpu['load'] * 100,
+                            limits.gpu_load)
+        return found
+
+    @staticmethod
+    def alert(update: dict, breaches: dict):
+        """
+        Packs breaches into an Alert.
+        :param update: dict Update from Heart which breached them
+        :param breaches: dict from breaches()
+        :return: Alert
+        """
+        alert = Alert()
+        alert.pool_id = update['pool_id']
+        alert.node_id = update['node_id']
+        alert.time_ms = update['time_ms']
+        for kind, message, severity, value, threshold in breaches.values():
+            breach = alert.breaches.add()
+            breach.type = kind
+            breach.message = message
+            breach.severity = severity
+            breach.value = value
+            breach.threshold = threshold
+        return alert
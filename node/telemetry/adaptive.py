@@ -0,0 +1,76 @@
+"""
+Adaptive heart rate.
+Slows the Heart down while CPU and RAM usage are flat, and bursts to the maximum rate when they move quickly or cross
+a threshold. Between the calm and active levels the rate holds, so it doesn't flap.
+"""
+import collections
+
+
+class AdaptiveRate:
+    """
+    Chooses the next heart rate from recent CPU and RAM usage.
+    """
+
+    def __init__(self, min_rate: float, max_rate: float, calm_delta: float = 1.0, active_delta: float = 5.0,
+                 window: int = 10, hold: float = 30, cpu_percent: float = 90, ram_percent: float = 90):
+        """
+        :param min_rate: slowest rate, Hz
+        :param max_rate: burst rate, Hz
+        :param calm_delta: percentage points; if no signal moved more than this over a window, the rate halves
+        :param active_delta: percentage points; if a signal moved more than this within the window, burst
+        :param window: beats of history compared
+        :param hold: seconds to stay at max_rate after a burst
+        :param cpu_percent: CPU usage which bursts the rate while at or above it
+        :param ram_percent: RAM usage which bursts the rate while at or above it
+        """
+        assert 0 < min_rate <= max_rate, "Adaptive rate bounds must satisfy 0 < min_rate <= max_rate."
+        assert calm_delta <= active_delta, "Adaptive calm_delta must not exceed active_delta."
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.calm_delta = calm_delta
+        self.active_delta = active_delta
+        self.hold = hold
+        self.cpu_percent = cpu_percent
+        self.ram_percent = ram_percent
+        self.rate = max_rate  # Start fast, until the Node is known to be calm
+        self._history = collections.deque(maxlen=window)  # (cpu percent, ram percent)
+        self._burst_until = 0.0
+        self.bursts = 0  # Times the rate burst to max_rate
+
+    def update(self, data, now: float) -> float:
+        """
+        Takes the latest measurements into account, and picks the rate until the next beat.
+        :param data: Heart data, with 'cpu' and 'ram' Metric dicts if they're registered
+        :param now: time.monotonic()
+        :return: float Hz
+        """
+        signals = AdaptiveRate._signals(data)
+        if signals is None:
+            return self.rate
+        self._history.append(signals)
+
+        cpu, ram = signals
+        change = max(max(values) - min(values) for values in zip(*self._history))
+        if cpu >= self.cpu_percent or ram >= self.ram_percent or change >= self.active_delta:
+            if self.rate < self.max_rate:
+                self.bursts += 1
+            self.rate = self.max_rate
+            self._burst_until = now + self.hold
+        elif now >= self._burst_until and change <= self.calm_delta \
+                and len(self._history) == self._history.maxlen:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._history.clear()  # Slow down one step per calm window
+        return self.rate
+
+    @staticmethod
+    def _signals(data):
+        """
+        Reads the signals the rate adapts to.
+        :param data: Heart data
+        :return: (cpu percent, ram percent), or None if they haven't been measured
+        """
+        cpu = data.get('cpu')
+        ram = data.get('ram')
+        if not cpu or not ram or not ram.get('virt_total'):
+            return None
+        return cpu['percent'], ram['virt_used'] / ram['virt_total'] * 100
@@ -0,0 +1,176 @@
+"""
+Windowed pre-aggregation of Heart updates.
+The Heart can sample quickly while a wrapped Subscriber (e.g. the NetworkSubscriber) only receives one update per
+window, which carries the count, min, max, mean and last value of each gauge field measured in the window.
+Short spikes between the updates sent still show up in the window's max.
+"""
+from types import MappingProxyType
+
+from node.telemetry.subscriber import Subscriber
+from node.telemetry.dispatch import freeze
+
+EACH = '*'  # Applies a spec to every entry of a dict keyed by device, interface, ...
+
+# Gauge fields aggregated, by Metric name. A tuple names numeric fields of a dict, a dict names nested dicts.
+# Identities (PIDs, core counts, boot time), cumulative counters and per process fields are left out, since each path
+# is a row per window. Metrics not listed (e.g. process, session, or from a plugin) aren't aggregated.
+GAUGES = {
+        'cpu': ('percent', 'load_1'),
+        'ram': ('virt_used', 'virt_available', 'swap_percent'),
+        'disk': {
+                'partitions': {EACH: ('percent',)},
+                'devices': {EACH: ('read_iops', 'write_iops', 'read_bytes', 'write_bytes', 'await', 'utilization')},
+        },
+        'battery': ('percent',),
+        'gpu': {EACH: ('load', 'mem_percent', 'mem_used')},
+        'network': {'interfaces': {EACH: ('rx_bytes', 'tx_bytes', 'rx_drops', 'tx_drops')}},
+        'pressure': {
+                'cpu': ('some_avg10',),
+                'memory': ('some_avg10', 'full_avg10'),
+                'io': ('some_avg10', 'full_avg10'),
+                'cgroups': {EACH: ('cpu_percent', 'throttled_percent', 'memory_current')},
+        },
+}
+
+
+class Aggregate:
+    """
+    Running count, min, max, sum and last value of each gauge field, in constant memory per field.
+    """
+
+    def __init__(self, gauges: dict = None):
+        """
+        :param gauges: fields aggregated by Metric name, defaults to GAUGES
+        """
+        self.gauges = gauges if gauges is not None else GAUGES
+        self.count = 0  # Updates added
+        self.start_ms = 0  # time_ms of the first update added
+        self.fields = {}  # str path -> [count, min, max, sum, last]
+
+    def add(self, update) -> None:
+        """
+        Adds the gauge fields of the Metrics measured for an update. Metrics which weren't due, or failed, kept their
+        last measurement, which isn't added again.
+        :param update: Heart update
+        :return: None
+        """
+        if not self.count:
+            self.start_ms = update['time_ms']
+        self.count += 1
+        for name in update.get('measured', ()):
+            spec = self.gauges.get(name)
+            data = update.get(name)
+            if spec is not None and data:
+                self._add(name, spec, data)
+
+    def _add(self, path: str, spec, data) -> None:
+        """
+        Adds the fields a spec names, recursing into nested specs. Entries are named by key.
+        :param path: str dotted path of data
+        :param spec: tuple of field names, or dict of key (or EACH) -> spec
+        :param data: measurement dict
+        :return: None
+        """
+        if isinstance(spec, tuple):
+            for key in spec:
+                self._value(f"{path}.{key}", data.get(key))
+        elif EACH in spec:
+            for key, item in data.items():
+                self._add(f"{path}.{key}", spec[EACH], item)
+        else:
+            for key, nested in spec.items():
+                if data.get(key):
+                    self._add(f"{path}.{key}", nested, data[key])
+
+    def _value(self, path: str, value) -> None:
+        """
+        Adds one value to its field.
+        :param path: str dotted path of the value
+        :param value: measurement, skipped unless a number
+        :return: None
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        field = self.fields.get(path)
+        if field is None:
+            self.fields[path] = [1, value, value, value, value]
+        else:
+            field[0] += 1
+            if value < field[1]:
+                field[1] = value
+            if value > field[2]:
+                field[2] = value
+            field[3] += value
+            field[4] = value
+
+    def summary(self) -> dict:
+        """
+        Summarizes the window.
+        :return: dict of count (updates), start_ms, and fields, each path -> dict of count, min, max, mean, last
+        """
+        return {
+                'count': self.count,
+                'start_ms': self.start_ms,
+                'fields': {path: {'count': count, 'min': minimum, 'max': maximum, 'mean': total / count, 'last': last}
+                           for path, (count, minimum, maximum, total, last) in self.fields.items()},
+        }
+
+
+class AggregatingSubscriber(Subscriber):
+    """
+    Passes one update per window on to another Subscriber.
+    The update passed on is the last one of the window, with the window's Aggregate summary under 'aggregate'.
+    """
+
+    def __init__(self, subscriber: Subscriber, window: float):
+        """
+        :param subscriber: telemetry.Subscriber which receives the aggregated updates
+        :param window: seconds each aggregate covers
+        """
+        super().__init__()
+        assert window > 0, "Aggregation window must be positive."
+        self.subscriber = subscriber
+        self.window_ms = window * 1000
+        self._aggregate = Aggregate()
+        self._last = None  # Last update added to the window
+
+    def subscriber_name(self) -> str:
+        """
+        Provides the subscriber name.
+        :return: str name
+        """
+        return f"aggregate:{self.subscriber.subscriber_name()}"
+
+    def stats(self) -> dict:
+        return self.subscriber.stats()
+
+    def close(self) -> None:
+        """
+        Passes on the last, partial window, so it isn't lost on shutdown.
+        :return: None
+        """
+        self.flush()
+        self.subscriber.close()
+
+    def update(self, update: dict) -> None:
+        """
+        Adds an update to the window. Once an update falls past the window, the window is passed on and a new one starts.
+        :param update: dict Update from Heart
+        :return: None
+        """
+        if self._aggregate.count and update['time_ms'] - self._aggregate.start_ms >= self.window_ms:
+            self.flush()
+        self._aggregate.add(update)
+        self._last = update
+
+    def flush(self) -> None:
+        """
+        Passes the window so far on to the Subscriber, and starts a new one.
+        :return: None
+        """
+        if not self._aggregate.count:
+            return
+        aggregated = MappingProxyType({**self._last, 'aggregate': freeze(self._aggregate.summary())})
+        self._aggregate = Aggregate()
+        self._last = None
+        self.subscriber.update(aggregated)
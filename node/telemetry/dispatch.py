@@ -0,0 +1,147 @@
+"""
+Decouples Subscribers from the Heart.
+Each Subscriber is fed by a Channel, a bounded queue with its own delivery thread, so a slow Subscriber can't delay
+the next beat. Subscribers receive immutable snapshots, which later beats can't change underneath them.
+"""
+import collections
+import threading
+import time
+from types import MappingProxyType
+
+DROP_OLDEST = 'drop-oldest'  # Make room by discarding the oldest queued update
+DROP_NEWEST = 'drop-newest'  # Discard the new update
+BLOCK = 'block'  # Wait for room, holding up the Heart
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+def freeze(value):
+    """
+    Copies a measurement into an immutable form, dicts become read only mappings and lists become tuples.
+    :param value: dict, list or scalar
+    :return: frozen copy
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """
+    Copies a frozen update back into plain dicts and lists, e.g. for printing.
+    :param value: frozen mapping, tuple or scalar
+    :return: thawed copy
+    """
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class Channel:
+    """
+    Delivers updates to one Subscriber on its own thread, through a bounded queue.
+    """
+
+    def __init__(self, subscriber, size: int, policy: str):
+        """
+        Starts the delivery thread.
+        :param subscriber: telemetry.Subscriber implementation
+        :param size: most updates queued
+        :param policy: what to do when the queue is full, one of POLICIES
+        """
+        assert size > 0, "Subscriber queue size must be positive."
+        assert policy in POLICIES, f"Unknown overflow policy {policy}, expected one of {POLICIES}."
+        self.subscriber = subscriber
+        self.size = size
+        self.policy = policy
+        self._queue = collections.deque()  # (time.monotonic() queued, update)
+        self._condition = threading.Condition()
+        self._open = True
+
+        # Lag counters
+        self.delivered = 0  # Updates passed to the Subscriber
+        self.dropped = 0  # Updates discarded because the queue was full
+        self.max_queued = 0  # Deepest the queue has been
+        self.latency = 0.0  # Seconds the last delivered update waited in the queue
+        self.max_latency = 0.0
+
+        self._thread = threading.Thread(target=self._deliver, name=f"subscriber:{subscriber.subscriber_name()}",
+                                        daemon=True)
+        self._thread.start()
+
+    def put(self, update) -> bool:
+        """
+        Queues an update for the Subscriber, applying the overflow policy if the queue is full.
+        :param update: immutable update
+        :return: bool whether the update was queued
+        """
+        with self._condition:
+            if len(self._queue) >= self.size:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.size and self._open:
+                        self._condition.wait()
+            if not self._open:
+                return False
+            self._queue.append((time.monotonic(), update))
+            self.max_queued = max(self.max_queued, len(self._queue))
+            self._condition.notify_all()
+            return True
+
+    def stats(self) -> dict:
+        """
+        Lag counters for the Subscriber.
+        :return: dict
+        """
+        with self._condition:
+            return {
+                    'queued': len(self._queue),
+                    'max_queued': self.max_queued,
+                    'delivered': self.delivered,
+                    'dropped': self.dropped,
+                    'latency': self.latency,
+                    'max_latency': self.max_latency,
+            }
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Stops accepting updates, and waits for the queued updates to be delivered and the Subscriber to be closed.
+        :param timeout: most seconds to wait, None waits indefinitely
+        :return: None
+        """
+        with self._condition:
+            self._open = False
+            self._condition.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _deliver(self):
+        while True:
+            with self._condition:
+                while not self._queue and self._open:
+                    self._condition.wait()
+                if not self._queue:
+                    break
+                queued, update = self._queue.popleft()
+                self._condition.notify_all()
+            latency = time.monotonic() - queued
+            try:
+                self.subscriber.update(update)
+            except Exception as e:
+                print(f"Exception while updating {self.subscriber.subscriber_name()} subscriber: {e}")
+            with self._condition:
+                self.delivered += 1
+                self.latency = latency
+                self.max_latency = max(self.max_latency, latency)
+        try:
+            self.subscriber.close()
+        except Exception as e:
+            print(f"Exception while closing {self.subscriber.subscriber_name()} subscriber: {e}")
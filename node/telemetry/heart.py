@@ -3,10 +3,21 @@ The "heart" of the Node module.
 Each "beat" will update selected metrics.
 Subscribers can be notified (on "Pulse") when the data has been updated.
 """
+import concurrent.futures
+import heapq
+import itertools
 import threading
 import time
+from types import MappingProxyType
+import psutil
 from node.telemetry.metric import Metric
 from node.telemetry.subscriber import Subscriber
+from node.telemetry import dispatch
+from node.telemetry import histogram
+from node.telemetry.adaptive import AdaptiveRate
+
+MIN_RATE = 0.1  # Hz
+MAX_RATE = 10  # Hz, SW Req. 2.1 allowed 2 Hz while CPU measurement slept for 100ms
 
 
 class Heart:
@@ -14,24 +25,63 @@ class Heart:
     Made with <3 at WIT
     """
 
-    def __init__(self, pool_id: int, node_id: int, rate: float = 1):
+    def __init__(self, pool_id: int, node_id: int, rate: float = 1, workers: int = 0, timeout: float = 0,
+                 queue_size: int = 16, policy: str = dispatch.DROP_OLDEST, histogram_window: int = 60,
+                 adaptive: AdaptiveRate = None):
+        """
+        Starts beating immediately.
+        :param pool_id: Pool ID to report with
+        :param node_id: Node ID to report with
+        :param rate: Hz to measure and pulse at
+        :param workers: threads to measure Metrics concurrently on, 0 measures serially
+        :param timeout: default seconds a concurrent measurement may take, 0 allows one beat
+        :param queue_size: default most updates queued for each Subscriber
+        :param policy: default overflow policy for Subscriber queues, see telemetry.dispatch
+        :param histogram_window: number of recent beats the latency and jitter histograms cover
+        :param adaptive: AdaptiveRate which varies the rate with CPU/RAM volatility, None keeps the rate fixed
+        """
         self.pool_id = pool_id
         self.node_id = node_id
         self.rate = rate  # Hz  (Cycles per Second)
-        assert 0.1 <= self.rate <= 2  # SW Req. 2.1
+        assert MIN_RATE <= self.rate <= MAX_RATE  # SW Req. 2.1
+        self.timeout = timeout if timeout > 0 else 1 / self.rate
+        self.adaptive = adaptive
+        if self.adaptive is not None:
+            assert MIN_RATE <= self.adaptive.min_rate and self.adaptive.max_rate <= MAX_RATE  # SW Req. 2.1
+            self.rate = self.adaptive.rate
 
         self._metrics = []  # List of Metrics (Interface)
+        self._schedule = []  # Heap of [deadline, order, Metric, interval]
+        self._order = itertools.count()  # Breaks deadline ties in registration order
+        self._timeouts = {}  # Metric -> seconds a concurrent measurement may take
+        self._pending = {}  # Metric -> Future of a concurrent measurement still in flight
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metric") \
+            if workers > 0 else None
         self._subscribers = []  # List of Subscribers (Interface)
+        self._channels = []  # dispatch.Channel for each Subscriber
+        self.queue_size = queue_size
+        self.policy = policy
         self._alive = True
         self._data = {
                 'node_id': self.node_id,
                 'pool_id': self.pool_id,
-                'time': 0
+                'time': 0,
+                'time_ms': 0,
         }
         self._impulse = threading.Thread(target=self._beat)
         self._impulse_lock = threading.Lock()
         self._impulse_death_ack = False
         self._impulse_irregular = False
+        self._latency = histogram.RollingHistogram(histogram_window)  # ms each beat took
+        self._jitter = histogram.RollingHistogram(histogram_window)  # ms each beat started after its deadline
+        self._skipped = 0  # Beat slots skipped because the previous beat overran
+
+        # Agent self-telemetry, what the Node module itself costs
+        self._process = psutil.Process()
+        self._cpu_time = time.process_time()  # Process CPU seconds at the last beat
+        self._cpu_sampled = time.monotonic()
+        self._metric_latency = {}  # Metric name -> ms its last measure() took, written from the executor's threads
+        self._metric_latency_lock = threading.Lock()
 
         # It's alive!
         self._impulse.start()
@@ -39,42 +89,213 @@ class Heart:
     def _beat(self):
         """
         Heartbeat! Update all metrics.
+        Beats are scheduled on absolute monotonic deadlines, one period apart, so lateness doesn't accumulate.
+        A beat which overruns skips the slots it missed rather than bunching up beats to catch up.
+        With an AdaptiveRate, the period until the next beat follows the rate it picks from this beat's measurements.
         :return:
         """
+        deadline = time.monotonic()
         while self._alive:
-            # Start timing the beat
-            beat_start = time.perf_counter()
+            # Start timing the beat, jitter is how late it woke for its slot
+            beat_start = time.monotonic()
+            self._jitter.add((beat_start - deadline) * 1000)
+            time_ms = time.time_ns() // 1000000
 
-            # Get all the updated info
+            # Get all the updated info, metrics which aren't due keep their last measurement
             with self._impulse_lock:
-                for metric in self._metrics:
-                    self._data[metric.metric_name()].update(metric.measure())
-                self._data['time'] = int(time.time())
+                due = self._due(beat_start)
+            if self._executor is None:
+                measurements, stale = self._measure_serial(due)
+            else:
+                measurements, stale = self._measure_concurrent(due)
 
-                self._pulse()
+            measurements = [(name, dispatch.freeze(measurement)) for name, measurement in measurements]
+            with self._impulse_lock:
+                for name, measurement in measurements:
+                    self._data[name] = measurement
+                self._data['stale'] = tuple(stale)
+                self._data['measured'] = tuple(name for name, _ in measurements)  # Rest are last beats' values
+                self._data['time'] = time_ms // 1000
+                self._data['time_ms'] = time_ms
+                self._data['beat'] = dispatch.freeze({
+                        'latency': self._latency.summary(),
+                        'jitter': self._jitter.summary(),
+                        'skipped': self._skipped,
+                        'rate': self.rate,
+                })
+                self._data['agent'] = dispatch.freeze(self._agent(beat_start))
+                snapshot = MappingProxyType(dict(self._data))
+                channels = list(self._channels)
+                if self.adaptive is not None:
+                    self.rate = self.adaptive.update(self._data, beat_start)
+
+            self._pulse(snapshot, channels)
 
-            # Stop timing and calculate the remaining time until the next beat (if any)
-            beat_end = time.perf_counter()
-            elapsed = beat_end - beat_start
-            # print(elapsed)
-            if elapsed < (1/self.rate):
+            # Stop timing, and wait for the next slot
+            elapsed = time.monotonic() - beat_start
+            self._latency.add(elapsed * 1000)
+            period = 1 / self.rate
+            deadline += period
+            now = time.monotonic()
+            if now < deadline:
                 self._impulse_irregular = False
-                time.sleep((1/self.rate) - elapsed)
             else:
-                print(f"Warning: Metric measurement ({elapsed: .4f}s) exceeds requested heart rate of {self.rate} Hz!")
+                missed = int((now - deadline) / period) + 1
+                self._skipped += missed
+                deadline += missed * period
+                print(f"Warning: Metric measurement ({elapsed: .4f}s) exceeds requested heart rate of {self.rate} Hz! "
+                      f"Skipping {missed} beat(s).")
                 self._impulse_irregular = True
+            time.sleep(deadline - now)
 
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._impulse_lock:
+            metrics = list(self._metrics)
+            channels = list(self._channels)
+        for metric in metrics:
+            try:
+                metric.close()
+            except Exception as e:
+                print(f"Warning: Unable to close {metric.metric_name()}: {e!r}")
+        for channel in channels:
+            channel.close(max(1 / self.rate, 1))  # Time to pass on anything held back, e.g. a partial aggregate
         self._impulse_death_ack = True
         print(f"{self} stopped.")
 
-    def _pulse(self):
+    def _agent(self, now: float) -> dict:
+        """
+        Measures the Node module itself. Must be called with the _impulse_lock held.
+        :param now: time.monotonic() of the current beat
+        :return: dict of cpu_time (seconds), cpu_percent (of one core, since the last beat), rss (bytes), irregular
+                 (whether the last beat overran), skipped (beats), metrics (name -> last measure() latency) and
+                 subscribers (name -> queue and send counters)
+        """
+        cpu_time = time.process_time()
+        cpu_percent = (cpu_time - self._cpu_time) / (now - self._cpu_sampled) * 100 if now > self._cpu_sampled else 0.0
+        self._cpu_time = cpu_time
+        self._cpu_sampled = now
+        with self._metric_latency_lock:
+            metric_latency = dict(self._metric_latency)
+        subscribers = {}
+        for channel in self._channels:
+            name = channel.subscriber.subscriber_name()
+            stats = channel.stats()
+            subscribers[name] = {
+                    'name': name,
+                    'queued': stats['queued'],
+                    'dropped': stats['dropped'],
+                    'unsent': channel.subscriber.stats().get('unsent', 0),
+            }
+        return {
+                'cpu_time': cpu_time,
+                'cpu_percent': cpu_percent,
+                'rss': self._process.memory_info().rss,
+                'irregular': self._impulse_irregular,
+                'skipped': self._skipped,
+                'metrics': {name: {'name': name, 'latency': latency} for name, latency in metric_latency.items()},
+                'subscribers': subscribers,
+        }
+
+    def _timed(self, metric: Metric) -> dict:
+        """
+        Measures a Metric, recording how long it took, even if it failed.
+        :param metric: Metric
+        :return: dict measurement
+        """
+        start = time.monotonic()
+        try:
+            return metric.measure()
+        finally:
+            latency = (time.monotonic() - start) * 1000
+            with self._metric_latency_lock:
+                self._metric_latency[metric.metric_name()] = latency
+
+    def _measure_serial(self, due: list):
+        """
+        Measures each Metric in turn.
+        :param due: list of Metrics to measure
+        :return: list of (name, measurement), list of names that failed to measure
+        """
+        measurements = []
+        stale = []
+        for metric in due:
+            try:
+                measurements.append((metric.metric_name(), self._timed(metric)))
+            except Exception as e:  # ValueError by convention, but a plugin's Metric may raise anything
+                print(f"Warning: {metric.metric_name()} measurement failed: {e!r}")
+                stale.append(metric.metric_name())
+        return measurements, stale
+
+    def _measure_concurrent(self, due: list):
+        """
+        Measures every Metric at once on the executor, waiting at most each Metric's timeout.
+        A Metric that is still running from an earlier beat is not started again,
+        one that finished after its timeout contributes that late measurement.
+        :param due: list of Metrics to measure
+        :return: list of (name, measurement), list of names that failed or timed out
+        """
+        measurements = []
+        stale = []
+        started = []
+        start = time.monotonic()
+        for metric in due:
+            future = self._pending.pop(metric, None)
+            if future is not None:
+                if not future.done():
+                    self._pending[metric] = future
+                    stale.append(metric.metric_name())
+                    continue
+                if future.exception() is None:
+                    measurements.append((metric.metric_name(), future.result()))
+            future = self._executor.submit(self._timed, metric)
+            self._pending[metric] = future
+            started.append((metric, future))
+
+        for metric, future in started:
+            name = metric.metric_name()
+            timeout = self._timeouts[metric]
+            try:
+                measurements.append((name, future.result(timeout=max(0.0, start + timeout - time.monotonic()))))
+                del self._pending[metric]
+            except concurrent.futures.TimeoutError:
+                print(f"Warning: {name} measurement exceeds its {timeout: .4f}s timeout, reporting its last value.")
+                stale.append(name)
+            except Exception as e:  # ValueError by convention, but a plugin's Metric may raise anything
+                print(f"Warning: {name} measurement failed: {e!r}")
+                stale.append(name)
+                del self._pending[metric]
+        return measurements, stale
+
+    def _due(self, now: float) -> list:
+        """
+        Pops every Metric whose deadline has passed, and reschedules it for its next interval.
+        Must be called with the _impulse_lock held.
+        :param now: time.monotonic() of the current beat
+        :return: list of Metrics to measure this beat
+        """
+        popped = []
+        while self._schedule and self._schedule[0][0] <= now:
+            popped.append(heapq.heappop(self._schedule))
+        for entry in popped:
+            deadline, _, metric, interval = entry
+            entry[0] = deadline + interval
+            if entry[0] <= now and interval > 0:
+                entry[0] = now + interval  # Fell behind, don't try to catch up on missed measurements
+            heapq.heappush(self._schedule, entry)
+        return [entry[2] for entry in popped]
+
+    @staticmethod
+    def _pulse(snapshot, channels: list):
         """
         The data is ready to move to the subscribers.
-        Send it away!
+        Send it away! Each Subscriber's Channel delivers it on its own thread.
+        :param snapshot: immutable update
+        :param channels: list of dispatch.Channel
         :return:
         """
-        for sub in self._subscribers:
-            sub.update(self._data)
+        for channel in channels:
+            channel.put(snapshot)
 
     def kill(self, block=True):
         """
@@ -89,27 +310,63 @@ class Heart:
                 self._alive = False
                 time.sleep(0.1)
 
-    def register_metric(self, metric: Metric):
+    def register_metric(self, metric: Metric, interval: float = None, timeout: float = None):
         """
         Register a metric to be measured by this Heart.
+        The metric is measured on the first beat, then again every interval seconds.
+        It is left out of updates until a measurement succeeds.
         :param metric: telemetry.Metric implementation
+        :param interval: seconds between measurements, defaults to the Metric's metric_interval()
+        :param timeout: seconds a concurrent measurement may take, defaults to the Heart's timeout
         :return:
         """
         assert isinstance(metric, Metric), f"{type(metric)} is not an implementation of telemetry.Metric."
+        if interval is None:
+            interval = metric.metric_interval()
+        assert interval >= 0, f"{metric.metric_name()} interval must not be negative."
         with self._impulse_lock:
             self._metrics.append(metric)
-            self._data[metric.metric_name()] = {}
+            self._timeouts[metric] = timeout if timeout is not None else self.timeout
+            heapq.heappush(self._schedule, [time.monotonic(), next(self._order), metric, interval])
 
-    def register_subscriber(self, subscriber: Subscriber):
+    def register_subscriber(self, subscriber: Subscriber, queue_size: int = None, policy: str = None):
         """
         Register a subscriber to be notified with metric updates.
+        Updates are queued for the subscriber and delivered on its own thread.
         :param subscriber: telemetry.Subscriber implementation
+        :param queue_size: most updates queued, defaults to the Heart's queue_size
+        :param policy: overflow policy when the queue is full (see telemetry.dispatch), defaults to the Heart's policy
         :return:
         """
         assert isinstance(subscriber, Subscriber), f"{type(subscriber)} is not an " \
                                                    f"implementation of telemetry.Subscriber."
+        channel = dispatch.Channel(subscriber, queue_size if queue_size is not None else self.queue_size,
+                                   policy if policy is not None else self.policy)
         with self._impulse_lock:
             self._subscribers.append(subscriber)
+            self._channels.append(channel)
+
+    def unregister_subscriber(self, subscriber: Subscriber, timeout: float = 1) -> None:
+        """
+        Stops notifying a subscriber, once its queued updates are delivered. The subscriber is then closed.
+        :param subscriber: registered telemetry.Subscriber
+        :param timeout: most seconds to wait for its queue to drain
+        :return: None
+        """
+        with self._impulse_lock:
+            index = self._subscribers.index(subscriber)
+            del self._subscribers[index]
+            channel = self._channels.pop(index)
+        channel.close(timeout)
+
+    def subscriber_stats(self) -> list:
+        """
+        Lag counters for each Subscriber's queue, in registration order.
+        :return: list of dict counters, with the subscriber name under 'subscriber'
+        """
+        with self._impulse_lock:
+            channels = list(self._channels)
+        return [{'subscriber': channel.subscriber.subscriber_name(), **channel.stats()} for channel in channels]
 
     def update_assignment(self, node_id: int, pool_id: int):
         """
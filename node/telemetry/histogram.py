@@ -0,0 +1,83 @@
+"""
+Rolling histogram of recent samples, e.g. beat latency and jitter.
+"""
+import bisect
+import collections
+
+# Bucket upper bounds (ms), roughly logarithmic from 0.1ms to 1s. The last bucket holds anything larger.
+DEFAULT_BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class RollingHistogram:
+    """
+    Counts the last window samples into fixed buckets. Adding a sample is O(log buckets), evicting the oldest as needed.
+    """
+
+    def __init__(self, window: int, bounds: tuple = DEFAULT_BOUNDS):
+        """
+        :param window: number of most recent samples kept
+        :param bounds: ascending bucket upper bounds, a final unbounded bucket is added
+        """
+        assert window > 0, "Histogram window must be positive."
+        self.window = window
+        self.bounds = tuple(bounds)
+        self._samples = collections.deque()  # (value, bucket)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._total = 0.0
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """
+        Records a sample, forgetting the oldest once the window is full.
+        :param value: sample
+        :return: None
+        """
+        if len(self._samples) >= self.window:
+            old_value, old_bucket = self._samples.popleft()
+            self._counts[old_bucket] -= 1
+            self._total -= old_value
+        bucket = bisect.bisect_left(self.bounds, value)
+        self._samples.append((value, bucket))
+        self._counts[bucket] += 1
+        self._total += value
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimates a percentile as the upper bound of the bucket it falls in, capped at the largest sample.
+        :param p: percentile, 0-100
+        :return: float, 0 if there are no samples
+        """
+        if not self._samples:
+            return 0.0
+        rank = p / 100 * len(self._samples)
+        maximum = self.maximum()
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= rank:
+                return min(self.bounds[bucket], maximum) if bucket < len(self.bounds) else maximum
+        return maximum
+
+    def maximum(self) -> float:
+        """
+        :return: float largest sample in the window, 0 if there are none
+        """
+        return max(value for value, _ in self._samples) if self._samples else 0.0
+
+    def summary(self) -> dict:
+        """
+        Summarizes the window.
+        :return: dict of count, mean, p50, p90, p99, max, and bucket counts (in bounds order, then the overflow)
+        """
+        count = len(self._samples)
+        return {
+                'count': count,
+                'mean': self._total / count if count else 0.0,
+                'p50': self.percentile(50),
+                'p90': self.percentile(90),
+                'p99': self.percentile(99),
+                'max': self.maximum(),
+                'buckets': tuple(self._counts),
+        }
@@ -28,3 +28,19 @@ class Metric(abc.ABC):
         :return: dict
         """
         pass
+
+    def metric_interval(self) -> float:
+        """
+        Define or Return the preferred seconds between measurements.
+        The Heart reuses the most recent measurement until the interval elapses.
+        0 measures on every beat.
+        :return: float seconds
+        """
+        return 0
+
+    def close(self) -> None:
+        """
+        Release anything the Metric holds open, e.g. files or child processes. Called once the Heart stops.
+        :return: None
+        """
+        pass
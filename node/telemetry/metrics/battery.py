@@ -14,6 +14,9 @@ class Battery(Metric):
     def metric_name(self) -> str:
         return "battery"
 
+    def metric_interval(self) -> float:
+        return 30
+
     def measure(self) -> dict:
         try:
             psubattery = psutil.sensors_battery()
@@ -2,27 +2,36 @@
 CPU Metrics from psutil.
 """
 from node.telemetry.metric import Metric
+from node.telemetry.procfs import ProcFile, parse_stat, parse_loadavg
+import glob
 import psutil
 
 
 class CPU(Metric):
     """
     Wrapper for psutil CPU information.
+    Utilization is computed from the change in CPU times since the previous measurement, so measuring never sleeps.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._last_times = self._times()
+
     def metric_name(self) -> str:
         return "cpu"
 
     def measure(self) -> dict:
         try:
-            cpufreq = psutil.cpu_freq(percpu=False)
-            loadavg = psutil.getloadavg()
-            cpu_count = psutil.cpu_count(logical=True)
+            current_frequency, max_frequency = self._frequency()
+            loadavg = self._loadavg()
+            percent, per_core_percent = self._utilization()
+            cpu_count = self._cpu_count()
             data = {
                 'logical_cores': cpu_count,
-                'current_frequency': cpufreq.current,
-                'max_frequency': cpufreq.max,
-                'percent': psutil.cpu_percent(interval=0.1, percpu=False),
+                'current_frequency': current_frequency,
+                'max_frequency': max_frequency,
+                'percent': percent,
+                'per_core_percent': per_core_percent,
                 'load_1': loadavg[0] / cpu_count,
                 'load_5': loadavg[1] / cpu_count,
                 'load_15': loadavg[2] / cpu_count,
@@ -30,3 +39,120 @@ class CPU(Metric):
             return data
         except Exception as e:
             raise ValueError(f'Unable to collect CPU metrics: {e}')
+
+    def _frequency(self) -> tuple:
+        """
+        Current and maximum CPU frequency.
+        :return: (current, max) MHz
+        """
+        cpufreq = psutil.cpu_freq(percpu=False)
+        return cpufreq.current, cpufreq.max
+
+    def _loadavg(self) -> tuple:
+        """
+        System load averages.
+        :return: (load_1, load_5, load_15)
+        """
+        return psutil.getloadavg()
+
+    def _cpu_count(self) -> int:
+        """
+        Number of logical cores.
+        :return: int
+        """
+        return psutil.cpu_count(logical=True)
+
+    def _times(self) -> list:
+        """
+        Cumulative CPU time for each logical core.
+        :return: list of (busy, total) seconds
+        """
+        return [CPU._busy_total(times) for times in psutil.cpu_times(percpu=True)]
+
+    @staticmethod
+    def _busy_total(times) -> tuple:
+        """
+        Splits a psutil scputimes into busy and total time, the same way psutil.cpu_percent does.
+        :param times: psutil scputimes
+        :return: (busy, total) seconds
+        """
+        total = sum(times)
+        # Linux already counts guest time in user and nice
+        total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+        idle = times.idle + getattr(times, 'iowait', 0)
+        return total - idle, total
+
+    def _utilization(self):
+        """
+        Percent of time busy since the last call, overall and per core.
+        :return: float overall percent, list of float percent per core
+        """
+        times = self._times()
+        if len(times) != len(self._last_times):
+            self._last_times = [(0, 0)] * len(times)  # Cores came or went, fall back to since boot
+
+        busy_delta = 0
+        total_delta = 0
+        per_core = []
+        for (busy, total), (last_busy, last_total) in zip(times, self._last_times):
+            busy_delta += busy - last_busy
+            total_delta += total - last_total
+            per_core.append(CPU._percent(busy - last_busy, total - last_total))
+        self._last_times = times
+        return CPU._percent(busy_delta, total_delta), per_core
+
+    @staticmethod
+    def _percent(busy: float, total: float) -> float:
+        """
+        Busy time as a percent of total time, clamped to 0-100.
+        :param busy: seconds busy
+        :param total: seconds elapsed
+        :return: float percent
+        """
+        if total <= 0:
+            return 0.0
+        return round(min(max(busy / total * 100, 0.0), 100.0), 1)
+
+
+class ProcCPU(CPU):
+    """
+    CPU information read directly from /proc/stat, /proc/loadavg and sysfs cpufreq (Linux only).
+    """
+
+    def __init__(self):
+        self._stat = ProcFile('/proc/stat')
+        self._loadavg_file = ProcFile('/proc/loadavg')
+        self._cores = 0
+        self._cpuinfo = None
+        self._frequency_files = [ProcFile(path) for path in
+                                 sorted(glob.glob('/sys/devices/system/cpu/cpufreq/policy*/scaling_cur_freq'))]
+        self._max_frequency = 0.0
+        for path in glob.glob('/sys/devices/system/cpu/cpufreq/policy*/cpuinfo_max_freq'):
+            with open(path) as f:
+                self._max_frequency = max(self._max_frequency, int(f.read()) / 1000)  # kHz
+        if not self._frequency_files:
+            self._cpuinfo = ProcFile('/proc/cpuinfo', 65536)  # No cpufreq (e.g. VMs), fall back like psutil does
+        super().__init__()
+
+    def _frequency(self) -> tuple:
+        if self._cpuinfo is not None:
+            mhz = [float(line.split(':')[1]) for line in self._cpuinfo.read().splitlines()
+                   if line.startswith('cpu MHz')]
+        else:
+            mhz = [int(f.read()) / 1000 for f in self._frequency_files]
+        return (sum(mhz) / len(mhz) if mhz else 0.0), self._max_frequency
+
+    def _loadavg(self) -> tuple:
+        return parse_loadavg(self._loadavg_file.read())
+
+    def _cpu_count(self) -> int:
+        return self._cores
+
+    def _times(self) -> list:
+        times = []
+        for jiffies in parse_stat(self._stat.read())['cpu']:
+            total = sum(jiffies[:8])  # Guest time (fields 9, 10) is already counted in user and nice
+            idle = jiffies[3] + jiffies[4]  # idle + iowait
+            times.append((total - idle, total))
+        self._cores = len(times)
+        return times
@@ -2,44 +2,215 @@
 Disk Metrics from psutil.
 """
 from node.telemetry.metric import Metric
+from node.telemetry.procfs import ProcFile, parse_diskstats, parse_filesystems, parse_mounts
+import os
+import struct
+import time
 import psutil
 
+# Modulus of each per-device counter in /proc/diskstats: reads, writes, read and write bytes (512 byte sectors), read
+# and write ms, busy ms. Counts and sectors are unsigned longs (64 bit on 64 bit kernels), the ms counters are printed
+# as unsigned ints, so wrap at 2**32 everywhere.
+_ULONG = 2 ** (struct.calcsize('L') * 8)
+COUNTER_WRAP = (_ULONG, _ULONG, _ULONG * 512, _ULONG * 512, 2 ** 32, 2 ** 32, 2 ** 32)
+
 
 class Disk(Metric):
     """
     Wrapper for psutil Disk information.
+    Per device I/O rates are computed from the change in its counters since the previous measurement.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._storage_devices = {}  # Device name -> whether it is a whole disk rather than a partition
+        self._last_devices = None  # Device name -> counters at the last measurement, None before the first
+        self._last_time = 0.0  # time.monotonic() of the last measurement
+
     def metric_name(self) -> str:
         return "disk"
 
+    def metric_interval(self) -> float:
+        return 10
+
     def measure(self) -> dict:
         try:
-            pts = psutil.disk_partitions(all=False)  # Exclude virtual appliances and duplicates
-            io = psutil.disk_io_counters(perdisk=False)
             partitions = {}
-            for part in pts:
-                usage = psutil.disk_usage(part.mountpoint)
-                partitions[part.device] = {
-                        'device': part.device,
-                        'mount_point': part.mountpoint,
-                        'fstype': part.fstype,
-                        'total': usage.total,
-                        'used': usage.used,
-                        'free': usage.free,
-                        'percent': usage.percent,
+            for device, mount_point, fstype in self._partitions():
+                total, used, free, percent = self._usage(mount_point)
+                partitions[device] = {
+                        'device': device,
+                        'mount_point': mount_point,
+                        'fstype': fstype,
+                        'total': total,
+                        'used': used,
+                        'free': free,
+                        'percent': percent,
                 }
             data = {
                     'partitions': partitions,
-                    'io': {
-                            'read_count': io.read_count,
-                            'write_count': io.write_count,
-                            'read_bytes': io.read_bytes,
-                            'write_bytes': io.write_bytes,
-                            'read_time': io.read_time,
-                            'write_time': io.write_time,
-                    }
+                    'io': self._io(),
+                    'devices': self._rates(),
             }
             return data
         except Exception as e:
             raise ValueError(f'Unable to collect Disk metrics: {e}')
+
+    def _partitions(self) -> list:
+        """
+        Mounted physical partitions.
+        :return: list of (device, mount_point, fstype)
+        """
+        pts = psutil.disk_partitions(all=False)  # Exclude virtual appliances and duplicates
+        return [(part.device, part.mountpoint, part.fstype) for part in pts]
+
+    def _usage(self, mount_point: str) -> tuple:
+        """
+        Space used on a mounted partition.
+        :param mount_point: path the partition is mounted at
+        :return: (total, used, free, percent)
+        """
+        usage = psutil.disk_usage(mount_point)
+        return usage.total, usage.used, usage.free, usage.percent
+
+    def _rates(self) -> dict:
+        """
+        I/O rates of each disk since the last measurement. Counters which wrapped are unwrapped, a device whose
+        counters went back otherwise (e.g. it was removed and added again) reports 0 until the next.
+        The first measurement has nothing to compare to, and reports 0 for every device.
+        :return: dict of device name -> dict of read_iops, write_iops, read_bytes and write_bytes per second,
+                 await (average ms per I/O) and utilization (percent of time busy)
+        """
+        counters = {name: values for name, values in self._device_counters().items()
+                    if self._is_storage_device(name) and any(values)}  # Skips devices never used, e.g. loops
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        last_devices = self._last_devices or {}
+        devices = {}
+        for name, current in counters.items():
+            last = last_devices.get(name)
+            deltas = [Disk._delta(c, l, wrap) for c, l, wrap in zip(current, last, COUNTER_WRAP)] \
+                if last is not None and elapsed > 0 else [None]
+            if None in deltas:
+                deltas = [0] * len(current)
+            reads, writes, read_bytes, write_bytes, read_ms, write_ms, busy_ms = deltas
+            ios = reads + writes
+            per_second = 1 / elapsed if elapsed > 0 else 0
+            devices[name] = {
+                    'device': name,
+                    'read_iops': reads * per_second,
+                    'write_iops': writes * per_second,
+                    'read_bytes': read_bytes * per_second,
+                    'write_bytes': write_bytes * per_second,
+                    'await': (read_ms + write_ms) / ios if ios else 0.0,
+                    'utilization': min(busy_ms / 10 * per_second, 100.0),  # busy ms / elapsed ms * 100
+            }
+        self._last_devices = counters
+        self._last_time = now
+        return devices
+
+    @staticmethod
+    def _delta(current: int, last: int, wrap: int):
+        """
+        Change in a counter, allowing for it to have wrapped around once.
+        A counter which went back from the lower half of its range is taken to have been reset rather than wrapped.
+        :param current: counter now
+        :param last: counter at the last measurement
+        :param wrap: modulus the counter wraps at, see COUNTER_WRAP
+        :return: int change, or None if the counter was reset
+        """
+        if current >= last:
+            return current - last
+        if wrap // 2 <= last < wrap:
+            return current + wrap - last
+        return None
+
+    def _is_storage_device(self, name: str) -> bool:
+        """
+        Whether a device is a whole disk (or virtual device) rather than a partition, cached per device.
+        Without sysfs every device is taken to be a disk.
+        :param name: device name, e.g. from /proc/diskstats
+        :return: bool
+        """
+        storage = self._storage_devices.get(name)
+        if storage is None:
+            storage = os.path.exists(f"/sys/block/{name.replace('/', '!')}") or not os.path.isdir('/sys/block')
+            self._storage_devices[name] = storage
+        return storage
+
+    def _device_counters(self) -> dict:
+        """
+        Cumulative I/O counters of each disk and partition.
+        :return: dict of device name -> (reads, writes, read bytes, write bytes, read ms, write ms, busy ms)
+        """
+        return {name: (io.read_count, io.write_count, io.read_bytes, io.write_bytes, io.read_time, io.write_time,
+                       getattr(io, 'busy_time', 0))
+                for name, io in psutil.disk_io_counters(perdisk=True, nowrap=False).items()}
+
+    def _io(self) -> dict:
+        """
+        I/O counters summed over all disks.
+        :return: dict
+        """
+        io = psutil.disk_io_counters(perdisk=False)
+        return {
+                'read_count': io.read_count,
+                'write_count': io.write_count,
+                'read_bytes': io.read_bytes,
+                'write_bytes': io.write_bytes,
+                'read_time': io.read_time,
+                'write_time': io.write_time,
+        }
+
+
+class ProcDisk(Disk):
+    """
+    Disk information read directly from /proc/mounts, /proc/diskstats and statvfs (Linux only).
+    Selects the same partitions and disks as psutil.
+    """
+
+    SECTOR_SIZE = 512  # /proc/diskstats always counts 512 byte sectors
+
+    def __init__(self):
+        super().__init__()
+        self._mounts = ProcFile('/proc/self/mounts')
+        self._diskstats = ProcFile('/proc/diskstats')
+        with open('/proc/filesystems') as f:
+            self._fstypes = parse_filesystems(f.read())
+
+    def _partitions(self) -> list:
+        return [(device, mount_point, fstype) for device, mount_point, fstype in parse_mounts(self._mounts.read())
+                if device not in ('', 'none') and fstype in self._fstypes]
+
+    def _usage(self, mount_point: str) -> tuple:
+        st = os.statvfs(mount_point)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        percent = round(used / (used + free) * 100, 1) if used + free else 0.0
+        return total, used, free, percent
+
+    def _device_counters(self) -> dict:
+        return {name: (counters[0], counters[1], counters[2] * ProcDisk.SECTOR_SIZE,
+                       counters[3] * ProcDisk.SECTOR_SIZE, counters[4], counters[5], counters[6])
+                for name, counters in parse_diskstats(self._diskstats.read()).items()}
+
+    def _io(self) -> dict:
+        reads = writes = read_sectors = write_sectors = read_time = write_time = 0
+        for name, counters in parse_diskstats(self._diskstats.read()).items():
+            if not self._is_storage_device(name):
+                continue  # Partitions are already counted in their disk
+            reads += counters[0]
+            writes += counters[1]
+            read_sectors += counters[2]
+            write_sectors += counters[3]
+            read_time += counters[4]
+            write_time += counters[5]
+        return {
+                'read_count': reads,
+                'write_count': writes,
+                'read_bytes': read_sectors * ProcDisk.SECTOR_SIZE,
+                'write_bytes': write_sectors * ProcDisk.SECTOR_SIZE,
+                'read_time': read_time,
+                'write_time': write_time,
+        }
@@ -1,8 +1,14 @@
 """
-GPU Metrics from GPUtil.
+GPU Metrics from GPUtil, or streamed from a long-lived nvidia-smi.
 """
 from node.telemetry.metric import Metric
-import GPUtil
+import subprocess
+import threading
+import time
+
+# nvidia-smi --query-gpu fields, in the order StreamingGPU parses them
+QUERY = ('uuid', 'utilization.gpu', 'memory.total', 'memory.used', 'driver_version', 'name', 'gpu_serial',
+         'display_mode')
 
 
 class GPU(Metric):
@@ -14,6 +20,7 @@ class GPU(Metric):
         return "gpu"
 
     def measure(self) -> dict:
+        import GPUtil  # Only when used, StreamingGPU doesn't need it
         try:
             data = {}
             gpus = GPUtil.getGPUs()
@@ -32,3 +39,159 @@ class GPU(Metric):
             return data
         except Exception as e:
             raise ValueError(f'Unable to collect GPU metrics: {e}')
+
+
+class StreamingGPU(GPU):
+    """
+    GPU information from one nvidia-smi child which keeps sampling (--loop-ms), rather than one per measurement.
+    A background thread parses its lines as they arrive, and measure() returns the latest sample without waiting.
+    nvidia-smi prints one line per GPU each loop, a GPU seen twice since the last one starts the next loop, so a GPU
+    which is missing from a loop (e.g. removed) is dropped then. If the child exits, or hangs (prints nothing for hang
+    seconds) and is killed, it is restarted on a later measurement, at most once per restart seconds, and measurements
+    fail until it samples again.
+    Without nvidia-smi, there are no GPUs, as with GPUtil.
+    """
+
+    def __init__(self, command: str = 'nvidia-smi', interval_ms: int = 1000, restart: float = 60, hang: float = None):
+        """
+        Starts sampling.
+        :param command: nvidia-smi executable, or a script printing the same lines
+        :param interval_ms: milliseconds between nvidia-smi samples
+        :param restart: seconds between attempts to restart an exited nvidia-smi
+        :param hang: seconds without a line after which nvidia-smi is killed, defaults to 3 samples (at least 5 s)
+        """
+        super().__init__()
+        self.command = command
+        self.interval_ms = interval_ms
+        self.restart = restart
+        self.hang = hang if hang is not None else max(3 * interval_ms / 1000, 5)
+        self._lock = threading.Lock()
+        self._gpus = {}  # UUID -> latest dict measurement
+        self._loop = set()  # UUIDs seen in the current loop
+        self._process = None
+        self._started = -float('inf')  # time.monotonic() of the last start attempt
+        self._heard = 0.0  # time.monotonic() of the child's last line, or its start
+        self._error = None  # Why the child last stopped, None once it samples
+        self._sampled = threading.Event()  # Set once the child has listed every GPU, stopped, or couldn't start
+        self._start()
+
+    def measure(self) -> dict:
+        process = self._process
+        if process is not None and process.poll() is None and time.monotonic() - self._heard > self.hang:
+            with self._lock:
+                self._error = f'{self.command} printed nothing for {self.hang}s'
+                self._gpus = {}
+            self.close()
+        if self._process is None or self._process.poll() is not None:
+            if time.monotonic() - self._started >= self.restart:
+                self._start()
+        # Only waits for a (re)started child's first full sample, not again and again for one which hangs
+        self._sampled.wait(max(0.0, self._started + 1 + self.interval_ms / 1000 - time.monotonic()))
+        with self._lock:
+            if self._error is not None:
+                raise ValueError(f'Unable to collect GPU metrics: {self._error}')
+            return {uuid: dict(gpu) for uuid, gpu in self._gpus.items()}
+
+    def close(self) -> None:
+        """
+        Stops the nvidia-smi child, called by the Heart when it stops.
+        :return: None
+        """
+        process = self._process
+        self._process = None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def __del__(self):
+        self.close()
+
+    def _start(self) -> None:
+        """
+        Starts nvidia-smi and the thread reading it.
+        :return: None
+        """
+        self._started = time.monotonic()
+        self._sampled.clear()
+        try:
+            process = subprocess.Popen([self.command, f"--query-gpu={','.join(QUERY)}", '--format=csv,noheader,nounits',
+                                        f'--loop-ms={self.interval_ms}'],
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        except OSError:  # No nvidia-smi, so no NVIDIA GPUs
+            with self._lock:
+                self._gpus = {}
+                self._error = None
+            self._sampled.set()
+            return
+        with self._lock:
+            self._loop = set()
+            self._heard = time.monotonic()
+        self._process = process
+        threading.Thread(target=self._read, args=(process,), name='nvidia-smi', daemon=True).start()
+
+    def _read(self, process) -> None:
+        """
+        Parses nvidia-smi's lines until it exits.
+        :param process: subprocess.Popen of nvidia-smi
+        :return: None
+        """
+        for line in process.stdout:
+            gpu = StreamingGPU._parse(line)
+            if gpu is None:
+                continue
+            with self._lock:
+                self._heard = time.monotonic()
+                if gpu['uuid'] in self._loop:  # A new loop, forget GPUs the last one didn't list
+                    for uuid in set(self._gpus) - self._loop:
+                        del self._gpus[uuid]
+                    self._loop.clear()
+                    self._sampled.set()  # Every GPU has been listed
+                self._loop.add(gpu['uuid'])
+                self._gpus[gpu['uuid']] = gpu
+                self._error = None
+        code = process.wait()
+        with self._lock:
+            if self._process is process:  # Not closed, it stopped by itself
+                self._error = f'{self.command} exited with code {code}'
+                self._gpus = {}
+        self._sampled.set()
+
+    @staticmethod
+    def _parse(line: str):
+        """
+        Parses one line of nvidia-smi CSV output.
+        :param line: values of QUERY, comma separated
+        :return: dict measurement of a GPU, or None if the line isn't one
+        """
+        values = [value.strip() for value in line.split(',')]
+        if len(values) != len(QUERY) or not values[0].startswith('GPU-'):
+            return None
+        uuid, load, mem_total, mem_used, driver, product, serial, display_mode = values
+        load = StreamingGPU._number(load) / 100
+        mem_total = int(StreamingGPU._number(mem_total))
+        mem_used = int(StreamingGPU._number(mem_used))
+        return {
+                'uuid': uuid,
+                'load': load,
+                'mem_percent': mem_used / mem_total if mem_total else 0.0,
+                'mem_total': mem_total,
+                'mem_used': mem_used,
+                'driver': driver,
+                'product': product,
+                'serial': serial,
+                'display_mode': display_mode,
+        }
+
+    @staticmethod
+    def _number(value: str) -> float:
+        """
+        :param value: CSV value
+        :return: float, 0 for values nvidia-smi doesn't know, e.g. [N/A]
+        """
+        try:
+            return float(value)
+        except ValueError:
+            return 0.0
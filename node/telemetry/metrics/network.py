@@ -0,0 +1,120 @@
+"""
+Network Metrics from psutil.
+"""
+from node.telemetry.metric import Metric
+from node.telemetry.procfs import ProcFile, parse_netdev
+import fnmatch
+import time
+import psutil
+
+# Virtual interfaces excluded by default, so container hosts don't report one interface per container
+DEFAULT_EXCLUDE = ('lo', 'veth*', 'docker*', 'br-*', 'virbr*', 'cni*', 'flannel*', 'cali*', 'vxlan*', 'ifb*')
+
+
+class Network(Metric):
+    """
+    Wrapper for psutil network interface information.
+    Rates are computed from the change in each interface's counters since the previous measurement.
+    """
+
+    def __init__(self, exclude=DEFAULT_EXCLUDE):
+        """
+        :param exclude: fnmatch patterns of interface names to leave out
+        """
+        super().__init__()
+        self.exclude = tuple(exclude)
+        self._included = {}  # Interface name -> whether it matches no exclude pattern, cached per name
+        self._last_counters = self._filtered(self._counters())
+        self._last_time = time.monotonic()
+
+    def metric_name(self) -> str:
+        return "network"
+
+    def measure(self) -> dict:
+        try:
+            counters = self._filtered(self._counters())
+            now = time.monotonic()
+            elapsed = now - self._last_time
+            speeds = self._speeds(counters)
+            interfaces = {}
+            for name, current in counters.items():
+                last = self._last_counters.get(name)
+                if last is None or elapsed <= 0 or any(c < l for c, l in zip(current, last)):
+                    rates = (0.0,) * len(current)  # New interface, or its counters were reset
+                else:
+                    rates = tuple((c - l) / elapsed for c, l in zip(current, last))
+                interfaces[name] = {
+                        'name': name,
+                        'rx_bytes': rates[0],
+                        'rx_packets': rates[1],
+                        'rx_errors': rates[2],
+                        'rx_drops': rates[3],
+                        'tx_bytes': rates[4],
+                        'tx_packets': rates[5],
+                        'tx_errors': rates[6],
+                        'tx_drops': rates[7],
+                        'speed': speeds.get(name, 0),
+                }
+            self._last_counters = counters
+            self._last_time = now
+            return {'interfaces': interfaces}
+        except Exception as e:
+            raise ValueError(f'Unable to collect Network metrics: {e}')
+
+    def _filtered(self, counters: dict) -> dict:
+        """
+        Leaves out excluded interfaces.
+        :param counters: dict of interface name -> counters
+        :return: dict of interface name -> counters
+        """
+        filtered = {}
+        for name, values in counters.items():
+            included = self._included.get(name)
+            if included is None:
+                included = not any(fnmatch.fnmatchcase(name, pattern) for pattern in self.exclude)
+                self._included[name] = included
+            if included:
+                filtered[name] = values
+        return filtered
+
+    def _counters(self) -> dict:
+        """
+        Cumulative counters of every interface.
+        :return: dict of interface name -> (bytes received, packets received, receive errors, receive drops,
+                 bytes sent, packets sent, send errors, send drops)
+        """
+        return {name: (io.bytes_recv, io.packets_recv, io.errin, io.dropin,
+                       io.bytes_sent, io.packets_sent, io.errout, io.dropout)
+                for name, io in psutil.net_io_counters(pernic=True).items()}
+
+    def _speeds(self, interfaces) -> dict:
+        """
+        Link speed of each interface.
+        :param interfaces: interface names
+        :return: dict of interface name -> Mbit/s, 0 if unknown
+        """
+        stats = psutil.net_if_stats()
+        return {name: stats[name].speed for name in interfaces if name in stats}
+
+
+class ProcNetwork(Network):
+    """
+    Network interface information read directly from /proc/net/dev and sysfs (Linux only).
+    """
+
+    def __init__(self, exclude=DEFAULT_EXCLUDE):
+        self._netdev = ProcFile('/proc/net/dev')
+        super().__init__(exclude)
+
+    def _counters(self) -> dict:
+        return parse_netdev(self._netdev.read())
+
+    def _speeds(self, interfaces) -> dict:
+        speeds = {}
+        for name in interfaces:
+            try:
+                with open(f'/sys/class/net/{name}/speed') as f:
+                    speeds[name] = max(int(f.read()), 0)  # -1 while the link is down
+            except (OSError, ValueError):
+                speeds[name] = 0
+        return speeds
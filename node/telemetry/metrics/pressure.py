@@ -0,0 +1,198 @@
+"""
+Pressure stall and cgroup Metrics from /proc and cgroup v2 (Linux only).
+Load average counts runnable tasks however many cores a container may use, pressure stall information measures the
+share of time tasks actually waited for CPU, memory or I/O.
+"""
+from node.telemetry.metric import Metric
+from node.telemetry.procfs import ProcFile, parse_pressure, parse_keyed
+import os
+import time
+
+RESOURCES = ('cpu', 'memory', 'io')
+PRESSURE_ROOT = '/proc/pressure'
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+
+class _Cgroup:
+    """
+    A cgroup followed across measurements, with its files kept open.
+    """
+    __slots__ = ('path', 'cpu_stat', 'memory_current', 'memory_max', 'usage_usec', 'throttled_usec', 'sampled')
+
+    def __init__(self, root: str, path: str):
+        """
+        :param root: cgroup v2 mount point
+        :param path: cgroup path relative to root
+        :raises: OSError if the cgroup has no cpu.stat
+        """
+        self.path = path
+        directory = os.path.join(root, path)
+        self.cpu_stat = ProcFile(os.path.join(directory, 'cpu.stat'))
+        try:
+            self.memory_current = ProcFile(os.path.join(directory, 'memory.current'))
+        except OSError:  # Memory controller not enabled for this cgroup
+            self.memory_current = None
+        self.memory_max = _Cgroup._limit(directory)
+        self.usage_usec = None  # Counters at the last sample, None before the first
+        self.throttled_usec = None
+        self.sampled = 0.0  # time.monotonic() of the last sample
+
+    @staticmethod
+    def _limit(directory: str) -> int:
+        """
+        Reads the memory limit, only on discovery since it rarely changes.
+        :param directory: cgroup directory
+        :return: int bytes, 0 if unlimited or unknown
+        """
+        try:
+            with open(os.path.join(directory, 'memory.max')) as f:
+                limit = f.read().strip()
+            return 0 if limit == 'max' else int(limit)
+        except (OSError, ValueError):
+            return 0
+
+    def close(self) -> None:
+        self.cpu_stat.close()
+        if self.memory_current is not None:
+            self.memory_current.close()
+
+
+class Pressure(Metric):
+    """
+    System wide CPU, memory and I/O pressure, and the CPU usage, CPU throttling and memory use of configured cgroups.
+    Each measurement reads three pressure files plus two files per cgroup, all kept open. Cgroups are discovered
+    when the Metric is created and re-scanned every rescan seconds, so containers which come and go are picked up.
+    """
+
+    def __init__(self, cgroups=(), depth: int = 0, limit: int = 16, rescan: float = 60, root: str = CGROUP_ROOT):
+        """
+        :param cgroups: cgroup paths relative to root, e.g. 'system.slice', '' for the root cgroup
+        :param depth: levels of nested cgroups below each configured one to include as well
+        :param limit: most cgroups followed, the first found in configured order then depth first
+        :param rescan: seconds between cgroup discoveries
+        :param root: cgroup v2 mount point
+        """
+        super().__init__()
+        self.cgroups = tuple(path.strip('/') for path in cgroups)
+        self.depth = depth
+        self.limit = limit
+        self.rescan = rescan
+        self.root = root
+        self._pressure = {}  # Resource -> ProcFile
+        for resource in RESOURCES:
+            try:
+                self._pressure[resource] = ProcFile(os.path.join(PRESSURE_ROOT, resource))
+            except OSError:  # Kernel without PSI, or booted with psi=0
+                pass
+        self._tracked = {}  # Relative path -> _Cgroup
+        self._scanned = 0.0
+        self._discover()
+
+    def metric_name(self) -> str:
+        return "pressure"
+
+    def measure(self) -> dict:
+        try:
+            measurement = {resource: self._stalls(resource) for resource in RESOURCES}
+            now = time.monotonic()
+            if now - self._scanned >= self.rescan:
+                self._discover()
+            cgroups = {}
+            for path in list(self._tracked):
+                sample = self._sample(self._tracked[path], now)
+                if sample is not None:
+                    cgroups[sample['path']] = sample
+            measurement['cgroups'] = cgroups
+            return measurement
+        except Exception as e:
+            raise ValueError(f'Unable to collect pressure metrics: {e}')
+
+    def _stalls(self, resource: str) -> dict:
+        """
+        Reads a resource's pressure.
+        :param resource: one of RESOURCES
+        :return: dict of some_avg10, some_avg60, full_avg10, full_avg60, percentages of time stalled; 0 if unknown
+        """
+        pressure = parse_pressure(self._pressure[resource].read()) if resource in self._pressure else {}
+        some = pressure.get('some', (0.0, 0.0, 0.0))
+        full = pressure.get('full', (0.0, 0.0, 0.0))  # No full line for cpu before Linux 5.13
+        return {
+                'some_avg10': some[0],
+                'some_avg60': some[1],
+                'full_avg10': full[0],
+                'full_avg60': full[1],
+        }
+
+    def _discover(self) -> None:
+        """
+        Finds the configured cgroups and their nested cgroups, keeping those already tracked and forgetting removed ones.
+        :return: None
+        """
+        self._scanned = time.monotonic()
+        found = []
+        for path in self.cgroups:
+            self._walk(path, self.depth, found)
+        found = found[:self.limit]
+        for path in list(self._tracked):
+            if path not in found:
+                self._tracked.pop(path).close()
+        for path in found:
+            if path not in self._tracked:
+                try:
+                    self._tracked[path] = _Cgroup(self.root, path)
+                except OSError:  # Removed since the walk, or not a cgroup v2 directory
+                    continue
+
+    def _walk(self, path: str, depth: int, found: list) -> None:
+        """
+        Adds a cgroup, then its children down to depth more levels.
+        :param path: cgroup path relative to root
+        :param depth: levels of children still to include
+        :param found: list of paths, appended to
+        :return: None
+        """
+        directory = os.path.join(self.root, path)
+        if path in found or not os.path.isfile(os.path.join(directory, 'cpu.stat')):
+            return
+        found.append(path)
+        if depth <= 0:
+            return
+        try:
+            children = sorted(entry.name for entry in os.scandir(directory) if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            return
+        for child in children:
+            self._walk(os.path.join(path, child) if path else child, depth - 1, found)
+
+    def _sample(self, cgroup: _Cgroup, now: float):
+        """
+        Reads a cgroup's counters, and its CPU usage and throttling since its last sample.
+        A cgroup which has been removed is forgotten.
+        :param cgroup: _Cgroup
+        :param now: time.monotonic()
+        :return: dict of path, cpu_percent (of one core), throttled_percent (of the time), memory_current and
+                 memory_max (bytes, 0 if unlimited); None if the cgroup is gone
+        """
+        try:
+            stat = parse_keyed(cgroup.cpu_stat.read())
+            memory = int(cgroup.memory_current.read()) if cgroup.memory_current is not None else 0
+        except (OSError, ValueError):
+            self._tracked.pop(cgroup.path).close()
+            return None
+        usage = stat.get('usage_usec', 0)
+        throttled = stat.get('throttled_usec', 0)  # Only with the cpu controller enabled
+        cpu_percent = throttled_percent = 0.0
+        if cgroup.usage_usec is not None and now > cgroup.sampled:
+            elapsed_usec = (now - cgroup.sampled) * 1e6
+            cpu_percent = max(0.0, (usage - cgroup.usage_usec) / elapsed_usec * 100)
+            throttled_percent = min(100.0, max(0.0, (throttled - cgroup.throttled_usec) / elapsed_usec * 100))
+        cgroup.usage_usec = usage
+        cgroup.throttled_usec = throttled
+        cgroup.sampled = now
+        return {
+                'path': cgroup.path or '/',
+                'cpu_percent': cpu_percent,
+                'throttled_percent': throttled_percent,
+                'memory_current': memory,
+                'memory_max': cgroup.memory_max,
+        }
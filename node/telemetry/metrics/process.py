@@ -0,0 +1,143 @@
+"""
+Top Process Metrics from psutil.
+"""
+from node.telemetry.metric import Metric
+import collections
+import time
+import psutil
+
+
+class _Tracked:
+    """
+    A process followed across measurements.
+    """
+    __slots__ = ('process', 'cpu_time', 'sampled', 'cpu_percent', 'rss')
+
+    def __init__(self, process):
+        self.process = process  # psutil.Process, kept so its name and identity are only read once
+        self.cpu_time = None  # Seconds of user + system time at the last sample, None before the first
+        self.sampled = 0.0  # time.monotonic() of the last sample
+        self.cpu_percent = 0.0  # Of one core, averaged since the previous sample
+        self.rss = 0
+
+
+class Processes(Metric):
+    """
+    The processes using the most CPU and the most RAM.
+    Processes are tracked across measurements rather than listed afresh: new PIDs are picked up from psutil.pids(),
+    and CPU usage is each process's change in CPU time since its last sample. Each measurement samples at most budget
+    processes, round-robin, plus the last top processes, so the cost is bounded however many processes there are.
+    """
+
+    def __init__(self, count: int = 5, budget: int = 500):
+        """
+        :param count: processes reported by CPU and by RSS (the two may overlap)
+        :param budget: most processes sampled per measurement, besides the last top processes
+        """
+        super().__init__()
+        self.count = count
+        self.budget = budget
+        self._tracked = {}  # PID -> _Tracked
+        self._queue = collections.deque()  # PIDs in round-robin sampling order
+        self._top = []  # PIDs reported by the last measurement
+
+    def metric_name(self) -> str:
+        return "process"
+
+    def metric_interval(self) -> float:
+        return 5
+
+    def measure(self) -> dict:
+        try:
+            self._track(psutil.pids())
+            due = set(pid for pid in self._top if pid in self._tracked)
+            for _ in range(min(self.budget, len(self._queue))):
+                pid = self._queue.popleft()
+                if pid in self._tracked:
+                    self._queue.append(pid)
+                    due.add(pid)
+            now = time.monotonic()
+            for pid in due:
+                self._sample(pid, now)
+
+            tracked = self._tracked.values()
+            top_cpu = sorted(tracked, key=lambda t: t.cpu_percent, reverse=True)[:self.count]
+            top_rss = sorted(tracked, key=lambda t: t.rss, reverse=True)[:self.count]
+            processes = {}
+            for entry in top_cpu + top_rss:
+                processes[entry.process.pid] = {
+                        'pid': entry.process.pid,
+                        'name': Processes._name(entry.process),
+                        'cpu_percent': round(entry.cpu_percent, 1),
+                        'rss': entry.rss,
+                }
+            self._top = list(processes)
+            return {
+                    'tracked': len(self._tracked),
+                    'processes': processes,
+            }
+        except Exception as e:
+            raise ValueError(f'Unable to collect process metrics: {e}')
+
+    def _track(self, pids: list) -> None:
+        """
+        Starts tracking new PIDs and forgets PIDs which have exited.
+        New PIDs are sampled first, so a new process is compared against its baseline on the following round.
+        :param pids: list of current PIDs
+        :return: None
+        """
+        current = set(pids)
+        for pid in list(self._tracked):
+            if pid not in current:
+                del self._tracked[pid]
+        new = [pid for pid in pids if pid not in self._tracked]
+        for pid in new:
+            try:
+                self._tracked[pid] = _Tracked(psutil.Process(pid))
+            except psutil.Error:
+                continue
+        self._queue.extendleft(reversed([pid for pid in new if pid in self._tracked]))
+        if len(self._queue) > 2 * len(self._tracked):  # Exited PIDs are only skipped lazily, compact now and then
+            self._queue = collections.deque(pid for pid in self._queue if pid in self._tracked)
+
+    def _sample(self, pid: int, now: float) -> None:
+        """
+        Reads a process's CPU time and RSS, and its CPU usage since its last sample.
+        A process which has exited is forgotten, one whose CPU time went backwards has had its PID reused.
+        :param pid: tracked PID
+        :param now: time.monotonic()
+        :return: None
+        """
+        entry = self._tracked[pid]
+        try:
+            with entry.process.oneshot():
+                times = entry.process.cpu_times()
+                rss = entry.process.memory_info().rss
+        except psutil.NoSuchProcess:
+            del self._tracked[pid]
+            return
+        except psutil.AccessDenied:
+            return
+        cpu_time = times.user + times.system
+        if entry.cpu_time is not None and cpu_time < entry.cpu_time:  # PID was reused, start over with a baseline
+            try:
+                entry = self._tracked[pid] = _Tracked(psutil.Process(pid))
+            except psutil.Error:
+                del self._tracked[pid]
+                return
+        entry.rss = rss
+        if entry.cpu_time is not None and now > entry.sampled:
+            entry.cpu_percent = max(0.0, (cpu_time - entry.cpu_time) / (now - entry.sampled) * 100)
+        entry.cpu_time = cpu_time
+        entry.sampled = now
+
+    @staticmethod
+    def _name(process) -> str:
+        """
+        :param process: psutil.Process
+        :return: str process name, psutil caches it after the first read
+        """
+        try:
+            return process.name()
+        except psutil.Error:
+            return ''
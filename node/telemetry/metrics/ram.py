@@ -2,6 +2,7 @@
 RAM Metrics from psutil.
 """
 from node.telemetry.metric import Metric
+from node.telemetry.procfs import ProcFile, parse_meminfo
 import psutil
 
 
@@ -31,3 +32,39 @@ class RAM(Metric):
             return data
         except Exception as e:
             raise ValueError(f'Unable to collect RAM metrics: {e}')
+
+
+class ProcRAM(RAM):
+    """
+    RAM information read directly from /proc/meminfo (Linux only).
+    Matches psutil's definitions of used and available.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._meminfo = ProcFile('/proc/meminfo')
+
+    def measure(self) -> dict:
+        try:
+            mem = parse_meminfo(self._meminfo.read())
+            total = mem['MemTotal']
+            free = mem['MemFree']
+            available = mem.get('MemAvailable', free + mem.get('Buffers', 0) + mem.get('Cached', 0))
+            if not 0 <= available <= total:
+                available = free
+            swap_total = mem.get('SwapTotal', 0)
+            swap_free = mem.get('SwapFree', 0)
+            swap_used = swap_total - swap_free
+            data = {
+                    'virt_total': total,
+                    'virt_available': available,
+                    'virt_used': total - available,
+                    'virt_free': free,
+                    'swap_total': swap_total,
+                    'swap_used': swap_used,
+                    'swap_free': swap_free,
+                    'swap_percent': round(swap_used / swap_total * 100, 1) if swap_total else 0.0,
+            }
+            return data
+        except Exception as e:
+            raise ValueError(f'Unable to collect RAM metrics: {e}')
@@ -2,6 +2,9 @@
 Session Metrics from psutil.
 """
 from node.telemetry.metric import Metric
+from node.telemetry.procfs import parse_stat
+from node.telemetry.utmp import UtmpFile, UTMP_PATH
+import os
 import psutil
 import time
 
@@ -13,35 +16,52 @@ class Session(Metric):
 
     def __init__(self):
         super().__init__()
-        self.users = psutil.users()
-        self.last_called = time.time()
+        self.users = []
+        self.last_called = -float('inf')  # Measured on the first beat
         self.frequency = 60 * 15  # 15 minutes
         self.num_calls = 0
 
     def metric_name(self) -> str:
         return "session"
 
+    def metric_interval(self) -> float:
+        return 30
+
     def measure(self) -> dict:
         try:
-            self.safe_users()
-            psusers = self.users
             users = {}
-            for user in psusers:
+            for user in self._users():
                 users[user.name] = {
                         'terminal': user.terminal,
                         'host': user.host,
                         'started': int(user.started),
                         'pid': user.pid
                 }
+            boot_time = self._boot_time()
             data = {
-                    'boot_time': int(psutil.boot_time()),
-                    'uptime': int(time.time() - psutil.boot_time()),
+                    'boot_time': int(boot_time),
+                    'uptime': int(time.time() - boot_time),
                     'users': users,
             }
             return data
         except Exception as e:
             raise ValueError(f'Unable to collect Session metrics: {e}')
 
+    def _boot_time(self) -> float:
+        """
+        When the system booted.
+        :return: float seconds since the epoch
+        """
+        return psutil.boot_time()
+
+    def _users(self) -> list:
+        """
+        Who is logged in.
+        :return: list of psutil.users() entries, or alike
+        """
+        self.safe_users()
+        return self.users
+
     def safe_users(self):
         now = time.time()
         if now >= self.last_called + self.frequency:
@@ -52,3 +72,45 @@ class Session(Metric):
                 self.num_calls += 1
             else:
                 print("Unable to update psutil.users()! Avoiding Fatal Python error. Restart the service.")
+
+
+class UtmpSession(Session):
+    """
+    Session information with users read from utmp (Linux only), rather than psutil.users() every 15 minutes.
+    The file is only re-parsed when it changes, so users are current on every measurement without psutil's leak.
+    """
+
+    def __init__(self, path: str = UTMP_PATH):
+        """
+        :param path: path to the utmp file
+        """
+        super().__init__()
+        self._utmp = UtmpFile(path)
+
+    @staticmethod
+    def supported(path: str = UTMP_PATH) -> bool:
+        """
+        :param path: path to the utmp file
+        :return: bool whether logins are recorded in utmp
+        """
+        return os.path.exists(path)
+
+    def metric_interval(self) -> float:
+        return 5  # A stat() unless someone logged in or out
+
+    def _users(self) -> list:
+        return self._utmp.users()
+
+
+class ProcSession(UtmpSession):
+    """
+    Session information with users read from utmp and the boot time read once from /proc/stat (Linux only).
+    """
+
+    def __init__(self):
+        super().__init__()
+        with open('/proc/stat') as f:
+            self._btime = parse_stat(f.read())['btime']
+
+    def _boot_time(self) -> float:
+        return self._btime
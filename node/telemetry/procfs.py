@@ -0,0 +1,189 @@
+"""
+Direct readers for Linux /proc (and /sys) files.
+Files are opened once and re-read from the start with pread, avoiding an open/close and psutil's namedtuples per beat.
+"""
+import os
+import re
+
+
+class ProcFile:
+    """
+    Keeps a /proc file open, re-reading the whole file on each read().
+    """
+
+    def __init__(self, path: str, size: int = 4096):
+        """
+        Opens the file.
+        :param path: path to the file
+        :param size: initial read buffer size, grows as needed
+        :raises: OSError if the file can't be opened
+        """
+        self.path = path
+        self._size = size
+        self._fd = os.open(path, os.O_RDONLY)
+
+    def read(self) -> str:
+        """
+        Reads the current contents of the file.
+        :return: str
+        """
+        data = os.pread(self._fd, self._size, 0)
+        while len(data) >= self._size:  # Might have been cut short, try again with a larger buffer
+            self._size *= 2
+            data = os.pread(self._fd, self._size, 0)
+        return data.decode()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        self.close()
+
+
+_OCTAL_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+
+def unescape(field: str) -> str:
+    """
+    Decodes the octal escapes (e.g. \\040 for a space) used by /proc/mounts.
+    :param field: escaped field
+    :return: str
+    """
+    return _OCTAL_ESCAPE.sub(lambda match: chr(int(match.group(1), 8)), field)
+
+
+def parse_stat(content: str) -> dict:
+    """
+    Parses /proc/stat.
+    :param content: contents of /proc/stat
+    :return: dict of 'cpu' (list of per-core int jiffy lists), 'btime' (int)
+    """
+    cores = []
+    btime = 0
+    for line in content.splitlines():
+        if line.startswith('cpu') and line[3:4].isdigit():
+            cores.append([int(field) for field in line.split()[1:]])
+        elif line.startswith('btime'):
+            btime = int(line.split()[1])
+    return {'cpu': cores, 'btime': btime}
+
+
+def parse_meminfo(content: str) -> dict:
+    """
+    Parses /proc/meminfo.
+    :param content: contents of /proc/meminfo
+    :return: dict of field name -> bytes
+    """
+    fields = {}
+    for line in content.splitlines():
+        name, _, value = line.partition(':')
+        parts = value.split()
+        if parts:
+            fields[name] = int(parts[0]) * (1024 if len(parts) > 1 else 1)  # Values are in kB
+    return fields
+
+
+def parse_loadavg(content: str) -> tuple:
+    """
+    Parses /proc/loadavg.
+    :param content: contents of /proc/loadavg
+    :return: (load_1, load_5, load_15)
+    """
+    fields = content.split()
+    return float(fields[0]), float(fields[1]), float(fields[2])
+
+
+def parse_mounts(content: str) -> list:
+    """
+    Parses /proc/mounts.
+    :param content: contents of /proc/mounts
+    :return: list of (device, mount_point, fstype)
+    """
+    mounts = []
+    for line in content.splitlines():
+        fields = line.split()
+        if len(fields) >= 3:
+            mounts.append((unescape(fields[0]), unescape(fields[1]), fields[2]))
+    return mounts
+
+
+def parse_filesystems(content: str) -> set:
+    """
+    Parses /proc/filesystems into the set of filesystems backed by a device, the same set psutil uses.
+    :param content: contents of /proc/filesystems
+    :return: set of str fstype
+    """
+    fstypes = set()
+    for line in content.splitlines():
+        fields = line.split()
+        if len(fields) == 1:
+            fstypes.add(fields[0])
+        elif len(fields) == 2 and fields[1] == 'zfs':
+            fstypes.add('zfs')
+    return fstypes
+
+
+def parse_diskstats(content: str) -> dict:
+    """
+    Parses /proc/diskstats.
+    https://www.kernel.org/doc/Documentation/ABI/testing/procfs-diskstats
+    :param content: contents of /proc/diskstats
+    :return: dict of device name -> (reads, writes, read sectors, write sectors, read ms, write ms, busy ms)
+    """
+    devices = {}
+    for line in content.splitlines():
+        fields = line.split()
+        if len(fields) >= 14:
+            devices[fields[2]] = (int(fields[3]), int(fields[7]), int(fields[5]), int(fields[9]),
+                                  int(fields[6]), int(fields[10]), int(fields[12]))
+        elif len(fields) == 7:  # Partition on older kernels
+            devices[fields[2]] = (int(fields[3]), int(fields[5]), int(fields[4]), int(fields[6]), 0, 0, 0)
+    return devices
+
+
+def parse_netdev(content: str) -> dict:
+    """
+    Parses /proc/net/dev.
+    :param content: contents of /proc/net/dev
+    :return: dict of interface name -> (bytes received, packets received, receive errors, receive drops,
+             bytes sent, packets sent, send errors, send drops)
+    """
+    interfaces = {}
+    for line in content.splitlines()[2:]:  # Two header lines
+        name, _, counters = line.partition(':')
+        fields = counters.split()
+        if len(fields) >= 16:
+            interfaces[name.strip()] = (int(fields[0]), int(fields[1]), int(fields[2]), int(fields[3]),
+                                        int(fields[8]), int(fields[9]), int(fields[10]), int(fields[11]))
+    return interfaces
+
+
+def parse_pressure(content: str) -> dict:
+    """
+    Parses a pressure stall information file, /proc/pressure/{cpu,memory,io}.
+    https://docs.kernel.org/accounting/psi.html
+    :param content: contents of the file
+    :return: dict of 'some' and 'full' (where present) -> (avg10, avg60, avg300) percentages of time stalled
+    """
+    pressure = {}
+    for line in content.splitlines():
+        kind, _, rest = line.partition(' ')
+        values = dict(field.split('=', 1) for field in rest.split())
+        pressure[kind] = (float(values['avg10']), float(values['avg60']), float(values['avg300']))
+    return pressure
+
+
+def parse_keyed(content: str) -> dict:
+    """
+    Parses a flat keyed cgroup file of "key value" lines, e.g. cpu.stat.
+    :param content: contents of the file
+    :return: dict of key -> int
+    """
+    keyed = {}
+    for line in content.splitlines():
+        fields = line.split()
+        if len(fields) == 2:
+            keyed[fields[0]] = int(fields[1])
+    return keyed
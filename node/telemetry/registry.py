@@ -0,0 +1,207 @@
+"""
+Registry of the Metrics a Node can measure.
+Metrics are created by name from the enabled list, and a Metric's module (and its backend, e.g. psutil or GPUtil) is
+only imported when it's enabled. A Metric may have a probe, checked before anything is imported, which skips it where
+it doesn't apply, e.g. battery on a server.
+Other packages add Metrics with a 'shepherd.metrics' entry point, naming either a Metric class or a factory taking the
+config and returning a Metric (or None to skip it). Built in Metrics take precedence over entry points of the same name.
+"""
+import importlib.metadata
+import os
+import shutil
+import sys
+
+ENTRY_POINT_GROUP = 'shepherd.metrics'
+
+
+class Plugin:
+    """
+    How to create one Metric.
+    """
+
+    def __init__(self, name: str, factory, probe=None):
+        """
+        :param name: name the Metric is enabled by, its metric_name()
+        :param factory: callable taking the config and returning the Metric, importing its module itself
+        :param probe: callable taking the config, returning whether the Metric applies, None if it always does
+        """
+        self.name = name
+        self.factory = factory
+        self.probe = probe
+
+
+PLUGINS = {}  # Name -> Plugin
+
+
+def register(plugin: Plugin) -> None:
+    """
+    Registers a Plugin, replacing any of the same name.
+    :param plugin: Plugin
+    :return: None
+    """
+    PLUGINS[plugin.name] = plugin
+
+
+def load(names, config) -> list:
+    """
+    Creates the enabled Metrics which apply to this machine. A Metric whose probe or factory raises is skipped.
+    :param names: Metric names, in registration order
+    :param config: configuration the factories and probes read, i.e. node.constants
+    :return: list of Metrics
+    """
+    metrics = []
+    for name in names:
+        plugin = PLUGINS.get(name) or _entry_point(name)
+        if plugin is None:
+            print(f"Warning: No Metric named {name}, skipping it.")
+            continue
+        try:
+            if plugin.probe is not None and not plugin.probe(config):
+                print(f"{name} doesn't apply to this machine, skipping it.")
+                continue
+            metric = plugin.factory(config)
+        except Exception as e:  # Missing backends, unusual /proc, denied access... any Metric which can't start
+            print(f"Warning: Unable to create the {name} Metric, skipping it: {e!r}")
+            continue
+        if metric is not None:
+            metrics.append(metric)
+    return metrics
+
+
+def _entry_point(name: str):
+    """
+    Looks for a Metric installed by another package.
+    :param name: Metric name
+    :return: Plugin, or None if there's no entry point of that name
+    """
+    try:
+        entry_points = importlib.metadata.entry_points(group=ENTRY_POINT_GROUP, name=name)
+    except TypeError:  # Python 3.9 returns a dict of groups
+        entry_points = [entry_point for entry_point in importlib.metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+                        if entry_point.name == name]
+    for entry_point in entry_points:
+        return Plugin(name, lambda config: _create(entry_point.load(), config))
+    return None
+
+
+def _create(target, config):
+    """
+    :param target: Metric class, or factory taking the config
+    :param config: configuration
+    :return: Metric, or None
+    """
+    from node.telemetry.metric import Metric
+    if isinstance(target, type) and issubclass(target, Metric):
+        return target()
+    return target(config)
+
+
+"""
+Probes
+"""
+
+
+def _has_battery(config) -> bool:
+    """
+    On Linux, whether any power supply is a battery. Elsewhere psutil decides, so assume there may be one.
+    :param config: configuration
+    :return: bool
+    """
+    if not sys.platform.startswith('linux'):
+        return True
+    try:
+        supplies = os.listdir('/sys/class/power_supply')
+    except OSError:
+        return False
+    for supply in supplies:
+        try:
+            with open(f'/sys/class/power_supply/{supply}/type') as f:
+                if f.read().strip() == 'Battery':
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def _has_gpu(config) -> bool:
+    """
+    Whether nvidia-smi (or the configured replacement) is installed.
+    :param config: configuration
+    :return: bool
+    """
+    return shutil.which(config.GPU_COMMAND if config.GPU_STREAMING else 'nvidia-smi') is not None
+
+
+def _has_pressure(config) -> bool:
+    """
+    Whether the kernel reports pressure stall information.
+    :param config: configuration
+    :return: bool
+    """
+    return os.path.isdir('/proc/pressure')
+
+
+"""
+Built in Metrics
+"""
+
+
+def _cpu(config):
+    from node.telemetry.metrics.cpu import CPU, ProcCPU
+    return ProcCPU() if config.METRIC_BACKEND == 'procfs' else CPU()
+
+
+def _ram(config):
+    from node.telemetry.metrics.ram import RAM, ProcRAM
+    return ProcRAM() if config.METRIC_BACKEND == 'procfs' else RAM()
+
+
+def _disk(config):
+    from node.telemetry.metrics.disk import Disk, ProcDisk
+    return ProcDisk() if config.METRIC_BACKEND == 'procfs' else Disk()
+
+
+def _session(config):
+    from node.telemetry.metrics.session import Session, UtmpSession, ProcSession
+    if config.METRIC_BACKEND == 'procfs':
+        return ProcSession()
+    return UtmpSession() if UtmpSession.supported() else Session()
+
+
+def _battery(config):
+    from node.telemetry.metrics.battery import Battery
+    return Battery()
+
+
+def _gpu(config):
+    from node.telemetry.metrics.gpu import GPU, StreamingGPU
+    return StreamingGPU(config.GPU_COMMAND, config.GPU_LOOP_MS) if config.GPU_STREAMING else GPU()
+
+
+def _network(config):
+    from node.telemetry.metrics.network import DEFAULT_EXCLUDE, Network, ProcNetwork
+    exclude = DEFAULT_EXCLUDE if config.INTERFACE_EXCLUDE is None else config.INTERFACE_EXCLUDE
+    if config.METRIC_BACKEND == 'procfs':
+        return ProcNetwork(exclude)
+    return Network(exclude)
+
+
+def _process(config):
+    from node.telemetry.metrics.process import Processes
+    return Processes(config.PROCESS_TOP, config.PROCESS_BUDGET)
+
+
+def _pressure(config):
+    from node.telemetry.metrics.pressure import Pressure
+    return Pressure(config.CGROUPS, config.CGROUP_DEPTH, config.CGROUP_LIMIT, config.CGROUP_RESCAN, config.CGROUP_ROOT)
+
+
+register(Plugin('cpu', _cpu))
+register(Plugin('gpu', _gpu, _has_gpu))
+register(Plugin('ram', _ram))
+register(Plugin('disk', _disk))
+register(Plugin('session', _session))
+register(Plugin('battery', _battery, _has_battery))
+register(Plugin('network', _network))
+register(Plugin('process', _process))
+register(Plugin('pressure', _pressure, _has_pressure))
@@ -2,6 +2,7 @@
 Defines a Subscriber ABC (Interface).
 """
 import abc
+from node.telemetry.dispatch import thaw
 
 
 class Subscriber(abc.ABC):
@@ -21,11 +22,27 @@ class Subscriber(abc.ABC):
     def update(self, update: dict) -> None:
         """
         Receive an update from the data source.
+        Called on the Subscriber's own thread, with an immutable snapshot of the data.
         :param update:
         :return:
         """
         pass
 
+    def close(self) -> None:
+        """
+        Called on the Subscriber's own thread once no more updates will arrive, when it's unregistered or the Heart stops.
+        :return: None
+        """
+        pass
+
+    def stats(self) -> dict:
+        """
+        Define or Return the Subscriber's own counters, reported with its queue's in the Heart's agent telemetry.
+        'unsent' counts updates the Subscriber received but couldn't pass on (e.g. send), 0 if not given.
+        :return: dict of str -> number
+        """
+        return {}
+
 
 class ConsoleSubscriber(Subscriber):
     """
@@ -36,4 +53,4 @@ class ConsoleSubscriber(Subscriber):
         return "console"
 
     def update(self, update: dict) -> None:
-        print(f"Update: {update}", flush=True)
+        print(f"Update: {thaw(update)}", flush=True)
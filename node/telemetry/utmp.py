@@ -0,0 +1,78 @@
+"""
+Direct reader for the Linux utmp login records, in place of psutil.users().
+psutil.users() leaks on every call (https://github.com/giampaolo/psutil/issues/1965), reading the file ourselves
+doesn't, and since the file is only re-parsed when it changes, a read between logins is a single stat().
+"""
+import collections
+import os
+import struct
+
+UTMP_PATH = '/var/run/utmp'
+
+# struct utmp on Linux (glibc, musl), the same on 32 and 64 bit since ut_tv is always two 32 bit fields:
+# ut_type, padding, ut_pid, ut_line, ut_id, ut_user, ut_host, ut_exit, ut_session, ut_tv, ut_addr_v6, reserved
+_RECORD = struct.Struct('<hxxi32s4s32s256shhiii16s20x')
+USER_PROCESS = 7  # ut_type of a logged in user
+
+UtmpEntry = collections.namedtuple('UtmpEntry', ['name', 'terminal', 'host', 'started', 'pid'])
+
+
+def _string(field: bytes) -> str:
+    """
+    :param field: NUL padded char array
+    :return: str
+    """
+    return field.split(b'\0', 1)[0].decode(errors='replace')
+
+
+def parse_utmp(content: bytes) -> list:
+    """
+    Parses utmp records, keeping logged in users.
+    :param content: contents of the utmp file
+    :return: list of UtmpEntry, shaped like psutil.users()
+    """
+    users = []
+    for offset in range(0, len(content) - _RECORD.size + 1, _RECORD.size):
+        ut_type, pid, line, _, user, host, _, _, _, seconds, _, _ = _RECORD.unpack_from(content, offset)
+        if ut_type != USER_PROCESS:
+            continue
+        host = _string(host)
+        if host in (':0', ':0.0'):  # As psutil reports local X sessions
+            host = 'localhost'
+        users.append(UtmpEntry(_string(user), _string(line) or None, host, float(seconds), pid))
+    return users
+
+
+class UtmpFile:
+    """
+    The users in a utmp file, re-read only when the file's inode, mtime or size changes.
+    """
+
+    def __init__(self, path: str = UTMP_PATH):
+        """
+        :param path: path to the utmp file
+        """
+        self.path = path
+        self._signature = None  # (inode, mtime ns, size) when last parsed, None if never parsed or missing
+        self._users = []
+        self.reads = 0  # Times the file was actually parsed
+
+    def users(self) -> list:
+        """
+        The current users, from the last parse if the file hasn't changed since.
+        :return: list of UtmpEntry, empty if the file doesn't exist
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:  # e.g. containers without a login manager
+            self._signature = None
+            self._users = []
+            return self._users
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with open(self.path, 'rb') as f:
+                content = f.read()
+            self._users = parse_utmp(content)
+            self._signature = signature
+            self.reads += 1
+        return self._users
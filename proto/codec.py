@@ -0,0 +1,88 @@
+"""
+Compression codecs for the frames a Node publishes to the Collector.
+The Node offers the codecs it has installed in its Negotiation, the Broker picks one and shares its trained dictionary.
+zstandard and lz4 are optional, a codec is only offered when its library can be imported.
+"""
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+
+ZSTD = 'zstd'
+LZ4 = 'lz4'
+
+
+def available() -> list:
+    """
+    Codecs which can be used here, most preferred first.
+    :return: list of str codec names
+    """
+    codecs = []
+    if zstandard is not None:
+        codecs.append(ZSTD)
+    if lz4 is not None:
+        codecs.append(LZ4)
+    return codecs
+
+
+def train(samples: list, size: int) -> bytes:
+    """
+    Trains a zstd dictionary on sample messages. The same dictionary is used as a prefix for lz4.
+    :param samples: list of bytes serialized messages
+    :param size: maximum dictionary size in bytes
+    :return: bytes dictionary
+    :raises: ValueError if zstandard isn't installed
+    """
+    if zstandard is None:
+        raise ValueError("Training a dictionary requires zstandard.")
+    return zstandard.train_dictionary(size, samples).as_bytes()
+
+
+class Codec:
+    """
+    Compresses and decompresses messages with one codec and an optional dictionary.
+    Not thread safe, each thread should have its own Codec.
+    """
+
+    def __init__(self, name: str, dictionary: bytes = b'', level: int = 3):
+        """
+        :param name: ZSTD or LZ4
+        :param dictionary: trained dictionary shared by both ends, may be empty
+        :param level: zstd compression level
+        :raises: ValueError if the codec isn't available
+        """
+        if name not in available():
+            raise ValueError(f"Codec {name} is not available.")
+        self.name = name
+        self.frame = name.encode()  # Frame part naming the codec
+        self.dictionary = dictionary
+        if name == ZSTD:
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self._compressor = zstandard.ZstdCompressor(level=level, dict_data=dict_data)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        :param data: serialized message
+        :return: bytes compressed message
+        """
+        if self.name == ZSTD:
+            return self._compressor.compress(data)
+        return lz4.block.compress(data, dict=self.dictionary)
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        :param data: compressed message
+        :return: bytes serialized message
+        :raises: ValueError if the message can't be decompressed (e.g. compressed with another dictionary)
+        """
+        try:
+            if self.name == ZSTD:
+                return self._decompressor.decompress(data)
+            return lz4.block.decompress(data, dict=self.dictionary)
+        except Exception as e:
+            raise ValueError(f"Unable to decompress {self.name} message: {e}")
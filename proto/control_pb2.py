@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: proto/control.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13proto/control.proto\" \n\x07\x43ontrol\x12\x15\n\rsend_keyframe\x18\x01 \x01(\x08\"\xbc\x01\n\x05Stats\x12\x0f\n\x07time_ms\x18\x01 \x01(\x04\x12\x0f\n\x07seconds\x18\x02 \x01(\x02\x12\x10\n\x08messages\x18\x03 \x01(\x04\x12\x0f\n\x07reports\x18\x04 \x01(\x04\x12\x0e\n\x06missed\x18\x05 \x01(\x04\x12\x10\n\x08rejected\x18\x06 \x01(\x04\x12\x13\n\x0blag_mean_ms\x18\x07 \x01(\x02\x12\x12\n\nlag_max_ms\x18\x08 \x01(\x02\x12\x14\n\x0c\x62usy_percent\x18\t \x01(\x02\x12\r\n\x05nodes\x18\n \x01(\rb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.control_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _CONTROL._serialized_start=23
+  _CONTROL._serialized_end=55
+  _STATS._serialized_start=58
+  _STATS._serialized_end=246
+# @@protoc_insertion_point(module_scope)
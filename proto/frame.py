@@ -0,0 +1,9 @@
+"""
+Frame kinds, the first part of each multipart message a Node publishes to the Collector.
+The second part is the serialized message, or with compression the codec name (see proto.codec) then the message.
+Single part messages are a bare Report, from Nodes which predate framing.
+"""
+REPORT = b'report'  # Report
+BATCH = b'batch'  # ReportBatch
+SPOOLED = b'spooled'  # ReportBatch of full Reports held while the Collector was unreachable, oldest first
+ALERT = b'alert'  # Alert, sent ahead of any batched Reports
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# source: negotiation.proto
+# source: proto/negotiation.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -13,93 +13,15 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='negotiation.proto',
-  package='',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x11negotiation.proto\"\x8c\x01\n\x0bNegotiation\x12\x0f\n\x07pool_id\x18\x01 \x01(\r\x12\x0f\n\x07node_id\x18\x02 \x01(\r\x12\x18\n\x10node_proposes_id\x18\x03 \x01(\x08\x12\x16\n\x0eserver_approve\x18\x04 \x01(\x08\x12\x16\n\x0e\x63ollector_port\x18\x05 \x01(\r\x12\x11\n\tnode_name\x18\x06 \x01(\tb\x06proto3'
-)
-
-
-
-
-_NEGOTIATION = _descriptor.Descriptor(
-  name='Negotiation',
-  full_name='Negotiation',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='pool_id', full_name='Negotiation.pool_id', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='node_id', full_name='Negotiation.node_id', index=1,
-      number=2, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='node_proposes_id', full_name='Negotiation.node_proposes_id', index=2,
-      number=3, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='server_approve', full_name='Negotiation.server_approve', index=3,
-      number=4, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='collector_port', full_name='Negotiation.collector_port', index=4,
-      number=5, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='node_name', full_name='Negotiation.node_name', index=5,
-      number=6, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=22,
-  serialized_end=162,
-)
-
-DESCRIPTOR.message_types_by_name['Negotiation'] = _NEGOTIATION
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-Negotiation = _reflection.GeneratedProtocolMessageType('Negotiation', (_message.Message,), {
-  'DESCRIPTOR' : _NEGOTIATION,
-  '__module__' : 'negotiation_pb2'
-  # @@protoc_insertion_point(class_scope:Negotiation)
-  })
-_sym_db.RegisterMessage(Negotiation)
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17proto/negotiation.proto\"\x97\x05\n\x0bNegotiation\x12\x0f\n\x07pool_id\x18\x01 \x01(\r\x12\x0f\n\x07node_id\x18\x02 \x01(\r\x12\x18\n\x10node_proposes_id\x18\x03 \x01(\x08\x12\x16\n\x0eserver_approve\x18\x04 \x01(\x08\x12\x16\n\x0e\x63ollector_port\x18\x05 \x01(\r\x12\x11\n\tnode_name\x18\x06 \x01(\t\x12\x14\n\x0c\x63ontrol_port\x18\x07 \x01(\r\x12\x0e\n\x06\x63odecs\x18\x08 \x03(\t\x12\r\n\x05\x63odec\x18\t \x01(\t\x12\x12\n\ndictionary\x18\n \x01(\x0c\x12+\n\nthresholds\x18\x0b \x01(\x0b\x32\x17.Negotiation.Thresholds\x1a\x92\x03\n\nThresholds\x12\x12\n\ncpu_load_5\x18\x01 \x01(\x02\x12\x13\n\x0b\x63pu_load_15\x18\x02 \x01(\x02\x12\x18\n\x10ram_virt_percent\x18\x03 \x01(\x02\x12\x18\n\x10ram_swap_percent\x18\x04 \x01(\x02\x12\x15\n\rbattery_avail\x18\x05 \x01(\x02\x12\x16\n\x0esession_uptime\x18\x06 \x01(\x04\x12\x1a\n\x12gpu_memory_percent\x18\x07 \x01(\x02\x12\x10\n\x08gpu_load\x18\x08 \x01(\x02\x12\x19\n\x11\x64isk_percent_used\x18\t \x01(\x02\x12\x1b\n\x13\x64isk_io_utilization\x18\n \x01(\x02\x12\x15\n\rdisk_io_await\x18\x0b \x01(\x02\x12\x14\n\x0cpressure_cpu\x18\x0c \x01(\x02\x12\x17\n\x0fpressure_memory\x18\r \x01(\x02\x12\x13\n\x0bpressure_io\x18\x0e \x01(\x02\x12\x18\n\x10\x63group_throttled\x18\x0f \x01(\x02\x12\x1d\n\x15\x63group_memory_percent\x18\x10 \x01(\x02\x62\x06proto3')
 
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.negotiation_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
 
+  DESCRIPTOR._options = None
+  _NEGOTIATION._serialized_start=28
+  _NEGOTIATION._serialized_end=691
+  _NEGOTIATION_THRESHOLDS._serialized_start=289
+  _NEGOTIATION_THRESHOLDS._serialized_end=691
 # @@protoc_insertion_point(module_scope)
@@ -2,9 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: proto/report.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -13,647 +13,39 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='proto/report.proto',
-  package='',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x12proto/report.proto\"\x94\t\n\x06Report\x12\x0f\n\x07pool_id\x18\x01 \x01(\r\x12\x0f\n\x07node_id\x18\x02 \x01(\r\x12\x12\n\ntime_stamp\x18\x03 \x01(\r\x12\x18\n\x03\x63pu\x18\x04 \x01(\x0b\x32\x0b.Report.CPU\x12\x18\n\x03ram\x18\x05 \x01(\x0b\x32\x0b.Report.RAM\x12\x1a\n\x04\x64isk\x18\x06 \x01(\x0b\x32\x0c.Report.Disk\x12 \n\x07\x62\x61ttery\x18\x07 \x01(\x0b\x32\x0f.Report.Battery\x12 \n\x07session\x18\x08 \x01(\x0b\x32\x0f.Report.Session\x12\x18\n\x03gpu\x18\t \x01(\x0b\x32\x0b.Report.GPU\x1a\x86\x01\n\x03\x43PU\x12\x15\n\rlogical_cores\x18\x01 \x01(\r\x12\x14\n\x0c\x63urrent_freq\x18\x02 \x01(\x02\x12\x10\n\x08max_freq\x18\x03 \x01(\x02\x12\x0f\n\x07percent\x18\x04 \x01(\x02\x12\x0e\n\x06load_1\x18\x05 \x01(\x02\x12\x0e\n\x06load_5\x18\x06 \x01(\x02\x12\x0f\n\x07load_15\x18\x07 \x01(\x02\x1a\xab\x01\n\x03GPU\x12\r\n\x05uuids\x18\x01 \x03(\t\x12\r\n\x05loads\x18\x02 \x03(\x02\x12\x14\n\x0cmem_percents\x18\x03 \x03(\x02\x12\x12\n\nmem_totals\x18\x04 \x03(\x04\x12\x11\n\tmem_useds\x18\x05 \x03(\x04\x12\x0f\n\x07\x64rivers\x18\x06 \x03(\t\x12\x10\n\x08products\x18\x07 \x03(\t\x12\x0f\n\x07serials\x18\x08 \x03(\t\x12\x15\n\rdisplay_modes\x18\t \x03(\t\x1a\xa7\x01\n\x03RAM\x12\x12\n\nvirt_total\x18\x01 \x01(\x04\x12\x16\n\x0evirt_available\x18\x02 \x01(\x04\x12\x11\n\tvirt_used\x18\x03 \x01(\x04\x12\x11\n\tvirt_free\x18\x04 \x01(\x04\x12\x12\n\nswap_total\x18\x05 \x01(\x04\x12\x11\n\tswap_used\x18\x06 \x01(\x04\x12\x11\n\tswap_free\x18\x07 \x01(\x04\x12\x14\n\x0cswap_percent\x18\x08 \x01(\x02\x1a\xf9\x01\n\x04\x44isk\x12\x15\n\rpartition_ids\x18\x01 \x03(\t\x12\x14\n\x0cmount_points\x18\x02 \x03(\t\x12\x0f\n\x07\x66stypes\x18\x03 \x03(\t\x12\x0e\n\x06totals\x18\x04 \x03(\x04\x12\r\n\x05useds\x18\x05 \x03(\x04\x12\r\n\x05\x66rees\x18\x06 \x03(\x04\x12\x10\n\x08percents\x18\x07 \x03(\x02\x12\x10\n\x08read_cnt\x18\x08 \x01(\x04\x12\x11\n\twrite_cnt\x18\t \x01(\x04\x12\x12\n\nread_bytes\x18\n \x01(\x04\x12\x13\n\x0bwrite_bytes\x18\x0b \x01(\x04\x12\x11\n\tread_time\x18\x0c \x01(\x04\x12\x12\n\nwrite_time\x18\r \x01(\x04\x1a\x44\n\x07\x42\x61ttery\x12\x0f\n\x07percent\x18\x01 \x01(\x02\x12\x11\n\tsecs_left\x18\x02 \x01(\x04\x12\x15\n\rpower_plugged\x18\x03 \x01(\x08\x1a\x82\x01\n\x07Session\x12\x11\n\tboot_time\x18\x01 \x01(\x04\x12\x0e\n\x06uptime\x18\x02 \x01(\x04\x12\r\n\x05users\x18\x03 \x03(\t\x12\x11\n\tterminals\x18\x04 \x03(\t\x12\r\n\x05hosts\x18\x05 \x03(\t\x12\x15\n\rstarted_times\x18\x06 \x03(\x04\x12\x0c\n\x04pids\x18\x07 \x03(\x04\x62\x06proto3'
-)
-
-
-
-
-_REPORT_CPU = _descriptor.Descriptor(
-  name='CPU',
-  full_name='Report.CPU',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='logical_cores', full_name='Report.CPU.logical_cores', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='current_freq', full_name='Report.CPU.current_freq', index=1,
-      number=2, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='max_freq', full_name='Report.CPU.max_freq', index=2,
-      number=3, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='percent', full_name='Report.CPU.percent', index=3,
-      number=4, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='load_1', full_name='Report.CPU.load_1', index=4,
-      number=5, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='load_5', full_name='Report.CPU.load_5', index=5,
-      number=6, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='load_15', full_name='Report.CPU.load_15', index=6,
-      number=7, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=262,
-  serialized_end=396,
-)
-
-_REPORT_GPU = _descriptor.Descriptor(
-  name='GPU',
-  full_name='Report.GPU',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='uuids', full_name='Report.GPU.uuids', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='loads', full_name='Report.GPU.loads', index=1,
-      number=2, type=2, cpp_type=6, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='mem_percents', full_name='Report.GPU.mem_percents', index=2,
-      number=3, type=2, cpp_type=6, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='mem_totals', full_name='Report.GPU.mem_totals', index=3,
-      number=4, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='mem_useds', full_name='Report.GPU.mem_useds', index=4,
-      number=5, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='drivers', full_name='Report.GPU.drivers', index=5,
-      number=6, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='products', full_name='Report.GPU.products', index=6,
-      number=7, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='serials', full_name='Report.GPU.serials', index=7,
-      number=8, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='display_modes', full_name='Report.GPU.display_modes', index=8,
-      number=9, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=399,
-  serialized_end=570,
-)
-
-_REPORT_RAM = _descriptor.Descriptor(
-  name='RAM',
-  full_name='Report.RAM',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='virt_total', full_name='Report.RAM.virt_total', index=0,
-      number=1, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='virt_available', full_name='Report.RAM.virt_available', index=1,
-      number=2, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='virt_used', full_name='Report.RAM.virt_used', index=2,
-      number=3, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='virt_free', full_name='Report.RAM.virt_free', index=3,
-      number=4, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='swap_total', full_name='Report.RAM.swap_total', index=4,
-      number=5, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='swap_used', full_name='Report.RAM.swap_used', index=5,
-      number=6, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='swap_free', full_name='Report.RAM.swap_free', index=6,
-      number=7, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='swap_percent', full_name='Report.RAM.swap_percent', index=7,
-      number=8, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=573,
-  serialized_end=740,
-)
-
-_REPORT_DISK = _descriptor.Descriptor(
-  name='Disk',
-  full_name='Report.Disk',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='partition_ids', full_name='Report.Disk.partition_ids', index=0,
-      number=1, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='mount_points', full_name='Report.Disk.mount_points', index=1,
-      number=2, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='fstypes', full_name='Report.Disk.fstypes', index=2,
-      number=3, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='totals', full_name='Report.Disk.totals', index=3,
-      number=4, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='useds', full_name='Report.Disk.useds', index=4,
-      number=5, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='frees', full_name='Report.Disk.frees', index=5,
-      number=6, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='percents', full_name='Report.Disk.percents', index=6,
-      number=7, type=2, cpp_type=6, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='read_cnt', full_name='Report.Disk.read_cnt', index=7,
-      number=8, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='write_cnt', full_name='Report.Disk.write_cnt', index=8,
-      number=9, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='read_bytes', full_name='Report.Disk.read_bytes', index=9,
-      number=10, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='write_bytes', full_name='Report.Disk.write_bytes', index=10,
-      number=11, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='read_time', full_name='Report.Disk.read_time', index=11,
-      number=12, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='write_time', full_name='Report.Disk.write_time', index=12,
-      number=13, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=743,
-  serialized_end=992,
-)
-
-_REPORT_BATTERY = _descriptor.Descriptor(
-  name='Battery',
-  full_name='Report.Battery',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='percent', full_name='Report.Battery.percent', index=0,
-      number=1, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='secs_left', full_name='Report.Battery.secs_left', index=1,
-      number=2, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='power_plugged', full_name='Report.Battery.power_plugged', index=2,
-      number=3, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=994,
-  serialized_end=1062,
-)
-
-_REPORT_SESSION = _descriptor.Descriptor(
-  name='Session',
-  full_name='Report.Session',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='boot_time', full_name='Report.Session.boot_time', index=0,
-      number=1, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='uptime', full_name='Report.Session.uptime', index=1,
-      number=2, type=4, cpp_type=4, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='users', full_name='Report.Session.users', index=2,
-      number=3, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='terminals', full_name='Report.Session.terminals', index=3,
-      number=4, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='hosts', full_name='Report.Session.hosts', index=4,
-      number=5, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='started_times', full_name='Report.Session.started_times', index=5,
-      number=6, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='pids', full_name='Report.Session.pids', index=6,
-      number=7, type=4, cpp_type=4, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1065,
-  serialized_end=1195,
-)
-
-_REPORT = _descriptor.Descriptor(
-  name='Report',
-  full_name='Report',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='pool_id', full_name='Report.pool_id', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='node_id', full_name='Report.node_id', index=1,
-      number=2, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='time_stamp', full_name='Report.time_stamp', index=2,
-      number=3, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='cpu', full_name='Report.cpu', index=3,
-      number=4, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='ram', full_name='Report.ram', index=4,
-      number=5, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='disk', full_name='Report.disk', index=5,
-      number=6, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='battery', full_name='Report.battery', index=6,
-      number=7, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='session', full_name='Report.session', index=7,
-      number=8, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='gpu', full_name='Report.gpu', index=8,
-      number=9, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[_REPORT_CPU, _REPORT_GPU, _REPORT_RAM, _REPORT_DISK, _REPORT_BATTERY, _REPORT_SESSION, ],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=23,
-  serialized_end=1195,
-)
-
-_REPORT_CPU.containing_type = _REPORT
-_REPORT_GPU.containing_type = _REPORT
-_REPORT_RAM.containing_type = _REPORT
-_REPORT_DISK.containing_type = _REPORT
-_REPORT_BATTERY.containing_type = _REPORT
-_REPORT_SESSION.containing_type = _REPORT
-_REPORT.fields_by_name['cpu'].message_type = _REPORT_CPU
-_REPORT.fields_by_name['ram'].message_type = _REPORT_RAM
-_REPORT.fields_by_name['disk'].message_type = _REPORT_DISK
-_REPORT.fields_by_name['battery'].message_type = _REPORT_BATTERY
-_REPORT.fields_by_name['session'].message_type = _REPORT_SESSION
-_REPORT.fields_by_name['gpu'].message_type = _REPORT_GPU
-DESCRIPTOR.message_types_by_name['Report'] = _REPORT
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-Report = _reflection.GeneratedProtocolMessageType('Report', (_message.Message,), {
-
-  'CPU' : _reflection.GeneratedProtocolMessageType('CPU', (_message.Message,), {
-    'DESCRIPTOR' : _REPORT_CPU,
-    '__module__' : 'proto.report_pb2'
-    # @@protoc_insertion_point(class_scope:Report.CPU)
-    })
-  ,
-
-  'GPU' : _reflection.GeneratedProtocolMessageType('GPU', (_message.Message,), {
-    'DESCRIPTOR' : _REPORT_GPU,
-    '__module__' : 'proto.report_pb2'
-    # @@protoc_insertion_point(class_scope:Report.GPU)
-    })
-  ,
-
-  'RAM' : _reflection.GeneratedProtocolMessageType('RAM', (_message.Message,), {
-    'DESCRIPTOR' : _REPORT_RAM,
-    '__module__' : 'proto.report_pb2'
-    # @@protoc_insertion_point(class_scope:Report.RAM)
-    })
-  ,
-
-  'Disk' : _reflection.GeneratedProtocolMessageType('Disk', (_message.Message,), {
-    'DESCRIPTOR' : _REPORT_DISK,
-    '__module__' : 'proto.report_pb2'
-    # @@protoc_insertion_point(class_scope:Report.Disk)
-    })
-  ,
-
-  'Battery' : _reflection.GeneratedProtocolMessageType('Battery', (_message.Message,), {
-    'DESCRIPTOR' : _REPORT_BATTERY,
-    '__module__' : 'proto.report_pb2'
-    # @@protoc_insertion_point(class_scope:Report.Battery)
-    })
-  ,
-
-  'Session' : _reflection.GeneratedProtocolMessageType('Session', (_message.Message,), {
-    'DESCRIPTOR' : _REPORT_SESSION,
-    '__module__' : 'proto.report_pb2'
-    # @@protoc_insertion_point(class_scope:Report.Session)
-    })
-  ,
-  'DESCRIPTOR' : _REPORT,
-  '__module__' : 'proto.report_pb2'
-  # @@protoc_insertion_point(class_scope:Report)
-  })
-_sym_db.RegisterMessage(Report)
-_sym_db.RegisterMessage(Report.CPU)
-_sym_db.RegisterMessage(Report.GPU)
-_sym_db.RegisterMessage(Report.RAM)
-_sym_db.RegisterMessage(Report.Disk)
-_sym_db.RegisterMessage(Report.Battery)
-_sym_db.RegisterMessage(Report.Session)
-
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12proto/report.proto\"\xac\x17\n\x06Report\x12\x0f\n\x07pool_id\x18\x01 \x01(\r\x12\x0f\n\x07node_id\x18\x02 \x01(\r\x12\x12\n\ntime_stamp\x18\x03 \x01(\r\x12\x18\n\x03\x63pu\x18\x04 \x01(\x0b\x32\x0b.Report.CPU\x12\x18\n\x03ram\x18\x05 \x01(\x0b\x32\x0b.Report.RAM\x12\x1a\n\x04\x64isk\x18\x06 \x01(\x0b\x32\x0c.Report.Disk\x12 \n\x07\x62\x61ttery\x18\x07 \x01(\x0b\x32\x0f.Report.Battery\x12 \n\x07session\x18\x08 \x01(\x0b\x32\x0f.Report.Session\x12\x18\n\x03gpu\x18\t \x01(\x0b\x32\x0b.Report.GPU\x12$\n\tinventory\x18\n \x01(\x0b\x32\x11.Report.Inventory\x12\x10\n\x08sequence\x18\x0b \x01(\x04\x12\r\n\x05\x64\x65lta\x18\x0c \x01(\x08\x12\x0f\n\x07\x63hanged\x18\r \x03(\r\x12\x0f\n\x07time_ms\x18\x0e \x01(\x04\x12$\n\taggregate\x18\x0f \x01(\x0b\x32\x11.Report.Aggregate\x12 \n\x07process\x18\x10 \x01(\x0b\x32\x0f.Report.Process\x12 \n\x07network\x18\x11 \x01(\x0b\x32\x0f.Report.Network\x12\"\n\x08pressure\x18\x12 \x01(\x0b\x32\x10.Report.Pressure\x12\x1c\n\x05\x61gent\x18\x13 \x01(\x0b\x32\r.Report.Agent\x1a\x9d\x01\n\x03\x43PU\x12\x15\n\rlogical_cores\x18\x01 \x01(\r\x12\x14\n\x0c\x63urrent_freq\x18\x02 \x01(\x02\x12\x10\n\x08max_freq\x18\x03 \x01(\x02\x12\x0f\n\x07percent\x18\x04 \x01(\x02\x12\x0e\n\x06load_1\x18\x05 \x01(\x02\x12\x0e\n\x06load_5\x18\x06 \x01(\x02\x12\x0f\n\x07load_15\x18\x07 \x01(\x02\x12\x15\n\rcore_percents\x18\x08 \x03(\x02\x1a\xbc\x01\n\x03GPU\x12\r\n\x05uuids\x18\x01 \x03(\t\x12\r\n\x05loads\x18\x02 \x03(\x02\x12\x14\n\x0cmem_percents\x18\x03 \x03(\x02\x12\x12\n\nmem_totals\x18\x04 \x03(\x04\x12\x11\n\tmem_useds\x18\x05 \x03(\x04\x12\x0f\n\x07\x64rivers\x18\x06 \x03(\t\x12\x10\n\x08products\x18\x07 \x03(\t\x12\x0f\n\x07serials\x18\x08 \x03(\t\x12\x15\n\rdisplay_modes\x18\t \x03(\t\x12\x0f\n\x07indices\x18\n \x03(\r\x1a\xa7\x01\n\x03RAM\x12\x12\n\nvirt_total\x18\x01 \x01(\x04\x12\x16\n\x0evirt_available\x18\x02 \x01(\x04\x12\x11\n\tvirt_used\x18\x03 \x01(\x04\x12\x11\n\tvirt_free\x18\x04 \x01(\x04\x12\x12\n\nswap_total\x18\x05 \x01(\x04\x12\x11\n\tswap_used\x18\x06 \x01(\x04\x12\x11\n\tswap_free\x18\x07 \x01(\x04\x12\x14\n\x0cswap_percent\x18\x08 \x01(\x02\x1a\x91\x03\n\x04\x44isk\x12\x15\n\rpartition_ids\x18\x01 \x03(\t\x12\x14\n\x0cmount_points\x18\x02 \x03(\t\x12\x0f\n\x07\x66stypes\x18\x03 \x03(\t\x12\x0e\n\x06totals\x18\x04 \x03(\x04\x12\r\n\x05useds\x18\x05 \x03(\x04\x12\r\n\x05\x66rees\x18\x06 \x03(\x04\x12\x10\n\x08percents\x18\x07 \x03(\x02\x12\x10\n\x08read_cnt\x18\x08 \x01(\x04\x12\x11\n\twrite_cnt\x18\t \x01(\x04\x12\x12\n\nread_bytes\x18\n \x01(\x04\x12\x13\n\x0bwrite_bytes\x18\x0b \x01(\x04\x12\x11\n\tread_time\x18\x0c \x01(\x04\x12\x12\n\nwrite_time\x18\r \x01(\x04\x12\x0f\n\x07indices\x18\x0e \x03(\r\x12\x0f\n\x07\x64\x65vices\x18\x0f \x03(\t\x12\x11\n\tread_iops\x18\x10 \x03(\x02\x12\x12\n\nwrite_iops\x18\x11 \x03(\x02\x12\x12\n\nread_rates\x18\x12 \x03(\x02\x12\x13\n\x0bwrite_rates\x18\x13 \x03(\x02\x12\x0e\n\x06\x61waits\x18\x14 \x03(\x02\x12\x14\n\x0cutilizations\x18\x15 \x03(\x02\x1a\x44\n\x07\x42\x61ttery\x12\x0f\n\x07percent\x18\x01 \x01(\x02\x12\x11\n\tsecs_left\x18\x02 \x01(\x04\x12\x15\n\rpower_plugged\x18\x03 \x01(\x08\x1a\x82\x01\n\x07Session\x12\x11\n\tboot_time\x18\x01 \x01(\x04\x12\x0e\n\x06uptime\x18\x02 \x01(\x04\x12\r\n\x05users\x18\x03 \x03(\t\x12\x11\n\tterminals\x18\x04 \x03(\t\x12\r\n\x05hosts\x18\x05 \x03(\t\x12\x15\n\rstarted_times\x18\x06 \x03(\x04\x12\x0c\n\x04pids\x18\x07 \x03(\x04\x1a\x8f\x02\n\tInventory\x12\x19\n\x11partition_indices\x18\x01 \x03(\r\x12\x15\n\rpartition_ids\x18\x02 \x03(\t\x12\x14\n\x0cmount_points\x18\x03 \x03(\t\x12\x0f\n\x07\x66stypes\x18\x04 \x03(\t\x12\x0e\n\x06totals\x18\x05 \x03(\x04\x12\x13\n\x0bgpu_indices\x18\x06 \x03(\r\x12\x11\n\tgpu_uuids\x18\x07 \x03(\t\x12\x16\n\x0egpu_mem_totals\x18\x08 \x03(\x04\x12\x13\n\x0bgpu_drivers\x18\t \x03(\t\x12\x14\n\x0cgpu_products\x18\n \x03(\t\x12\x13\n\x0bgpu_serials\x18\x0b \x03(\t\x12\x19\n\x11gpu_display_modes\x18\x0c \x03(\t\x1a[\n\x07Process\x12\x0f\n\x07tracked\x18\x01 \x01(\r\x12\x0c\n\x04pids\x18\x02 \x03(\r\x12\r\n\x05names\x18\x03 \x03(\t\x12\x14\n\x0c\x63pu_percents\x18\x04 \x03(\x02\x12\x0c\n\x04rsss\x18\x05 \x03(\x04\x1a\xbe\x01\n\x07Network\x12\r\n\x05names\x18\x01 \x03(\t\x12\x10\n\x08rx_bytes\x18\x02 \x03(\x02\x12\x12\n\nrx_packets\x18\x03 \x03(\x02\x12\x11\n\trx_errors\x18\x04 \x03(\x02\x12\x10\n\x08rx_drops\x18\x05 \x03(\x02\x12\x10\n\x08tx_bytes\x18\x06 \x03(\x02\x12\x12\n\ntx_packets\x18\x07 \x03(\x02\x12\x11\n\ttx_errors\x18\x08 \x03(\x02\x12\x10\n\x08tx_drops\x18\t \x03(\x02\x12\x0e\n\x06speeds\x18\n \x03(\r\x1a\xa3\x03\n\x08Pressure\x12\x16\n\x0e\x63pu_some_avg10\x18\x01 \x01(\x02\x12\x16\n\x0e\x63pu_some_avg60\x18\x02 \x01(\x02\x12\x16\n\x0e\x63pu_full_avg10\x18\x03 \x01(\x02\x12\x16\n\x0e\x63pu_full_avg60\x18\x04 \x01(\x02\x12\x19\n\x11memory_some_avg10\x18\x05 \x01(\x02\x12\x19\n\x11memory_some_avg60\x18\x06 \x01(\x02\x12\x19\n\x11memory_full_avg10\x18\x07 \x01(\x02\x12\x19\n\x11memory_full_avg60\x18\x08 \x01(\x02\x12\x15\n\rio_some_avg10\x18\t \x01(\x02\x12\x15\n\rio_some_avg60\x18\n \x01(\x02\x12\x15\n\rio_full_avg10\x18\x0b \x01(\x02\x12\x15\n\rio_full_avg60\x18\x0c \x01(\x02\x12\x0f\n\x07\x63groups\x18\r \x03(\t\x12\x14\n\x0c\x63pu_percents\x18\x0e \x03(\x02\x12\x1a\n\x12throttled_percents\x18\x0f \x03(\x02\x12\x17\n\x0fmemory_currents\x18\x10 \x03(\x04\x12\x13\n\x0bmemory_maxs\x18\x11 \x03(\x04\x1a\xf1\x01\n\x05\x41gent\x12\x10\n\x08\x63pu_time\x18\x01 \x01(\x01\x12\x13\n\x0b\x63pu_percent\x18\x02 \x01(\x02\x12\x0b\n\x03rss\x18\x03 \x01(\x04\x12\x11\n\tirregular\x18\x04 \x01(\x08\x12\x0f\n\x07skipped\x18\x05 \x01(\r\x12\x0f\n\x07metrics\x18\x06 \x03(\t\x12\x18\n\x10metric_latencies\x18\x07 \x03(\x02\x12\x13\n\x0bsubscribers\x18\x08 \x03(\t\x12\x19\n\x11subscriber_queued\x18\t \x03(\r\x12\x1a\n\x12subscriber_dropped\x18\n \x03(\x04\x12\x19\n\x11subscriber_unsent\x18\x0b \x03(\x04\x1aw\n\tAggregate\x12\r\n\x05\x63ount\x18\x01 \x01(\r\x12\x10\n\x08start_ms\x18\x02 \x01(\x04\x12\x0e\n\x06\x66ields\x18\x03 \x03(\t\x12\x0e\n\x06\x63ounts\x18\x04 \x03(\r\x12\x0c\n\x04mins\x18\x05 \x03(\x01\x12\x0c\n\x04maxs\x18\x06 \x03(\x01\x12\r\n\x05means\x18\x07 \x03(\x01\"\'\n\x0bReportBatch\x12\x18\n\x07reports\x18\x01 \x03(\x0b\x32\x07.Reportb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.report_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _REPORT._serialized_start=23
+  _REPORT._serialized_end=3011
+  _REPORT_CPU._serialized_start=539
+  _REPORT_CPU._serialized_end=696
+  _REPORT_GPU._serialized_start=699
+  _REPORT_GPU._serialized_end=887
+  _REPORT_RAM._serialized_start=890
+  _REPORT_RAM._serialized_end=1057
+  _REPORT_DISK._serialized_start=1060
+  _REPORT_DISK._serialized_end=1461
+  _REPORT_BATTERY._serialized_start=1463
+  _REPORT_BATTERY._serialized_end=1531
+  _REPORT_SESSION._serialized_start=1534
+  _REPORT_SESSION._serialized_end=1664
+  _REPORT_INVENTORY._serialized_start=1667
+  _REPORT_INVENTORY._serialized_end=1938
+  _REPORT_PROCESS._serialized_start=1940
+  _REPORT_PROCESS._serialized_end=2031
+  _REPORT_NETWORK._serialized_start=2034
+  _REPORT_NETWORK._serialized_end=2224
+  _REPORT_PRESSURE._serialized_start=2227
+  _REPORT_PRESSURE._serialized_end=2646
+  _REPORT_AGENT._serialized_start=2649
+  _REPORT_AGENT._serialized_end=2890
+  _REPORT_AGGREGATE._serialized_start=2892
+  _REPORT_AGGREGATE._serialized_end=3011
+  _REPORTBATCH._serialized_start=3013
+  _REPORTBATCH._serialized_end=3052
 # @@protoc_insertion_point(module_scope)
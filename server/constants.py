@@ -27,6 +27,19 @@ BROKER_FILE = pathlib.Path('broker_memory.pkl')
 POOL_ID = check_config("POOL", "POOL_ID", 0, int)
 BROKER_PORT = 3030
 COLLECTOR_PORT = 3031
+CONTROL_PORT = 3032
+KEYFRAME_RETRY = 1  # Seconds before asking a Node for another keyframe
+STATS_INTERVAL = check_config("NETWORK", "STATS_INTERVAL", 5, float)  # Seconds between Collector Stats, 0 for none
+
+"""
+Compression. The Broker picks the first of the Node's codecs which is in COMPRESSION (comma separated, empty for none).
+Nodes are given the trained DICTIONARY, see python -m server.net.dictionary to collect samples and train one.
+"""
+COMPRESSION = [codec for codec in check_config("NETWORK", "COMPRESSION", "zstd,lz4", str).split(',') if codec]
+DICTIONARY_FILE = pathlib.Path(check_config("NETWORK", "DICTIONARY", "report.dict", str))
+DICTIONARY_SAMPLES = check_config("NETWORK", "DICTIONARY_SAMPLES", 0, int)  # Messages the Collector saves to train on
+DICTIONARY_SAMPLE_DIR = pathlib.Path(check_config("NETWORK", "DICTIONARY_SAMPLE_DIR", "dictionary_samples", str))
+DICTIONARY_SIZE = check_config("NETWORK", "DICTIONARY_SIZE", 16384, int)  # Bytes
 
 
 """
@@ -50,6 +63,13 @@ A_SESSION_UPTIME_INTERVAL = check_config("ANOMALY", "SESSION_UPTIME_INTERVAL", 6
 A_GPU_MEMORY_PERCENT = check_config("ANOMALY", "GPU_MEMORY_PERCENT", 90, int)  # >= 90% GPU memory utilization
 A_GPU_LOAD = check_config("ANOMALY", "GPU_LOAD", 100, int)  # GPU load 100% saturated
 A_DISK_PERCENT_USED = check_config("ANOMALY", "DISK_PERCENT_USED", 90, int)  # >= 90% disk utilization
+A_DISK_IO_UTILIZATION = check_config("ANOMALY", "DISK_IO_UTILIZATION", 95, int)  # >= 95% of the time busy with I/O
+A_DISK_IO_AWAIT = check_config("ANOMALY", "DISK_IO_AWAIT", 500, int)  # >= 500ms average I/O wait
+A_PRESSURE_CPU = check_config("ANOMALY", "PRESSURE_CPU", 50, int)  # >= 50% some CPU pressure (60s average)
+A_PRESSURE_MEMORY = check_config("ANOMALY", "PRESSURE_MEMORY", 10, int)  # >= 10% full memory pressure (60s average)
+A_PRESSURE_IO = check_config("ANOMALY", "PRESSURE_IO", 25, int)  # >= 25% full I/O pressure (60s average)
+A_CGROUP_THROTTLED = check_config("ANOMALY", "CGROUP_THROTTLED", 25, int)  # >= 25% of the time a cgroup CPU throttled
+A_CGROUP_MEMORY_PERCENT = check_config("ANOMALY", "CGROUP_MEMORY_PERCENT", 90, int)  # >= 90% of a cgroup's memory limit
 
 """
 E-Mail Alerts
@@ -26,7 +26,7 @@ create table `Update`
 	id bigint unsigned auto_increment not null,
 	pool_id int not null,
 	node_id int not null,
-	timestamp datetime not null,
+	timestamp datetime(3) not null,
 	cpu_logical_cores int null,
 	cpu_current_frequency float null,
 	cpu_max_frequency float null,
@@ -68,12 +68,7 @@ create table GPU_Update
 	uuid varchar(50) null,
 	`load` float null,
 	memory_percentage float null,
-	memory_total bigint null,
 	memory_used bigint null,
-	driver_version varchar(50) null,
-	product_identifier varchar(50) null,
-	serial varchar(50) null,
-	display_mode varchar(20) null,
 	constraint GPU_Update_pk
 		primary key (id),
 	constraint GPU_Update_Update__fk
@@ -87,9 +82,6 @@ create table Disk_Update
 	id bigint unsigned auto_increment not null,
 	update_id bigint unsigned not null,
 	partition_id varchar(50) null,
-	mount_point varchar(50) null,
-	fstype varchar(20) null,
-	total_storage bigint null,
 	used_storage bigint null,
 	free_storage bigint null,
 	percentage_used float null,
@@ -101,6 +93,67 @@ create table Disk_Update
 )
 comment 'Disk Component of an Update';
 
+create table Disk_IO_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	device varchar(50) null,
+	read_iops float null,
+	write_iops float null,
+	read_rate float null,
+	write_rate float null,
+	await_ms float null,
+	utilization float null,
+	constraint Disk_IO_Update_pk
+		primary key (id),
+	constraint Disk_IO_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Per Device Disk I/O Rates of an Update, per second';
+
+create table Disk_Inventory
+(
+	id int auto_increment not null,
+	pool_id int not null,
+	node_id int not null,
+	partition_id varchar(50) not null,
+	mount_point varchar(50) null,
+	fstype varchar(20) null,
+	total_storage bigint null,
+	last_seen datetime not null,
+	constraint Disk_Inventory_pk
+		primary key (id),
+	constraint Disk_Inventory_pk_2
+		unique (pool_id, node_id, partition_id),
+	constraint Disk_Inventory_Node__fk
+		foreign key (pool_id, node_id) references Node (pool_id, id)
+			on update cascade on delete cascade
+)
+comment 'Static Disk Attributes of a Node, Disk_Update rows refer to these by partition_id';
+
+create table GPU_Inventory
+(
+	id int auto_increment not null,
+	pool_id int not null,
+	node_id int not null,
+	uuid varchar(50) not null,
+	memory_total bigint null,
+	driver_version varchar(50) null,
+	product_identifier varchar(50) null,
+	serial varchar(50) null,
+	display_mode varchar(20) null,
+	last_seen datetime not null,
+	constraint GPU_Inventory_pk
+		primary key (id),
+	constraint GPU_Inventory_pk_2
+		unique (pool_id, node_id, uuid),
+	constraint GPU_Inventory_Node__fk
+		foreign key (pool_id, node_id) references Node (pool_id, id)
+			on update cascade on delete cascade
+)
+comment 'Static GPU Attributes of a Node, GPU_Update rows refer to these by uuid';
+
 create table Session_Update
 (
 	id bigint unsigned auto_increment not null,
@@ -118,6 +171,149 @@ create table Session_Update
 )
 comment 'Session Component of an Update';
 
+create table Process_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	process_id int null,
+	name varchar(50) null,
+	cpu_percent float null,
+	rss bigint null,
+	constraint Process_Update_pk
+		primary key (id),
+	constraint Process_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Top Processes (by CPU and by RSS) of an Update';
+
+create table Network_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	interface varchar(50) null,
+	rx_bytes float null,
+	rx_packets float null,
+	rx_errors float null,
+	rx_drops float null,
+	tx_bytes float null,
+	tx_packets float null,
+	tx_errors float null,
+	tx_drops float null,
+	speed int null,
+	constraint Network_Update_pk
+		primary key (id),
+	constraint Network_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Network Interface Component of an Update, rates per second';
+
+create table Pressure_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	cpu_some_avg10 float null,
+	cpu_some_avg60 float null,
+	cpu_full_avg10 float null,
+	cpu_full_avg60 float null,
+	memory_some_avg10 float null,
+	memory_some_avg60 float null,
+	memory_full_avg10 float null,
+	memory_full_avg60 float null,
+	io_some_avg10 float null,
+	io_some_avg60 float null,
+	io_full_avg10 float null,
+	io_full_avg60 float null,
+	constraint Pressure_Update_pk
+		primary key (id),
+	constraint Pressure_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Pressure Stall Component of an Update, percent of time stalled';
+
+create table Cgroup_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	cgroup varchar(255) null,
+	cpu_percent float null,
+	throttled_percent float null,
+	memory_current bigint unsigned null,
+	memory_max bigint unsigned null,
+	constraint Cgroup_Update_pk
+		primary key (id),
+	constraint Cgroup_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Configured cgroup Component of an Update, memory_max is 0 if unlimited';
+
+create table Agent_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	cpu_time double null,
+	cpu_percent float null,
+	rss bigint unsigned null,
+	irregular tinyint(1) null,
+	skipped int unsigned null,
+	constraint Agent_Update_pk
+		primary key (id),
+	constraint Agent_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Node module self-telemetry of an Update, cpu_percent is of one core';
+
+create table Agent_Metric_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	metric varchar(50) null,
+	latency float null,
+	constraint Agent_Metric_Update_pk
+		primary key (id),
+	constraint Agent_Metric_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Milliseconds each Metric last took to measure, as of an Update';
+
+create table Agent_Subscriber_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	subscriber varchar(100) null,
+	queued int unsigned null,
+	dropped bigint unsigned null,
+	unsent bigint unsigned null,
+	constraint Agent_Subscriber_Update_pk
+		primary key (id),
+	constraint Agent_Subscriber_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Queue and send counters of each Node Subscriber, as of an Update';
+
+create table Aggregate_Update
+(
+	id bigint unsigned auto_increment not null,
+	update_id bigint unsigned not null,
+	field varchar(150) null,
+	samples int null,
+	minimum double null,
+	maximum double null,
+	mean double null,
+	constraint Aggregate_Update_pk
+		primary key (id),
+	constraint Aggregate_Update_Update__fk
+		foreign key (update_id) references `Update` (id)
+			on update cascade on delete cascade
+)
+comment 'Window Aggregates of an Update from a pre-aggregating Node, the Update holds the last values';
+
 create table Historical_Data
 (
     id int auto_increment not null,
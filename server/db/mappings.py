@@ -4,7 +4,7 @@ https://pypi.org/project/sqlacodegen/
 """
 from sqlalchemy import BigInteger, Column, DateTime, Enum, Float, ForeignKey, ForeignKeyConstraint, Index, Integer, String, text
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.mysql import TINYINT
+from sqlalchemy.dialects.mysql import DATETIME, TINYINT
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -84,7 +84,7 @@ class Update(Base):
     id = Column(Integer, primary_key=True)
     pool_id = Column(Integer, nullable=False)
     node_id = Column(Integer, nullable=False)
-    timestamp = Column(DateTime, nullable=False)
+    timestamp = Column(DATETIME(fsp=3), nullable=False)
     cpu_logical_cores = Column(Integer)
     cpu_current_frequency = Column(Float)
     cpu_max_frequency = Column(Float)
@@ -121,9 +121,6 @@ class DiskUpdate(Base):
     id = Column(Integer, primary_key=True)
     update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
     partition_id = Column(String(50))
-    mount_point = Column(String(50))
-    fstype = Column(String(20))
-    total_storage = Column(BigInteger)
     used_storage = Column(BigInteger)
     free_storage = Column(BigInteger)
     percentage_used = Column(Float)
@@ -131,6 +128,22 @@ class DiskUpdate(Base):
     update = relationship('Update')
 
 
+class DiskIOUpdate(Base):
+    __tablename__ = 'Disk_IO_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    device = Column(String(50))
+    read_iops = Column(Float)
+    write_iops = Column(Float)
+    read_rate = Column(Float)
+    write_rate = Column(Float)
+    await_ms = Column(Float)
+    utilization = Column(Float)
+
+    update = relationship('Update')
+
+
 class GPUUpdate(Base):
     __tablename__ = 'GPU_Update'
 
@@ -139,12 +152,7 @@ class GPUUpdate(Base):
     uuid = Column(String(50))
     load = Column(Float)
     memory_percentage = Column(Float)
-    memory_total = Column(BigInteger)
     memory_used = Column(BigInteger)
-    driver_version = Column(String(50))
-    product_identifier = Column(String(50))
-    serial = Column(String(50))
-    display_mode = Column(String(20))
 
     update = relationship('Update')
 
@@ -161,3 +169,164 @@ class SessionUpdate(Base):
     process_id = Column(Integer)
 
     update = relationship('Update')
+
+
+class ProcessUpdate(Base):
+    __tablename__ = 'Process_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    process_id = Column(Integer)
+    name = Column(String(50))
+    cpu_percent = Column(Float)
+    rss = Column(BigInteger)
+
+    update = relationship('Update')
+
+
+class NetworkUpdate(Base):
+    __tablename__ = 'Network_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    interface = Column(String(50))
+    rx_bytes = Column(Float)
+    rx_packets = Column(Float)
+    rx_errors = Column(Float)
+    rx_drops = Column(Float)
+    tx_bytes = Column(Float)
+    tx_packets = Column(Float)
+    tx_errors = Column(Float)
+    tx_drops = Column(Float)
+    speed = Column(Integer)
+
+    update = relationship('Update')
+
+
+class PressureUpdate(Base):
+    __tablename__ = 'Pressure_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    cpu_some_avg10 = Column(Float)
+    cpu_some_avg60 = Column(Float)
+    cpu_full_avg10 = Column(Float)
+    cpu_full_avg60 = Column(Float)
+    memory_some_avg10 = Column(Float)
+    memory_some_avg60 = Column(Float)
+    memory_full_avg10 = Column(Float)
+    memory_full_avg60 = Column(Float)
+    io_some_avg10 = Column(Float)
+    io_some_avg60 = Column(Float)
+    io_full_avg10 = Column(Float)
+    io_full_avg60 = Column(Float)
+
+    update = relationship('Update')
+
+
+class CgroupUpdate(Base):
+    __tablename__ = 'Cgroup_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    cgroup = Column(String(255))
+    cpu_percent = Column(Float)
+    throttled_percent = Column(Float)
+    memory_current = Column(BigInteger)
+    memory_max = Column(BigInteger)
+
+    update = relationship('Update')
+
+
+class AgentUpdate(Base):
+    __tablename__ = 'Agent_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    cpu_time = Column(Float)
+    cpu_percent = Column(Float)
+    rss = Column(BigInteger)
+    irregular = Column(TINYINT(1))
+    skipped = Column(Integer)
+
+    update = relationship('Update')
+
+
+class AgentMetricUpdate(Base):
+    __tablename__ = 'Agent_Metric_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    metric = Column(String(50))
+    latency = Column(Float)
+
+    update = relationship('Update')
+
+
+class AgentSubscriberUpdate(Base):
+    __tablename__ = 'Agent_Subscriber_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    subscriber = Column(String(100))
+    queued = Column(Integer)
+    dropped = Column(BigInteger)
+    unsent = Column(BigInteger)
+
+    update = relationship('Update')
+
+
+class AggregateUpdate(Base):
+    __tablename__ = 'Aggregate_Update'
+
+    id = Column(Integer, primary_key=True)
+    update_id = Column(ForeignKey('Update.id', ondelete='CASCADE', onupdate='CASCADE'), nullable=False, index=True)
+    field = Column(String(150))
+    samples = Column(Integer)
+    minimum = Column(Float)
+    maximum = Column(Float)
+    mean = Column(Float)
+
+    update = relationship('Update')
+
+
+class DiskInventory(Base):
+    __tablename__ = 'Disk_Inventory'
+    __table_args__ = (
+        ForeignKeyConstraint(['pool_id', 'node_id'], ['Node.pool_id', 'Node.id'], ondelete='CASCADE', onupdate='CASCADE'),
+        Index('Disk_Inventory_Node__fk', 'pool_id', 'node_id'),
+        Index('Disk_Inventory_pk_2', 'pool_id', 'node_id', 'partition_id', unique=True)
+    )
+
+    id = Column(Integer, primary_key=True)
+    pool_id = Column(Integer, nullable=False)
+    node_id = Column(Integer, nullable=False)
+    partition_id = Column(String(50), nullable=False)
+    mount_point = Column(String(50))
+    fstype = Column(String(20))
+    total_storage = Column(BigInteger)
+    last_seen = Column(DateTime, nullable=False)
+
+    node = relationship('Node')
+
+
+class GPUInventory(Base):
+    __tablename__ = 'GPU_Inventory'
+    __table_args__ = (
+        ForeignKeyConstraint(['pool_id', 'node_id'], ['Node.pool_id', 'Node.id'], ondelete='CASCADE', onupdate='CASCADE'),
+        Index('GPU_Inventory_Node__fk', 'pool_id', 'node_id'),
+        Index('GPU_Inventory_pk_2', 'pool_id', 'node_id', 'uuid', unique=True)
+    )
+
+    id = Column(Integer, primary_key=True)
+    pool_id = Column(Integer, nullable=False)
+    node_id = Column(Integer, nullable=False)
+    uuid = Column(String(50), nullable=False)
+    memory_total = Column(BigInteger)
+    driver_version = Column(String(50))
+    product_identifier = Column(String(50))
+    serial = Column(String(50))
+    display_mode = Column(String(20))
+    last_seen = Column(DateTime, nullable=False)
+
+    node = relationship('Node')
@@ -4,11 +4,19 @@ Leverages SQLAlchemy to abstract into ORM.
 """
 
 from server.processor import Processor
+from server.util import update_time
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
 import datetime
 
-from server.db.mappings import Node, Update, SessionUpdate, DiskUpdate, GPUUpdate
+from server.db.mappings import Node, Update, SessionUpdate, DiskUpdate, DiskIOUpdate, GPUUpdate, DiskInventory, GPUInventory, \
+    ProcessUpdate, NetworkUpdate, PressureUpdate, CgroupUpdate, AgentUpdate, AgentMetricUpdate, AgentSubscriberUpdate, \
+    AggregateUpdate
+
+# Pressure_Update columns, named as in Report.Pressure
+PRESSURE_FIELDS = ('cpu_some_avg10', 'cpu_some_avg60', 'cpu_full_avg10', 'cpu_full_avg60',
+                   'memory_some_avg10', 'memory_some_avg60', 'memory_full_avg10', 'memory_full_avg60',
+                   'io_some_avg10', 'io_some_avg60', 'io_full_avg10', 'io_full_avg60')
 
 
 class MySQLProcessor(Processor):
@@ -31,11 +39,28 @@ class MySQLProcessor(Processor):
         return f"mysql://{self.user}@{self.host}:{self.port}/{self.dbname}"
 
     def update(self, pool_id: int, node_id: int, update: dict) -> None:
+        self._add(pool_id, node_id, update)
+        self.session.commit()
+
+    def update_batch(self, pool_id: int, node_id: int, updates: list) -> None:
+        for update in updates:
+            self._add(pool_id, node_id, update)
+        self.session.commit()  # One transaction for the whole batch
+
+    def _add(self, pool_id: int, node_id: int, update: dict) -> None:
+        """
+        Adds an update and its Disk, Disk I/O, GPU, Session, Process, Network and Aggregate rows to the session,
+        without committing.
+        :param pool_id:
+        :param node_id:
+        :param update: dict update
+        :return: None
+        """
         node = self.session.get(Node, {'pool_id': pool_id, 'id': node_id})
         pool = node.pool
 
         db_update = Update(pool_id=pool.id, node_id=node.id,
-                           timestamp=datetime.datetime.fromtimestamp(update['time_stamp']))
+                           timestamp=update_time(update))
 
         db_update.cpu_logical_cores = update['cpu']['logical_cores']
         db_update.cpu_current_frequency = update['cpu']['current_freq']
@@ -46,8 +71,8 @@ class MySQLProcessor(Processor):
         db_update.cpu_load_15 = update['cpu']['load_15']
 
         db_update.ram_total_virtual = update['ram']['virt_total']
-        db_update.ram_used_virtual = update['ram']['virt_available']
-        db_update.ram_available_virtual = update['ram']['virt_used']
+        db_update.ram_used_virtual = update['ram']['virt_used']
+        db_update.ram_available_virtual = update['ram']['virt_available']
         db_update.ram_free_virtual = update['ram']['virt_free']
         db_update.ram_total_swap = update['ram']['swap_total']
         db_update.ram_used_swap = update['ram']['swap_used']
@@ -69,7 +94,7 @@ class MySQLProcessor(Processor):
         db_update.session_boot_time = datetime.datetime.fromtimestamp(update['session']['boot_time'])
 
         self.session.add(db_update)
-        self.session.commit()
+        self.session.flush()  # Assigns db_update.id
 
         n_gpus = len(update['gpu']['uuids'])
         for i in range(n_gpus):
@@ -77,26 +102,30 @@ class MySQLProcessor(Processor):
             gpu_update.uuid = update['gpu']['uuids'][i]
             gpu_update.load = update['gpu']['loads'][i]
             gpu_update.memory_percentage = update['gpu']['mem_percents'][i]
-            gpu_update.memory_total = update['gpu']['mem_totals'][i]
             gpu_update.memory_used = update['gpu']['mem_useds'][i]
-            gpu_update.driver_version = update['gpu']['drivers'][i]
-            gpu_update.product_identifier = update['gpu']['products'][i]
-            gpu_update.serial = update['gpu']['serials'][i]
-            gpu_update.display_mode = update['gpu']['display_modes'][i]
             self.session.add(gpu_update)
 
         n_disks = len(update['disk']['partition_ids'])
         for i in range(n_disks):
             disk_update = DiskUpdate(update_id=db_update.id)
             disk_update.partition_id = update['disk']['partition_ids'][i]
-            disk_update.mount_point = update['disk']['mount_points'][i]
-            disk_update.fstype = update['disk']['fstypes'][i]
-            disk_update.total_storage = update['disk']['totals'][i]
             disk_update.used_storage = update['disk']['useds'][i]
             disk_update.free_storage = update['disk']['frees'][i]
             disk_update.percentage_used = update['disk']['percents'][i]
             self.session.add(disk_update)
 
+        n_devices = len(update['disk'].get('devices', []))
+        for i in range(n_devices):
+            io_update = DiskIOUpdate(update_id=db_update.id)
+            io_update.device = update['disk']['devices'][i]
+            io_update.read_iops = update['disk']['read_iops'][i]
+            io_update.write_iops = update['disk']['write_iops'][i]
+            io_update.read_rate = update['disk']['read_rates'][i]
+            io_update.write_rate = update['disk']['write_rates'][i]
+            io_update.await_ms = update['disk']['awaits'][i]
+            io_update.utilization = update['disk']['utilizations'][i]
+            self.session.add(io_update)
+
         n_sessions = len(update['session']['users'])
         for i in range(n_sessions):
             session_update = SessionUpdate(update_id=db_update.id)
@@ -107,4 +136,107 @@ class MySQLProcessor(Processor):
             session_update.process_id = update['session']['pids'][i]
             self.session.add(session_update)
 
+        process = update.get('process')
+        if process is not None:
+            for i in range(len(process['pids'])):
+                process_update = ProcessUpdate(update_id=db_update.id)
+                process_update.process_id = process['pids'][i]
+                process_update.name = process['names'][i][:50]
+                process_update.cpu_percent = process['cpu_percents'][i]
+                process_update.rss = process['rsss'][i]
+                self.session.add(process_update)
+
+        network = update.get('network')
+        if network is not None:
+            for i in range(len(network['names'])):
+                network_update = NetworkUpdate(update_id=db_update.id)
+                network_update.interface = network['names'][i]
+                network_update.rx_bytes = network['rx_bytes'][i]
+                network_update.rx_packets = network['rx_packets'][i]
+                network_update.rx_errors = network['rx_errors'][i]
+                network_update.rx_drops = network['rx_drops'][i]
+                network_update.tx_bytes = network['tx_bytes'][i]
+                network_update.tx_packets = network['tx_packets'][i]
+                network_update.tx_errors = network['tx_errors'][i]
+                network_update.tx_drops = network['tx_drops'][i]
+                network_update.speed = network['speeds'][i]
+                self.session.add(network_update)
+
+        pressure = update.get('pressure')
+        if pressure is not None:
+            # Nodes without pressure stall information send all zeros, which aren't worth a row
+            if any(pressure[field] for field in PRESSURE_FIELDS):
+                pressure_update = PressureUpdate(update_id=db_update.id)
+                for field in PRESSURE_FIELDS:
+                    setattr(pressure_update, field, pressure[field])
+                self.session.add(pressure_update)
+            for i in range(len(pressure['cgroups'])):
+                cgroup_update = CgroupUpdate(update_id=db_update.id)
+                cgroup_update.cgroup = pressure['cgroups'][i]
+                cgroup_update.cpu_percent = pressure['cpu_percents'][i]
+                cgroup_update.throttled_percent = pressure['throttled_percents'][i]
+                cgroup_update.memory_current = pressure['memory_currents'][i]
+                cgroup_update.memory_max = pressure['memory_maxs'][i]
+                self.session.add(cgroup_update)
+
+        agent = update.get('agent')
+        # Older Nodes send no agent section, which unpacks as all zeros
+        if agent is not None and agent['rss']:
+            agent_update = AgentUpdate(update_id=db_update.id)
+            agent_update.cpu_time = agent['cpu_time']
+            agent_update.cpu_percent = agent['cpu_percent']
+            agent_update.rss = agent['rss']
+            agent_update.irregular = agent['irregular']
+            agent_update.skipped = agent['skipped']
+            self.session.add(agent_update)
+            for i in range(len(agent['metrics'])):
+                metric_update = AgentMetricUpdate(update_id=db_update.id)
+                metric_update.metric = agent['metrics'][i]
+                metric_update.latency = agent['metric_latencies'][i]
+                self.session.add(metric_update)
+            for i in range(len(agent['subscribers'])):
+                subscriber_update = AgentSubscriberUpdate(update_id=db_update.id)
+                subscriber_update.subscriber = agent['subscribers'][i]
+                subscriber_update.queued = agent['subscriber_queued'][i]
+                subscriber_update.dropped = agent['subscriber_dropped'][i]
+                subscriber_update.unsent = agent['subscriber_unsent'][i]
+                self.session.add(subscriber_update)
+
+        aggregate = update.get('aggregate')
+        if aggregate is not None:
+            for i in range(len(aggregate['fields'])):
+                aggregate_update = AggregateUpdate(update_id=db_update.id)
+                aggregate_update.field = aggregate['fields'][i]
+                aggregate_update.samples = aggregate['counts'][i]
+                aggregate_update.minimum = aggregate['mins'][i]
+                aggregate_update.maximum = aggregate['maxs'][i]
+                aggregate_update.mean = aggregate['means'][i]
+                self.session.add(aggregate_update)
+
+    def update_inventory(self, pool_id: int, node_id: int, inventory: dict) -> None:
+        now = datetime.datetime.now()
+        for part in inventory['partitions']:
+            disk = self.session.query(DiskInventory).filter_by(pool_id=pool_id, node_id=node_id,
+                                                               partition_id=part['partition_id']).one_or_none()
+            if disk is None:
+                disk = DiskInventory(pool_id=pool_id, node_id=node_id, partition_id=part['partition_id'])
+                self.session.add(disk)
+            disk.mount_point = part['mount_point']
+            disk.fstype = part['fstype']
+            disk.total_storage = part['total']
+            disk.last_seen = now
+
+        for gpu in inventory['gpus']:
+            gpu_inventory = self.session.query(GPUInventory).filter_by(pool_id=pool_id, node_id=node_id,
+                                                                       uuid=gpu['uuid']).one_or_none()
+            if gpu_inventory is None:
+                gpu_inventory = GPUInventory(pool_id=pool_id, node_id=node_id, uuid=gpu['uuid'])
+                self.session.add(gpu_inventory)
+            gpu_inventory.memory_total = gpu['mem_total']
+            gpu_inventory.driver_version = gpu['driver']
+            gpu_inventory.product_identifier = gpu['product']
+            gpu_inventory.serial = gpu['serial']
+            gpu_inventory.display_mode = gpu['display_mode']
+            gpu_inventory.last_seen = now
+
         self.session.commit()
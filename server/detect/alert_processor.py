@@ -0,0 +1,98 @@
+"""
+Defines a Processor which records Node alerts as anomalies the moment they arrive.
+The Collector fast-paths Alerts here, rather than leaving them for the detector's next poll of the database.
+Alerts are recorded, and emailed, on threads of their own, so neither the database nor the mail API holds up the
+Collector's receiving.
+"""
+import queue
+import threading
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from server.processor import Processor
+from server.detect import anomaly_service
+import server.constants as const
+import server.mail.api as mail
+
+
+class AlertProcessor(Processor):
+    """
+    Records Alerts in the AnomalyRecord table. Updates are left to the database Processor.
+    """
+
+    def __init__(self, host, port, user, password, dbname, verbose=False, queue_size: int = 1000):
+        """
+        :param queue_size: most Alerts (and emails) waiting, beyond which they're dropped and left to the detector
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.user = user
+        self.dbname = dbname
+        self.engine = sa.create_engine(f"mysql://{user}:{password}@{host}:{port}/{dbname}", echo=verbose)
+        self.session = Session(self.engine)  # Only used on the recording thread
+        self._alerts = queue.Queue(queue_size)  # (pool_id, node_id, alert)
+        self._mail = queue.Queue(queue_size)  # (subject, body)
+        self.dropped = 0  # Alerts not recorded because too many were waiting
+        threading.Thread(target=self._record, name="alerts", daemon=True).start()
+        threading.Thread(target=self._send, name="alert-mail", daemon=True).start()
+
+    def processor_name(self) -> str:
+        return f"alerts:mysql://{self.user}@{self.host}:{self.port}/{self.dbname}"
+
+    def update(self, pool_id: int, node_id: int, update: dict) -> None:
+        pass
+
+    def alert(self, pool_id: int, node_id: int, alert: dict) -> None:
+        """
+        Queues an Alert to be recorded, without waiting.
+        An Alert which doesn't fit is dropped, the detector still finds its anomalies in the Node's updates.
+        """
+        try:
+            self._alerts.put_nowait((pool_id, node_id, alert))
+        except queue.Full:
+            self.dropped += 1
+            print(f"Alert from {pool_id}:{node_id} dropped, {self._alerts.maxsize} waiting to be recorded.")
+
+    def _record(self) -> None:
+        """
+        Records the Alerts waiting, all in one commit, then queues emails for the new anomalies.
+        :return: None
+        """
+        while True:
+            alerts = [self._alerts.get()]
+            while True:
+                try:
+                    alerts.append(self._alerts.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                anomalies = []
+                for pool_id, node_id, alert in alerts:
+                    anomalies.extend(anomaly_service.record_alert(self.session, pool_id, node_id, alert))
+                messages = [(f"Node {anomaly.node_id} {anomaly.type.upper()} Anomaly Detected",
+                             mail.make_new_alert_message(anomaly.time, anomaly.type, anomaly.message,
+                                                         anomaly.severity, anomaly.node_id))
+                            for anomaly in anomalies]  # Before committing expires them
+                self.session.commit()
+            except Exception as e:
+                print(f"Unable to record {len(alerts)} alerts: {e}")
+                self.session.rollback()
+                continue
+            if not const.EMAIL_NEW:
+                continue
+            for message in messages:
+                try:
+                    self._mail.put_nowait(message)
+                except queue.Full:
+                    print(f"Email dropped, {self._mail.maxsize} waiting to be sent: {message[0]}")
+
+    def _send(self) -> None:
+        """
+        Sends queued emails one at a time.
+        :return: None
+        """
+        while True:
+            subject, body = self._mail.get()
+            mail.send_to_sysadmin(subject, body)
@@ -21,7 +21,8 @@ import pandas as pd
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from server.db.mappings import Node, Pool, Update, DiskUpdate, GPUUpdate, AnomalyRecord
+from server.db.mappings import Node, Pool, Update, DiskUpdate, DiskIOUpdate, PressureUpdate, CgroupUpdate, GPUUpdate, \
+    AnomalyRecord
 import server.constants as const
 import server.mail.api as mail
 
@@ -79,6 +80,18 @@ def detect(session: Session, last_run: datetime.datetime, pool: int):
         gpu_query = session.query(GPUUpdate, Update).join(Update).filter(
                 and_(GPUUpdate.update.has(node_id=node.id), GPUUpdate.update.has(Update.timestamp >= last_run)))
         gpu_updates = pd.read_sql(gpu_query.statement, gpu_query.session.bind)
+        # Disk I/O Updates
+        io_query = session.query(DiskIOUpdate, Update).join(Update).filter(
+                and_(DiskIOUpdate.update.has(node_id=node.id), DiskIOUpdate.update.has(Update.timestamp >= last_run)))
+        io_updates = pd.read_sql(io_query.statement, io_query.session.bind)
+        # Pressure and cgroup Updates
+        pressure_query = session.query(PressureUpdate, Update).join(Update).filter(
+                and_(PressureUpdate.update.has(node_id=node.id),
+                     PressureUpdate.update.has(Update.timestamp >= last_run)))
+        pressure_updates = pd.read_sql(pressure_query.statement, pressure_query.session.bind)
+        cgroup_query = session.query(CgroupUpdate, Update).join(Update).filter(
+                and_(CgroupUpdate.update.has(node_id=node.id), CgroupUpdate.update.has(Update.timestamp >= last_run)))
+        cgroup_updates = pd.read_sql(cgroup_query.statement, cgroup_query.session.bind)
         # Outstanding Anomalies
         anomaly_query = session.query(AnomalyRecord).filter(
                 and_(AnomalyRecord.node_id == node.id, AnomalyRecord.resolved == False))
@@ -135,6 +148,52 @@ def detect(session: Session, last_run: datetime.datetime, pool: int):
                                       severity='high')
                 )
                 in_interval.append(f'disk_percent_{row["partition_id"]}')
+        for index, row in io_updates.iterrows():
+            if (row['utilization'] >= const.A_DISK_IO_UTILIZATION or row['await_ms'] >= const.A_DISK_IO_AWAIT) \
+                    and f'disk_io_{row["device"]}' not in in_interval:
+                node_anomalies.append(
+                        AnomalyRecord(node_id=node.id, pool_id=pool.id, type='disk', time=row['timestamp'],
+                                      resolved=False,
+                                      message=f'Disk {row["device"]} I/O saturated.',
+                                      severity='medium')
+                )
+                in_interval.append(f'disk_io_{row["device"]}')
+        for index, row in pressure_updates.iterrows():
+            if row['cpu_some_avg60'] >= const.A_PRESSURE_CPU and 'pressure_cpu' not in in_interval:
+                node_anomalies.append(AnomalyRecord(node_id=node.id, pool_id=pool.id, type='cpu', time=row['timestamp'],
+                                                    resolved=False, message=f'CPU pressure over threshold.',
+                                                    severity='medium'))
+                in_interval.append('pressure_cpu')
+            if row['memory_full_avg60'] >= const.A_PRESSURE_MEMORY and 'pressure_memory' not in in_interval:
+                node_anomalies.append(AnomalyRecord(node_id=node.id, pool_id=pool.id, type='ram', time=row['timestamp'],
+                                                    resolved=False, message=f'Memory pressure over threshold.',
+                                                    severity='medium'))
+                in_interval.append('pressure_memory')
+            if row['io_full_avg60'] >= const.A_PRESSURE_IO and 'pressure_io' not in in_interval:
+                node_anomalies.append(
+                        AnomalyRecord(node_id=node.id, pool_id=pool.id, type='disk', time=row['timestamp'],
+                                      resolved=False, message=f'I/O pressure over threshold.',
+                                      severity='medium'))
+                in_interval.append('pressure_io')
+        for index, row in cgroup_updates.iterrows():
+            if row['throttled_percent'] >= const.A_CGROUP_THROTTLED \
+                    and f'cgroup_throttled_{row["cgroup"]}' not in in_interval:
+                node_anomalies.append(
+                        AnomalyRecord(node_id=node.id, pool_id=pool.id, type='cpu', time=row['timestamp'],
+                                      resolved=False,
+                                      message=f'cgroup {row["cgroup"]} CPU throttled over threshold.',
+                                      severity='medium')
+                )
+                in_interval.append(f'cgroup_throttled_{row["cgroup"]}')
+            if row['memory_max'] and row['memory_current'] / row['memory_max'] * 100 >= const.A_CGROUP_MEMORY_PERCENT \
+                    and f'cgroup_memory_{row["cgroup"]}' not in in_interval:
+                node_anomalies.append(
+                        AnomalyRecord(node_id=node.id, pool_id=pool.id, type='ram', time=row['timestamp'],
+                                      resolved=False,
+                                      message=f'cgroup {row["cgroup"]} memory usage near its limit.',
+                                      severity='high')
+                )
+                in_interval.append(f'cgroup_memory_{row["cgroup"]}')
         for index, row in gpu_updates.iterrows():
             if row[
                 'memory_percentage'] * 100 >= const.A_GPU_MEMORY_PERCENT and f'gpu_mem_{row["uuid"]}' not in in_interval:
@@ -210,6 +269,35 @@ def detect(session: Session, last_run: datetime.datetime, pool: int):
     session.commit()
 
 
+def record_alert(session: Session, pool_id: int, node_id: int, alert: dict) -> list:
+    """
+    Records the anomalies a Node alerted as soon as it crossed their thresholds, ahead of the next detection cycle.
+    Breaches describe anomalies the way detect() does, so one already outstanding isn't recorded again, and detect()
+    finds an alerted anomaly outstanding (and later resolves it) as usual.
+    Nothing is committed or emailed, so the caller can record several alerts at once, away from the Collector's thread.
+    :param session:
+    :param pool_id:
+    :param node_id:
+    :param alert: dict of time_ms and breaches, each a dict of type, message, severity, value and threshold
+    :return: list of new AnomalyRecords, added to the session
+    """
+    alert_time = datetime.datetime.fromtimestamp(alert['time_ms'] / 1000)
+    new = []
+    for breach in alert['breaches']:
+        outstanding = session.query(AnomalyRecord).filter(
+                and_(AnomalyRecord.pool_id == pool_id, AnomalyRecord.node_id == node_id,
+                     AnomalyRecord.resolved == False, AnomalyRecord.type == breach['type'],
+                     AnomalyRecord.message == breach['message'])).first()
+        if outstanding is not None:
+            continue
+        anomaly = AnomalyRecord(node_id=node_id, pool_id=pool_id, type=breach['type'], time=alert_time, resolved=False,
+                                message=breach['message'], severity=breach['severity'])
+        session.add(anomaly)
+        new.append(anomaly)
+    print(f"Alert from {pool_id}:{node_id} recorded {len(new)} new anomalies.")
+    return new
+
+
 def main():
     session = setup(const.DB_URL, const.DB_PORT, const.DB_USER, const.DB_PASSWORD, const.DB_SCHEMA)
     last_run = datetime.datetime.now()
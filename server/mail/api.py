@@ -5,21 +5,28 @@ Handles mail API
 import requests
 import server.constants as const
 
+TIMEOUT = 10  # Seconds to wait for the mail API
+
 
 def send_to_sysadmin(subject: str, body: str) -> bool:
     """
     Sends an email to the configured sysadmin email.
     :param subject: Subject of email
     :param body: Contents of email
-    :return:
+    :return: bool whether the mail API accepted it
     """
-    response = requests.post(
-            f"https://api.mailgun.net/v3/{const.EMAIL_DOMAIN}/messages",
-            auth=("api", f"{const.EMAIL_API_KEY}"),
-            data={"from":    f"Shepherd Alert <shepherd@{const.EMAIL_DOMAIN}>",
-                  "to":      [f"{const.EMAIL_RECIPIENT}", ],
-                  "subject": f"{subject}",
-                  "html":    f"{body}"})
+    try:
+        response = requests.post(
+                f"https://api.mailgun.net/v3/{const.EMAIL_DOMAIN}/messages",
+                auth=("api", f"{const.EMAIL_API_KEY}"),
+                data={"from":    f"Shepherd Alert <shepherd@{const.EMAIL_DOMAIN}>",
+                      "to":      [f"{const.EMAIL_RECIPIENT}", ],
+                      "subject": f"{subject}",
+                      "html":    f"{body}"},
+                timeout=TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Unable to send email: {e}")
+        return False
     return 200 <= response.status_code < 300
 
 
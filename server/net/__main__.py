@@ -5,6 +5,7 @@ from server.net.broker import Broker
 from server.net.collector import Collector
 from server.processor import ConsoleProcessor
 from server.db.mysql_processor import MySQLProcessor
+from server.detect.alert_processor import AlertProcessor
 
 import server.constants as const
 
@@ -15,6 +16,7 @@ def main():
     collector.add_processor(ConsoleProcessor())
     # collector.add_processor(DashProcessor())
     collector.add_processor(MySQLProcessor(const.DB_URL, const.DB_PORT, const.DB_USER, const.DB_PASSWORD, const.DB_SCHEMA))
+    collector.add_processor(AlertProcessor(const.DB_URL, const.DB_PORT, const.DB_USER, const.DB_PASSWORD, const.DB_SCHEMA))
 
 
 if __name__ == '__main__':
@@ -9,6 +9,8 @@ import server.constants as const
 import threading
 import pickle
 from proto.negotiation_pb2 import Negotiation
+import proto.codec as codec
+import server.net.dictionary as dictionary
 from server.db.mappings import Pool, Node
 
 
@@ -40,6 +42,8 @@ class Broker:
             self.session.add(self.pool)
             self.session.commit()
 
+        self.dictionary = dictionary.load()
+
         self.work_thread = threading.Thread(target=self._work)
         self.work_thread.start()
 
@@ -62,6 +66,9 @@ class Broker:
                     response.node_id = negotiation.node_id
                     response.pool_id = negotiation.pool_id
                     response.collector_port = const.COLLECTOR_PORT
+                    response.control_port = const.CONTROL_PORT
+                    self._choose_codec(negotiation, response)
+                    Broker._set_thresholds(response)
                 else:
                     response.server_approve = False
             else:
@@ -73,8 +80,52 @@ class Broker:
                 response.pool_id = self.pool_id
                 response.node_id = node_id
                 response.collector_port = const.COLLECTOR_PORT
+                response.control_port = const.CONTROL_PORT
+                self._choose_codec(negotiation, response)
+                Broker._set_thresholds(response)
             self.socket.send(response.SerializeToString())
 
+    def _choose_codec(self, negotiation, response) -> None:
+        """
+        Picks the first codec the Node offers which is allowed and installed here.
+        Nodes which offer none (including older Nodes) send uncompressed.
+        :param negotiation: Negotiation from the Node
+        :param response: Negotiation to send back
+        :return: None
+        """
+        usable = set(const.COMPRESSION) & set(codec.available())
+        for name in negotiation.codecs:
+            if name in usable:
+                response.codec = name
+                response.dictionary = self.dictionary
+                return
+
+    @staticmethod
+    def _set_thresholds(response) -> None:
+        """
+        Gives the Node the ANOMALY thresholds to evaluate itself, so it can alert as soon as one is crossed.
+        Older Nodes ignore them.
+        :param response: Negotiation to send back
+        :return: None
+        """
+        thresholds = response.thresholds
+        thresholds.cpu_load_5 = const.A_CPU_LOAD_5
+        thresholds.cpu_load_15 = const.A_CPU_LOAD_15
+        thresholds.ram_virt_percent = const.A_RAM_VIRT_PERCENT
+        thresholds.ram_swap_percent = const.A_RAM_SWAP_PERCENT
+        thresholds.battery_avail = const.A_BATTERY_AVAIL
+        thresholds.session_uptime = const.A_SESSION_UPTIME_INTERVAL
+        thresholds.gpu_memory_percent = const.A_GPU_MEMORY_PERCENT
+        thresholds.gpu_load = const.A_GPU_LOAD
+        thresholds.disk_percent_used = const.A_DISK_PERCENT_USED
+        thresholds.disk_io_utilization = const.A_DISK_IO_UTILIZATION
+        thresholds.disk_io_await = const.A_DISK_IO_AWAIT
+        thresholds.pressure_cpu = const.A_PRESSURE_CPU
+        thresholds.pressure_memory = const.A_PRESSURE_MEMORY
+        thresholds.pressure_io = const.A_PRESSURE_IO
+        thresholds.cgroup_throttled = const.A_CGROUP_THROTTLED
+        thresholds.cgroup_memory_percent = const.A_CGROUP_MEMORY_PERCENT
+
     @staticmethod
     def generate_new_id():
         """
@@ -3,13 +3,19 @@ Manages the post-negotiation portion of node communications.
 After assignment of a Node and Pool ID, ALL nodes report to this class, publishing updates.
 ZMQ handles the connects/disconnects/fair queueing.
 """
+import time
 import timeit
 
 import zmq
 import threading
 import proto.report_pb2 as proto_report
+from proto.alert_pb2 import Alert
+import proto.frame as frame
+import proto.codec as codec
+import server.net.dictionary as dictionary
+from proto.control_pb2 import Control, Stats
 import server.constants as const
-from server.util import MessageToDict
+from server.util import MessageToDict, apply_delta
 
 from server.processor import Processor
 
@@ -23,28 +29,347 @@ class Collector:
         self.run = True
         self.port = const.COLLECTOR_PORT
         self._processors = []
+        self._inventories = {}  # (pool_id, node_id) -> {'partitions': {index: dict}, 'gpus': {index: dict}}
+        self._states = {}  # (pool_id, node_id) -> last full Report, deltas are applied onto it
+        self._sequences = {}  # (pool_id, node_id) -> sequence of the last Report applied
+        self._keyframe_requests = {}  # (pool_id, node_id) -> time.monotonic() a keyframe was last requested
+        self._received = {}  # (pool_id, node_id) -> sequence of the last Report received, to count missed Reports
+        self._stats = Stats()  # Counted since the last published
+        self._stats_time = time.monotonic()
+        self._busy = 0.0  # Seconds spent handling messages since the Stats were last published
+        self._lag_ms = 0  # Total lag of the Reports counted since, and the number of them
+        self._lagged = 0
+        shared_dictionary = dictionary.load()
+        self._codecs = {name.encode(): codec.Codec(name, shared_dictionary) for name in codec.available()}
+        self._samples = dictionary.sample_count()  # Messages saved for dictionary training
         context = zmq.Context()
         self.socket = context.socket(zmq.SUB)
         self.socket.bind(f"tcp://*:{self.port}")
         self.socket.setsockopt(zmq.SUBSCRIBE, b'')
+        self.control = context.socket(zmq.PUB)
+        self.control.bind(f"tcp://*:{const.CONTROL_PORT}")
         self.work_thread = threading.Thread(target=self._work)
         self.work_thread.start()
 
     def _work(self):
         while self.run:
-            message = self.socket.recv()
+            if self.socket.poll(1000):
+                start = timeit.default_timer()
+                self._handle(self.socket.recv_multipart())
+                self._busy += timeit.default_timer() - start
+            self._publish_stats()
+
+    def _handle(self, parts: list):
+        """
+        Decodes a received message and passes it on.
+        :param parts: list of bytes frames as received
+        :return: None
+        """
+        self._stats.messages += 1
+        try:
+            kind, message = self._unframe(parts)
+        except ValueError as e:
+            print(f"Dropping message: {e}")
+            self._stats.rejected += 1
+            return
+        if self._samples < const.DICTIONARY_SAMPLES:
+            dictionary.save_sample(self._samples, message)
+            self._samples += 1
+
+        if kind == frame.ALERT:
+            alert = Alert()
+            alert.ParseFromString(message)
+            self._alert(alert)
+        elif kind == frame.REPORT:
             report = proto_report.Report()
             report.ParseFromString(message)
+            self._receive([report])
+        elif kind == frame.BATCH:
+            batch = proto_report.ReportBatch()
+            batch.ParseFromString(message)
+            self._receive(batch.reports)
+        elif kind == frame.SPOOLED:
+            batch = proto_report.ReportBatch()
+            batch.ParseFromString(message)
+            self._receive(batch.reports, spooled=True)
+        else:
+            print(f"Ignoring unknown frame kind {kind}.")
+
+    def _publish_stats(self):
+        """
+        Publishes the Stats every STATS_INTERVAL seconds, for load tests and monitoring, then starts them over.
+        :return: None
+        """
+        now = time.monotonic()
+        seconds = now - self._stats_time
+        if const.STATS_INTERVAL <= 0 or seconds < const.STATS_INTERVAL:
+            return
+        stats = self._stats
+        stats.time_ms = time.time_ns() // 1000000
+        stats.seconds = seconds
+        stats.busy_percent = self._busy / seconds * 100
+        stats.lag_mean_ms = self._lag_ms / self._lagged if self._lagged else 0
+        stats.nodes = len(self._received)
+        self.control.send_multipart([b'stats:', stats.SerializeToString()])
+        self._stats = Stats()
+        self._stats_time = now
+        self._busy = 0.0
+        self._lag_ms = 0
+        self._lagged = 0
+
+    def _unframe(self, parts: list) -> tuple:
+        """
+        Splits a multipart message into its kind and decompressed message.
+        :param parts: list of bytes frames as received
+        :return: (kind, serialized message)
+        :raises: ValueError if the message is compressed with an unknown codec or can't be decompressed
+        """
+        if len(parts) == 1:  # Unframed Report
+            return frame.REPORT, parts[0]
+        if len(parts) == 2:
+            return parts[0], parts[1]
+        kind, name, message = parts[0], parts[1], parts[2]
+        if name not in self._codecs:
+            raise ValueError(f"unknown codec {name}")
+        return kind, self._codecs[name].decompress(message)
+
+    def _receive(self, reports, spooled: bool = False):
+        """
+        Reconstructs Reports into full updates, and passes them to every Processor.
+        Consecutive Reports from the same Node are passed together.
+        :param reports: list of Reports as received, full or delta, oldest first
+        :param spooled: Reports were held by the Node while the Collector was unreachable
+        :return: None
+        """
+        key = None
+        updates = []
+        self._count(reports, spooled)
+        for report in reports:
+            if (report.pool_id, report.node_id) != key:
+                self._process(key, updates)
+                key = (report.pool_id, report.node_id)
+                updates = []
+            update = self._unpack_spooled(report) if spooled else self._unpack(key, report)
+            if update is not None:
+                updates.append(update)
+        self._process(key, updates)
+
+    def _count(self, reports, spooled: bool):
+        """
+        Adds received Reports to the Stats: how late they arrived, and how many were missed before them.
+        :param reports: list of Reports as received
+        :param spooled: Reports were held by the Node, so are late on purpose and out of sequence
+        :return: None
+        """
+        stats = self._stats
+        stats.reports += len(reports)
+        if spooled:
+            return
+        now_ms = time.time_ns() // 1000000
+        for report in reports:
+            if report.time_ms:
+                lag = max(0, now_ms - report.time_ms)
+                self._lag_ms += lag
+                self._lagged += 1
+                stats.lag_max_ms = max(stats.lag_max_ms, lag)
+            if report.sequence:  # Older Nodes don't number their Reports
+                key = (report.pool_id, report.node_id)
+                last = self._received.get(key, 0)
+                if report.sequence > last + 1 and last:  # Not the first, nor after the Node restarted
+                    stats.missed += report.sequence - last - 1
+                self._received[key] = report.sequence
 
+    def _alert(self, alert):
+        """
+        Passes an Alert straight to every Processor, so the detector can record it without waiting to poll.
+        :param alert: Alert
+        :return: None
+        """
+        data = MessageToDict(alert)
+        pool_id = data.pop('pool_id')
+        node_id = data.pop('node_id')
+        for p in self._processors:
+            p: Processor
+            try:
+                p.alert(pool_id, node_id, data)
+            except Exception as e:
+                print(f"Exception while alerting {p.processor_name()} processor: {str(e)}")
+
+    def _process(self, key: tuple, updates: list):
+        """
+        Passes updates from one Node to every Processor.
+        :param key: (pool_id, node_id)
+        :param updates: list of update dicts, oldest first
+        :return: None
+        """
+        if not updates:
+            return
+        pool_id, node_id = key
+        for p in self._processors:
+            p: Processor
+            a = timeit.default_timer()
+            try:
+                if len(updates) == 1:
+                    p.update(pool_id, node_id, updates[0])
+                else:
+                    p.update_batch(pool_id, node_id, updates)
+            except Exception as e:
+                print(f"Exception while updating {p.processor_name()} processor: {str(e)}")
+            b = timeit.default_timer()
+            print(f"{p.processor_name()}: {b - a}s ({len(updates)} updates)")
+
+    def _unpack(self, key: tuple, report):
+        """
+        Reconstructs a Report into a full update dict, tracking the Node's Inventory and delta state.
+        :param key: (pool_id, node_id)
+        :param report: Report as received, full or delta
+        :return: update dict, or None if it can't be reconstructed
+        """
+        inventory = Collector._read_inventory(report)
+        if inventory is not None and inventory != self._inventories.get(key):
+            self._inventories[key] = inventory
             for p in self._processors:
                 p: Processor
-                a = timeit.default_timer()
                 try:
-                    p.update(report.pool_id, report.node_id, MessageToDict(report))
+                    p.update_inventory(report.pool_id, report.node_id, Collector._inventory_lists(inventory))
                 except Exception as e:
-                    print(f"Exception while updating {p.processor_name()} processor: {str(e)}")
-                b = timeit.default_timer()
-                print(f"{p.processor_name()}: {b - a}s")
+                    print(f"Exception while updating {p.processor_name()} processor inventory: {str(e)}")
+
+        state = self._reconstruct(key, report)
+        if state is None:
+            return None
+        update = MessageToDict(state)
+        if not Collector._resolve_inventory(update, self._inventories.get(key, {'partitions': {}, 'gpus': {}})):
+            self._request_keyframe(key)  # The Node resends its Inventory with the keyframe, e.g. after a restart
+        return update
+
+    @staticmethod
+    def _unpack_spooled(report):
+        """
+        Converts a spooled Report into an update dict.
+        Spooled Reports are always full and carry the Inventory they were packed with.
+        They are older than the Node's current state, so neither its Inventory nor its delta state are changed.
+        :param report: full Report with Inventory
+        :return: update dict
+        """
+        inventory = Collector._read_inventory(report) or {'partitions': {}, 'gpus': {}}
+        state = proto_report.Report()
+        state.CopyFrom(report)
+        state.ClearField('inventory')
+        update = MessageToDict(state)
+        Collector._resolve_inventory(update, inventory)
+        return update
+
+    def _reconstruct(self, key: tuple, report):
+        """
+        Tracks the full state of a Node, applying deltas onto its last full Report.
+        A delta which doesn't follow the last applied sequence can't be applied, and a keyframe is requested.
+        :param key: (pool_id, node_id)
+        :param report: Report as received
+        :return: full Report, or None if it can't be reconstructed yet
+        """
+        if not report.delta:
+            state = proto_report.Report()
+            state.CopyFrom(report)
+            state.ClearField('inventory')
+            self._states[key] = state
+            self._sequences[key] = report.sequence
+            return state
+
+        state = self._states.get(key)
+        if state is None or report.sequence != self._sequences[key] + 1:
+            print(f"Delta {report.sequence} from {key[0]}:{key[1]} doesn't follow {self._sequences.get(key)}, "
+                  f"requesting a keyframe.")
+            self._request_keyframe(key)
+            return None
+        apply_delta(state, report)
+        self._sequences[key] = report.sequence
+        return state
+
+    def _request_keyframe(self, key: tuple):
+        """
+        Asks a Node to send a full Report, at most once every KEYFRAME_RETRY seconds.
+        :param key: (pool_id, node_id)
+        :return: None
+        """
+        now = time.monotonic()
+        if now - self._keyframe_requests.get(key, -const.KEYFRAME_RETRY) < const.KEYFRAME_RETRY:
+            return
+        self._keyframe_requests[key] = now
+        control = Control()
+        control.send_keyframe = True
+        self.control.send_multipart([f"{key[0]}:{key[1]}:".encode(), control.SerializeToString()])
+
+    @staticmethod
+    def _read_inventory(report) -> dict:
+        """
+        Reads the Inventory from a Report.
+        Nodes without Inventory send static fields in every Report, which are read instead.
+        :param report: Report
+        :return: dict of 'partitions' and 'gpus', each index -> dict, or None if the Report has no Inventory
+        """
+        if report.HasField('inventory'):
+            inv = report.inventory
+            partitions = zip(inv.partition_indices, inv.partition_ids, inv.mount_points, inv.fstypes, inv.totals)
+            gpus = zip(inv.gpu_indices, inv.gpu_uuids, inv.gpu_mem_totals, inv.gpu_drivers, inv.gpu_products,
+                       inv.gpu_serials, inv.gpu_display_modes)
+        elif not report.delta and not report.disk.indices and not report.gpu.indices:
+            disk = report.disk
+            gpu = report.gpu
+            partitions = zip(range(len(disk.partition_ids)), disk.partition_ids, disk.mount_points, disk.fstypes,
+                             disk.totals)
+            gpus = zip(range(len(gpu.uuids)), gpu.uuids, gpu.mem_totals, gpu.drivers, gpu.products, gpu.serials,
+                       gpu.display_modes)
+        else:
+            return None
+        return {
+                'partitions': {index: {'partition_id': partition_id, 'mount_point': mount_point, 'fstype': fstype,
+                                       'total': total}
+                               for index, partition_id, mount_point, fstype, total in partitions},
+                'gpus':       {index: {'uuid': uuid, 'mem_total': mem_total, 'driver': driver, 'product': product,
+                                       'serial': serial, 'display_mode': display_mode}
+                               for index, uuid, mem_total, driver, product, serial, display_mode in gpus},
+        }
+
+    @staticmethod
+    def _inventory_lists(inventory: dict) -> dict:
+        """
+        Formats an Inventory for Processors, without the Node's indices.
+        :param inventory: dict from _read_inventory
+        :return: dict of 'partitions' and 'gpus', each a list of dicts
+        """
+        return {'partitions': list(inventory['partitions'].values()), 'gpus': list(inventory['gpus'].values())}
+
+    @staticmethod
+    def _resolve_inventory(update: dict, inventory: dict) -> bool:
+        """
+        Fills in partition_ids and uuids (and the other static fields) of indexed Disk and GPU entries.
+        Entries the Collector has no Inventory for yet are dropped.
+        :param update: dict of a Report, modified in place
+        :param inventory: dict from _read_inventory
+        :return: bool whether every entry was resolved, False if any were dropped
+        """
+        resolved = True
+        for section, known, dynamic, static in (
+                ('disk', inventory['partitions'], ('useds', 'frees', 'percents'),
+                 (('partition_ids', 'partition_id'), ('mount_points', 'mount_point'), ('fstypes', 'fstype'),
+                  ('totals', 'total'))),
+                ('gpu', inventory['gpus'], ('loads', 'mem_percents', 'mem_useds'),
+                 (('uuids', 'uuid'), ('mem_totals', 'mem_total'), ('drivers', 'driver'), ('products', 'product'),
+                  ('serials', 'serial'), ('display_modes', 'display_mode')))):
+            indices = update[section]['indices']
+            if not indices:
+                continue
+            found = [i for i, index in enumerate(indices) if index in known]
+            if len(found) < len(indices):
+                print(f"Dropping {len(indices) - len(found)} {section} entries without an Inventory.")
+                resolved = False
+            for field in dynamic:
+                update[section][field] = [update[section][field][i] for i in found]
+            for field, name in static:
+                update[section][field] = [known[indices[i]][name] for i in found]
+            update[section]['indices'] = [indices[i] for i in found]
+        return resolved
 
     def add_processor(self, processor: Processor):
         """
@@ -0,0 +1,62 @@
+"""
+Manages the trained compression dictionary shared with Nodes in the Broker handshake.
+Samples are saved by the Collector while DICTIONARY_SAMPLES > 0, then trained with:
+python -m server.net.dictionary [size]
+Nodes pick up a new dictionary when they next connect, so restart the server and Nodes after training.
+"""
+import sys
+
+import proto.codec as codec
+import server.constants as const
+
+
+def load() -> bytes:
+    """
+    Reads the trained dictionary.
+    :return: bytes dictionary, empty if none has been trained
+    """
+    if not const.DICTIONARY_FILE.exists():
+        return b''
+    with open(const.DICTIONARY_FILE, 'rb') as f:
+        return f.read()
+
+
+def sample_count() -> int:
+    """
+    Counts the samples saved so far.
+    :return: int
+    """
+    if not const.DICTIONARY_SAMPLE_DIR.exists():
+        return 0
+    return len(list(const.DICTIONARY_SAMPLE_DIR.iterdir()))
+
+
+def save_sample(index: int, message: bytes) -> None:
+    """
+    Saves a serialized message to train on.
+    :param index: sample number, from sample_count() upwards
+    :param message: uncompressed serialized message
+    :return: None
+    """
+    const.DICTIONARY_SAMPLE_DIR.mkdir(exist_ok=True)
+    with open(const.DICTIONARY_SAMPLE_DIR / f"{index}.bin", 'wb') as f:
+        f.write(message)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else const.DICTIONARY_SIZE
+    if not const.DICTIONARY_SAMPLE_DIR.exists():
+        print(f"No samples in {const.DICTIONARY_SAMPLE_DIR}, set DICTIONARY_SAMPLES and run the server first.")
+        return
+    samples = []
+    for path in sorted(const.DICTIONARY_SAMPLE_DIR.iterdir()):
+        with open(path, 'rb') as f:
+            samples.append(f.read())
+    dictionary = codec.train(samples, size)
+    with open(const.DICTIONARY_FILE, 'wb') as f:
+        f.write(dictionary)
+    print(f"Trained a {len(dictionary)} byte dictionary from {len(samples)} samples -> {const.DICTIONARY_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,41 @@ class Processor(abc.ABC):
         """
         pass
 
+    def update_batch(self, pool_id: int, node_id: int, updates: list) -> None:
+        """
+        Receive several updates from one Node at once, oldest first.
+        Calls update() for each by default, override to handle them together.
+        :param pool_id:
+        :param node_id:
+        :param updates: list of update dicts
+        :return:
+        """
+        for update in updates:
+            self.update(pool_id, node_id, update)
+
+    def update_inventory(self, pool_id: int, node_id: int, inventory: dict) -> None:
+        """
+        Receive a Node's static Disk and GPU descriptions, when they change.
+        Updates refer to the same partitions by partition_id and GPUs by uuid.
+        Optional, ignored by default.
+        :param pool_id:
+        :param node_id:
+        :param inventory: dict of 'partitions' and 'gpus', each a list of dicts
+        :return:
+        """
+        pass
+
+    def alert(self, pool_id: int, node_id: int, alert: dict) -> None:
+        """
+        Receive the anomaly thresholds a Node just crossed, ahead of the update which crossed them.
+        Optional, ignored by default.
+        :param pool_id:
+        :param node_id:
+        :param alert: dict of time_ms and breaches, a list of dicts of type, message, severity, value and threshold
+        :return:
+        """
+        pass
+
 
 class ConsoleProcessor(Processor):
     """
@@ -42,3 +77,9 @@ class ConsoleProcessor(Processor):
 
     def update(self, pool_id, node_id, update: dict) -> None:
         print(f"{pool_id}/{node_id}: {update}", flush=True)
+
+    def update_inventory(self, pool_id, node_id, inventory: dict) -> None:
+        print(f"{pool_id}/{node_id} inventory: {inventory}", flush=True)
+
+    def alert(self, pool_id, node_id, alert: dict) -> None:
+        print(f"{pool_id}/{node_id} alert: {alert}", flush=True)
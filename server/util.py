@@ -1,6 +1,7 @@
 """
 General Utilities.
 """
+import datetime
 
 
 def MessageToDict(message):
@@ -33,3 +34,40 @@ def MessageToDict(message):
                 messageDict[key] = value
 
     return messageDict
+
+
+def update_time(update: dict) -> datetime.datetime:
+    """
+    When an update was measured, to the millisecond if the Node sent time_ms.
+    :param update: dict update from the Collector
+    :return: datetime
+    """
+    if update.get('time_ms'):
+        return datetime.datetime.fromtimestamp(update['time_ms'] / 1000)
+    return datetime.datetime.fromtimestamp(update['time_stamp'])
+
+
+def apply_delta(state, delta):
+    """
+    Applies a delta Report onto the last full Report from the same Node.
+    A delta lists each field it carries in changed, as (section field number << 8) | field number.
+    Top level fields are always carried.
+    :param state: full Report, modified in place
+    :param delta: delta Report
+    :return:
+    """
+    for descriptor in delta.DESCRIPTOR.fields:
+        if descriptor.type != descriptor.TYPE_MESSAGE and descriptor.label != descriptor.LABEL_REPEATED:
+            setattr(state, descriptor.name, getattr(delta, descriptor.name))
+    state.delta = False
+
+    for tag in delta.changed:
+        section = delta.DESCRIPTOR.fields_by_number[tag >> 8]
+        descriptor = section.message_type.fields_by_number[tag & 0xff]
+        value = getattr(getattr(delta, section.name), descriptor.name)
+        state_section = getattr(state, section.name)
+        if descriptor.label == descriptor.LABEL_REPEATED:
+            state_section.ClearField(descriptor.name)
+            getattr(state_section, descriptor.name).extend(value)
+        else:
+            setattr(state_section, descriptor.name, value)
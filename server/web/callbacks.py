@@ -8,7 +8,7 @@ from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 
 from server.web.app import app, connection
-from server.web.connector import format_disks, format_nodes, format_gpus
+from server.web.connector import format_disks, format_interfaces, format_io_devices, format_nodes, format_gpus
 
 
 @app.callback(
@@ -221,6 +221,123 @@ def update_telemetry_disk_dropdown(node):
         return [], ''
 
 
+@app.callback(
+        Output('io-dropdown', 'options'),
+        Output('io-dropdown', 'value'),
+        [Input('node-dropdown', 'value')]
+)
+def update_telemetry_io_dropdown(node):
+    fmt = format_io_devices(connection, node)
+    if len(fmt) > 0:
+        return fmt, fmt[0]['value']
+    else:
+        return [], ''
+
+
+@app.callback(
+        Output('io-graph', 'figure'),
+        [Input('graph-update', 'n_intervals'),
+         Input('sample-slider', 'value'),
+         Input('node-dropdown', 'value'),
+         Input('io-dropdown', 'value')]
+)
+def update_telemetry_io_graph(n_intervals, num_updates, node, device):
+    updates = connection.get_io_updates(node, device, num_updates)
+    x = list(updates['timestamp'])[::-1]
+
+    if len(updates) == 0:
+        x = [datetime.datetime.now(), ]
+
+    read_data = plotly.graph_objs.Scatter(
+            x=x,
+            y=list(updates['read_rate'] / 1e6)[::-1],
+            name='Read MB/s',
+            mode='lines+markers',
+            fill='tozeroy',
+            line=dict(width=0.75, color='wheat'),
+    )
+    write_data = plotly.graph_objs.Scatter(
+            x=x,
+            y=list(updates['write_rate'] / 1e6)[::-1],
+            name='Write MB/s',
+            mode='lines+markers',
+            fill='tozeroy',
+            line=dict(width=0.75, color='tan'),
+    )
+    utilization_data = plotly.graph_objs.Scatter(
+            x=x,
+            y=list(updates['utilization'])[::-1],
+            name='Busy %',
+            mode='lines',
+            yaxis='y2',
+            line=dict(width=0.75, color='firebrick'),
+    )
+    peak = max([*read_data.y, *write_data.y, 0])
+    io_graph = {'data':   [read_data, write_data, utilization_data],
+                'layout': go.Layout(
+                        xaxis=dict(range=[min(x), max(x)]),
+                        yaxis=dict(range=[0, peak * 1.1 or 1]),
+                        yaxis2=dict(range=[0, 101], overlaying='y', side='right'),
+                        title='Disk I/O',
+                )}
+    return io_graph
+
+
+@app.callback(
+        Output('network-dropdown', 'options'),
+        Output('network-dropdown', 'value'),
+        [Input('node-dropdown', 'value')]
+)
+def update_telemetry_network_dropdown(node):
+    fmt = format_interfaces(connection, node)
+    if len(fmt) > 0:
+        return fmt, fmt[0]['value']
+    else:
+        return [], ''
+
+
+@app.callback(
+        Output('network-graph', 'figure'),
+        [Input('graph-update', 'n_intervals'),
+         Input('sample-slider', 'value'),
+         Input('node-dropdown', 'value'),
+         Input('network-dropdown', 'value')]
+)
+def update_telemetry_network_graph(n_intervals, num_updates, node, interface):
+    updates = connection.get_network_updates(node, interface, num_updates)
+    x = list(updates['timestamp'])[::-1]
+
+    if len(updates) == 0:
+        x = [datetime.datetime.now(), ]
+
+    rx_data = plotly.graph_objs.Scatter(
+            x=x,
+            y=list(updates['rx_bytes'] * 8 / 1e6)[::-1],
+            name='Receive',
+            mode='lines+markers',
+            fill='tozeroy',
+            line=dict(width=0.75, color='lightsalmon'),
+    )
+    tx_data = plotly.graph_objs.Scatter(
+            x=x,
+            y=list(updates['tx_bytes'] * 8 / 1e6)[::-1],
+            name='Transmit',
+            mode='lines+markers',
+            fill='tozeroy',
+            line=dict(width=0.75, color='lightseagreen'),
+    )
+    # Scale to the link speed when it's known, so a saturated interface fills the graph
+    speed = updates['speed'].iloc[0] if len(updates) > 0 else 0
+    peak = max([*rx_data.y, *tx_data.y, 0])
+    network_graph = {'data':   [rx_data, tx_data],
+                     'layout': go.Layout(
+                             xaxis=dict(range=[min(x), max(x)]),
+                             yaxis=dict(range=[0, max(speed, peak) * 1.01 or 1]),
+                             title='Network Throughput (Mbit/s)',
+                     )}
+    return network_graph
+
+
 @app.callback(
         Output('hist-node-dropdown', 'options'),
         [Input('hist-node-dropdown', 'value')]
@@ -6,7 +6,8 @@ import sqlalchemy as sa
 from sqlalchemy import desc, and_
 from sqlalchemy.orm import Session
 
-from server.db.mappings import Update, AnomalyRecord, GPUUpdate, DiskUpdate, HistoricalData, Node
+from server.db.mappings import Update, AnomalyRecord, GPUUpdate, DiskUpdate, DiskIOUpdate, NetworkUpdate, \
+    HistoricalData, Node
 
 
 class ShepherdConnection:
@@ -114,6 +115,38 @@ class ShepherdConnection:
                 .order_by(desc(Update.timestamp)).limit(num_updates)
             return pd.read_sql(query.statement, query.session.bind)
 
+    def get_io_updates(self, node_id: int, device: str, num_updates: int):
+        """
+        Retrieves most num_updates recent DiskIOUpdate objects for Node node_id's disk device.
+        :param num_updates: int # Updates to fetch, most n recent
+        :param node_id: int Node ID
+        :param device: Device name from an update. See get_io_devices()
+        :return: pd.DataFrame
+        """
+        relevant_cutoff = datetime.datetime.now() - datetime.timedelta(hours=1)
+        with self.lock:
+            query = self.session.query(DiskIOUpdate, Update).join(Update).filter(
+                    Update.timestamp >= relevant_cutoff). \
+                filter(and_(DiskIOUpdate.update.has(node_id=node_id), DiskIOUpdate.device == device)) \
+                .order_by(desc(Update.timestamp)).limit(num_updates)
+            return pd.read_sql(query.statement, query.session.bind)
+
+    def get_network_updates(self, node_id: int, interface: str, num_updates: int):
+        """
+        Retrieves most num_updates recent NetworkUpdate objects for Node node_id's interface.
+        :param num_updates: int # Updates to fetch, most n recent
+        :param node_id: int Node ID
+        :param interface: Interface name from an update. See get_interfaces()
+        :return: pd.DataFrame
+        """
+        relevant_cutoff = datetime.datetime.now() - datetime.timedelta(hours=1)
+        with self.lock:
+            query = self.session.query(NetworkUpdate, Update).join(Update).filter(
+                    Update.timestamp >= relevant_cutoff). \
+                filter(and_(NetworkUpdate.update.has(node_id=node_id), NetworkUpdate.interface == interface)) \
+                .order_by(desc(Update.timestamp)).limit(num_updates)
+            return pd.read_sql(query.statement, query.session.bind)
+
     def get_unresolved_anomalies(self):
         """
         Retrieves all unresolved Anomalies
@@ -216,6 +249,30 @@ class ShepherdConnection:
                     DiskUpdate.update.has(node_id=node_id)).distinct().join(Update)
             return [disk[0] for disk in disks]
 
+    def get_io_devices(self, node_id: int):
+        """
+        Gets all disk device names with I/O rates relevant to a Node
+        :param node_id: int Node ID
+        :return: list of str
+        """
+        with self.lock:
+            self.session.commit()
+            devices = self.session.query(DiskIOUpdate.device).filter(
+                    DiskIOUpdate.update.has(node_id=node_id)).distinct().join(Update)
+            return [device[0] for device in devices]
+
+    def get_interfaces(self, node_id: int):
+        """
+        Gets all network interface names relevant to a Node
+        :param node_id: int Node ID
+        :return: list of str
+        """
+        with self.lock:
+            self.session.commit()
+            interfaces = self.session.query(NetworkUpdate.interface).filter(
+                    NetworkUpdate.update.has(node_id=node_id)).distinct().join(Update)
+            return [interface[0] for interface in interfaces]
+
 
 def format_nodes(connection):
     """
@@ -254,3 +311,27 @@ def format_disks(connection, node_id: int):
     for disk in disks:
         res.append({'label': f'{disk}', 'value': disk})
     return res
+
+
+def format_io_devices(connection, node_id: int):
+    """
+    Returns disk devices formatted in Dash friendly manner.
+    :return: list of Dicts
+    """
+    devices = connection.get_io_devices(node_id)
+    res = []
+    for device in devices:
+        res.append({'label': f'{device}', 'value': device})
+    return res
+
+
+def format_interfaces(connection, node_id: int):
+    """
+    Returns network interfaces formatted in Dash friendly manner.
+    :return: list of Dicts
+    """
+    interfaces = connection.get_interfaces(node_id)
+    res = []
+    for interface in interfaces:
+        res.append({'label': f'{interface}', 'value': interface})
+    return res
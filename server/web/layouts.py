@@ -4,7 +4,7 @@ import dash_html_components as html
 
 import server.constants as const
 from server.web.app import connection
-from server.web.connector import format_gpus, format_disks, format_nodes
+from server.web.connector import format_gpus, format_disks, format_interfaces, format_io_devices, format_nodes
 
 df_nodes = connection.get_nodes()
 default_node = df_nodes[0] if len(df_nodes) > 0 else 0
@@ -12,6 +12,10 @@ df_gpus = connection.get_gpus(default_node)
 default_gpu = df_gpus[0] if len(df_gpus) > 0 else 0
 df_disks = connection.get_disks(default_node)
 default_disk = df_disks[0] if len(df_disks) > 0 else 0
+df_io_devices = connection.get_io_devices(default_node)
+default_io_device = df_io_devices[0] if len(df_io_devices) > 0 else 0
+df_interfaces = connection.get_interfaces(default_node)
+default_interface = df_interfaces[0] if len(df_interfaces) > 0 else 0
 
 navbar = dbc.NavbarSimple(
         children=[
@@ -174,6 +178,22 @@ telemetry = html.Div(
                         )
                 ], style={'width': '66%', 'padding-left': '33%', 'padding-right': '1%'}),
                 dcc.Graph(id='disk-graph', animate=True),
+                html.Div([
+                        dcc.Dropdown(
+                                id='io-dropdown',
+                                options=format_io_devices(connection, default_node),
+                                value=default_io_device,
+                        )
+                ], style={'width': '66%', 'padding-left': '33%', 'padding-right': '1%'}),
+                dcc.Graph(id='io-graph', animate=True),
+                html.Div([
+                        dcc.Dropdown(
+                                id='network-dropdown',
+                                options=format_interfaces(connection, default_node),
+                                value=default_interface,
+                        )
+                ], style={'width': '66%', 'padding-left': '33%', 'padding-right': '1%'}),
+                dcc.Graph(id='network-graph', animate=True),
                 dcc.Interval(
                         id='graph-update',
                         interval=1000,
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Stands in for nvidia-smi --query-gpu ... --format=csv,noheader,nounits --loop-ms=N on machines without GPUs, e.g. as
+the Node's [GPU] COMMAND. Prints one CSV line per fake GPU every loop, as nvidia-smi does for node.telemetry.metrics.gpu.
+Each line is written in two parts, flushed separately, so readers have to handle lines arriving incrementally.
+Configured by environment variables:
+FAKE_GPUS       number of GPUs (default 2)
+FAKE_LOOPS      loops printed before exiting with code 3, 0 for no limit (default 0)
+FAKE_HANG       loops printed before printing nothing more without exiting, 0 to never hang (default 0)
+FAKE_DROP       loops printed before the last GPU disappears, 0 to keep it (default 0)
+"""
+import os
+import sys
+import time
+
+
+def line(index: int, loop: int) -> str:
+    """
+    :param index: GPU number
+    :param loop: loop number, varying the load
+    :return: str CSV line of uuid, load %, memory total and used MiB, driver, name, serial, display mode
+    """
+    return f"GPU-fake-{index}, {(loop * 10 + index) % 100}, 16384, {1024 * (index + 1)}, 535.54, Fake GPU {index}, " \
+           f"{1000 + index}, [N/A]\n"
+
+
+def main():
+    loop_ms = 1000
+    for arg in sys.argv[1:]:
+        if arg.startswith('--loop-ms='):
+            loop_ms = int(arg.split('=', 1)[1])
+    gpus = int(os.environ.get('FAKE_GPUS', 2))
+    loops = int(os.environ.get('FAKE_LOOPS', 0))
+    hang = int(os.environ.get('FAKE_HANG', 0))
+    drop = int(os.environ.get('FAKE_DROP', 0))
+
+    loop = 0
+    while True:
+        if loops and loop >= loops:
+            sys.exit(3)
+        if hang and loop >= hang:
+            while True:
+                time.sleep(60)
+        for index in range(gpus - 1 if drop and loop >= drop else gpus):
+            text = line(index, loop)
+            sys.stdout.write(text[:10])
+            sys.stdout.flush()
+            time.sleep(0.005)
+            sys.stdout.write(text[10:])
+            sys.stdout.flush()
+        loop += 1
+        time.sleep(loop_ms / 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Tests StreamingGPU against tests/fake_nvidia_smi.py, so they run on machines without GPUs.
+Run from the repository root: python -m unittest discover tests (or python -m pytest tests)
+"""
+import os
+import pathlib
+import time
+import unittest
+from unittest import mock
+
+from node.telemetry.heart import Heart
+from node.telemetry.metrics.gpu import StreamingGPU
+
+FAKE = str(pathlib.Path(__file__).with_name('fake_nvidia_smi.py'))
+LOOP_MS = 100
+
+
+def wait_for(condition, timeout: float = 5):
+    """
+    :param condition: callable returning a bool
+    :param timeout: seconds to wait
+    :return: bool whether the condition held in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+class StreamingGPUTest(unittest.TestCase):
+
+    def start(self, environment: dict, **kwargs) -> StreamingGPU:
+        """
+        Starts a StreamingGPU on the fake nvidia-smi, closed when the test ends.
+        :param environment: FAKE_* variables for the fake, see fake_nvidia_smi.py
+        :return: StreamingGPU
+        """
+        with mock.patch.dict(os.environ, environment):
+            gpu = StreamingGPU(FAKE, LOOP_MS, **kwargs)
+        self.addCleanup(gpu.close)
+        return gpu
+
+    def test_parses_lines_arriving_in_parts(self):
+        gpu = self.start({'FAKE_GPUS': '3'})
+        data = gpu.measure()
+        self.assertEqual(set(data), {'GPU-fake-0', 'GPU-fake-1', 'GPU-fake-2'})
+        self.assertEqual(data['GPU-fake-1'], {
+                'uuid': 'GPU-fake-1',
+                'load': data['GPU-fake-1']['load'],
+                'mem_percent': 2048 / 16384,
+                'mem_total': 16384,
+                'mem_used': 2048,
+                'driver': '535.54',
+                'product': 'Fake GPU 1',
+                'serial': '1001',
+                'display_mode': '[N/A]',
+        })
+        self.assertTrue(0 <= data['GPU-fake-1']['load'] < 1)
+
+    def test_drops_a_gpu_missing_from_a_loop(self):
+        gpu = self.start({'FAKE_GPUS': '3', 'FAKE_DROP': '2'})
+        self.assertEqual(len(gpu.measure()), 3)
+        self.assertTrue(wait_for(lambda: set(gpu.measure()) == {'GPU-fake-0', 'GPU-fake-1'}))
+
+    def test_restarts_a_child_which_exited(self):
+        environment = {'FAKE_LOOPS': '2'}
+        gpu = self.start(environment, restart=0.5)
+        self.assertEqual(len(gpu.measure()), 2)
+        first = gpu._process
+        self.assertTrue(wait_for(lambda: first.poll() is not None))
+        time.sleep(0.05)  # Let the reader see it exit
+        with self.assertRaisesRegex(ValueError, 'exited with code 3'):
+            gpu.measure()
+        time.sleep(0.5)
+        with mock.patch.dict(os.environ, environment):
+            self.assertEqual(len(gpu.measure()), 2)
+        self.assertIsNot(gpu._process, first)
+
+    def test_kills_a_child_which_hangs(self):
+        gpu = self.start({'FAKE_HANG': '1'}, hang=0.5)
+        self.assertEqual(len(gpu.measure()), 2)
+        hung = gpu._process
+        time.sleep(0.7)
+        started = time.monotonic()
+        with self.assertRaisesRegex(ValueError, 'printed nothing'):
+            gpu.measure()
+        self.assertLess(time.monotonic() - started, 0.5 + 1 + LOOP_MS / 1000)
+        self.assertIsNotNone(hung.poll())  # Killed and reaped
+        started = time.monotonic()
+        with self.assertRaises(ValueError):  # Fails without waiting until it's restarted
+            gpu.measure()
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_without_nvidia_smi_there_are_no_gpus(self):
+        gpu = StreamingGPU(str(pathlib.Path(__file__).with_name('missing-nvidia-smi')), LOOP_MS)
+        self.assertEqual(gpu.measure(), {})
+
+    def test_heart_stopping_closes_the_child(self):
+        gpu = self.start({})
+        heart = Heart(0, 1, rate=5)
+        heart.register_metric(gpu)
+        self.assertTrue(wait_for(lambda: 'gpu' in heart._data))
+        child = gpu._process
+        heart.kill()
+        self.assertIsNone(gpu._process)
+        self.assertIsNotNone(child.poll())
+
+
+if __name__ == '__main__':
+    unittest.main()